@@ -0,0 +1,97 @@
+"""
+Fusion Micro-Benchmark
+Compares the original full-sort reciprocal_rank_fusion against the top-k
+fusion engine on synthetic multi-query-hybrid result lists.
+
+Usage:
+    python evaluation/scripts/benchmark_fusion.py
+"""
+
+import random
+import sys
+import timeit
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+from dotenv import load_dotenv
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+# Load .env BEFORE importing anything that uses settings
+env_path = project_root / ".env"
+load_dotenv(env_path)
+
+from src.rag.fusion import fuse
+
+# Configuration
+NUM_LISTS = [4, 10, 20]            # multi-query-hybrid: 2 lists per variation
+CHUNKS_PER_SEARCH = [10, 50]
+TOP_K = 5
+CORPUS_SIZE = 2000
+REPEATS = 200
+
+
+def legacy_rrf(
+    search_results_list: List[List[Dict[str, Any]]],
+    weights: Optional[List[float]] = None,
+    k: int = 60
+) -> List[Dict[str, Any]]:
+    """The pre-engine implementation: full sort plus a copy of every chunk."""
+    if weights is None:
+        weights = [1.0 / len(search_results_list)] * len(search_results_list)
+    
+    chunk_scores: Dict[str, float] = {}
+    all_chunks: Dict[str, Dict[str, Any]] = {}
+    
+    for search_idx, results in enumerate(search_results_list):
+        for rank, chunk in enumerate(results):
+            chunk_id = chunk["id"]
+            rrf_score = weights[search_idx] * (1.0 / (k + rank + 1))
+            if chunk_id in chunk_scores:
+                chunk_scores[chunk_id] += rrf_score
+            else:
+                chunk_scores[chunk_id] = rrf_score
+                all_chunks[chunk_id] = chunk
+    
+    sorted_chunk_ids = sorted(chunk_scores, key=lambda cid: chunk_scores[cid], reverse=True)
+    return [{**all_chunks[cid], "rrf_score": chunk_scores[cid]} for cid in sorted_chunk_ids]
+
+
+def make_lists(num_lists: int, chunks_per_search: int) -> List[List[Dict[str, Any]]]:
+    """Random result lists drawn from a shared corpus of realistic chunk dicts."""
+    corpus = [
+        {
+            "id": f"chunk-{i}",
+            "document_id": f"doc-{i % 20}",
+            "content": "lorem ipsum " * 80,
+            "page_number": i % 50,
+            "similarity": random.random(),
+        }
+        for i in range(CORPUS_SIZE)
+    ]
+    return [random.sample(corpus, chunks_per_search) for _ in range(num_lists)]
+
+
+def main():
+    random.seed(7)
+    print(f"{'lists':>6} {'per list':>9} {'legacy µs':>11} {'top-k µs':>10} {'speedup':>8}")
+    
+    for num_lists in NUM_LISTS:
+        for chunks_per_search in CHUNKS_PER_SEARCH:
+            lists = make_lists(num_lists, chunks_per_search)
+            
+            expected = legacy_rrf(lists)[:TOP_K]
+            assert fuse(lists, top_k=TOP_K) == expected
+            
+            legacy = timeit.timeit(lambda: legacy_rrf(lists)[:TOP_K], number=REPEATS) / REPEATS
+            engine = timeit.timeit(lambda: fuse(lists, top_k=TOP_K), number=REPEATS) / REPEATS
+            
+            print(
+                f"{num_lists:>6} {chunks_per_search:>9} {legacy * 1e6:>11.1f} "
+                f"{engine * 1e6:>10.1f} {legacy / engine:>7.2f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
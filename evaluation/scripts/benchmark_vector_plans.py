@@ -0,0 +1,144 @@
+"""
+Vector Search Plan Benchmark
+Runs EXPLAIN ANALYZE (via the explain_vector_search RPC) for the original
+and the tuned project vector search on projects of different sizes, and
+records which plan Postgres picked, how long it took and how many rows
+came back.
+
+Query embeddings are taken from stored chunks, so no embedding API calls
+are made. Results are written to datasets/vector_search_plans.json.
+
+Usage:
+    python evaluation/scripts/benchmark_vector_plans.py [project_id ...]
+"""
+
+import json
+import sys
+from pathlib import Path
+from typing import List, Dict, Any
+from dotenv import load_dotenv
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+# Load .env BEFORE importing anything that uses settings
+env_path = project_root / ".env"
+load_dotenv(env_path)
+
+from src.services.database.supabase import supabase
+from src.core.vector_math import parse_vector
+
+# Configuration
+PROJECT_IDS: List[str] = []        # Projects of different corpus sizes (or pass on the command line)
+QUERIES_PER_PROJECT = 5
+CHUNKS_PER_SEARCH = 10
+MATCH_THRESHOLD = 0.3
+EF_SEARCH_VALUES = [40, 100, 200]
+OUTPUT_PATH = Path(__file__).parent / "datasets" / "vector_search_plans.json"
+
+
+def count_chunks(project_id: str) -> int:
+    result = supabase.table("document_chunks")\
+        .select("id", count="exact")\
+        .eq("project_id", project_id)\
+        .limit(1)\
+        .execute()
+    return result.count or 0
+
+
+def sample_query_embeddings(project_id: str) -> List[List[float]]:
+    """Embeddings of a few stored chunks, used as realistic queries."""
+    result = supabase.table("document_chunks")\
+        .select("embedding")\
+        .eq("project_id", project_id)\
+        .not_.is_("embedding", "null")\
+        .limit(QUERIES_PER_PROJECT)\
+        .execute()
+    return [parse_vector(row["embedding"]) for row in result.data or []]
+
+
+def plan_nodes(node: Dict[str, Any]) -> List[Dict[str, Any]]:
+    nodes = [node]
+    for child in node.get("Plans", []):
+        nodes.extend(plan_nodes(child))
+    return nodes
+
+
+def plan_choice(plan: Dict[str, Any]) -> str:
+    """Summarize how document_chunks was scanned."""
+    for node in plan_nodes(plan["Plan"]):
+        if node.get("Relation Name") != "document_chunks":
+            continue
+        index_name = node.get("Index Name") or ""
+        if "hnsw" in index_name:
+            return "hnsw"
+        if node["Node Type"] == "Seq Scan":
+            return "seq scan"
+        return f"{node['Node Type'].lower()} ({index_name})" if index_name else node["Node Type"].lower()
+    return "unknown"
+
+
+def explain(project_id: str, embedding: List[float], ef_search: int, tuned: bool) -> Dict[str, Any]:
+    plan = supabase.rpc(
+        "explain_vector_search",
+        {
+            "query_embedding": embedding,
+            "filter_project_id": project_id,
+            "match_threshold": MATCH_THRESHOLD,
+            "chunks_per_search": CHUNKS_PER_SEARCH,
+            "ef_search": ef_search,
+            "tuned": tuned
+        }
+    ).execute().data
+    
+    return {
+        "plan": plan_choice(plan),
+        "execution_ms": plan["Execution Time"],
+        "planning_ms": plan["Planning Time"],
+        "rows": plan["Plan"]["Actual Rows"],
+    }
+
+
+def main():
+    project_ids = sys.argv[1:] or PROJECT_IDS
+    if not project_ids:
+        print("Set PROJECT_IDS or pass project ids on the command line")
+        return
+    
+    records = []
+    print(f"{'chunks':>8} {'variant':>8} {'ef':>5} {'plan':>10} {'exec ms':>9} {'rows':>5}")
+    
+    for project_id in sorted(project_ids, key=count_chunks):
+        chunk_count = count_chunks(project_id)
+        embeddings = sample_query_embeddings(project_id)
+        
+        for ef_search in EF_SEARCH_VALUES:
+            for tuned in (False, True):
+                runs = [explain(project_id, embedding, ef_search, tuned) for embedding in embeddings]
+                if not runs:
+                    continue
+                
+                record = {
+                    "project_id": project_id,
+                    "chunks": chunk_count,
+                    "variant": "tuned" if tuned else "original",
+                    "ef_search": ef_search,
+                    "plans": sorted({run["plan"] for run in runs}),
+                    "avg_execution_ms": sum(run["execution_ms"] for run in runs) / len(runs),
+                    "avg_rows": sum(run["rows"] for run in runs) / len(runs),
+                    "runs": runs,
+                }
+                records.append(record)
+                print(
+                    f"{chunk_count:>8} {record['variant']:>8} {ef_search:>5} "
+                    f"{'/'.join(record['plans']):>10} {record['avg_execution_ms']:>9.2f} "
+                    f"{record['avg_rows']:>5.1f}"
+                )
+    
+    OUTPUT_PATH.write_text(json.dumps(records, indent=2))
+    print(f"✅ Saved {len(records)} results to {OUTPUT_PATH}")
+
+
+if __name__ == "__main__":
+    main()
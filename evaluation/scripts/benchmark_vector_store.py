@@ -0,0 +1,95 @@
+"""
+Vector Store Micro-Benchmark
+Measures offline search latency of the in-memory and local-index vector
+stores on synthetic embeddings, one query at a time versus search_many.
+Needs no database or embedding API.
+
+Usage:
+    python evaluation/scripts/benchmark_vector_store.py
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+from dotenv import load_dotenv
+
+import numpy as np
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+# Load .env BEFORE importing anything that uses settings
+env_path = project_root / ".env"
+load_dotenv(env_path)
+
+from src.rag.vector_store import InMemoryVectorStore
+from src.rag.local_index import LocalIndexVectorStore, LocalIndexManager
+
+# Configuration
+CORPUS_SIZES = [1000, 10000, 30000]
+DIMENSIONS = 1536
+NUM_DOCUMENTS = 50
+NUM_QUERIES = 4                    # e.g. multi-query variations
+CHUNKS_PER_SEARCH = 10
+REPEATS = 10
+
+
+def make_chunks(count: int, rng: np.random.Generator):
+    vectors = rng.normal(size=(count, DIMENSIONS)).astype(np.float32)
+    return [
+        {
+            "id": f"chunk-{i}",
+            "document_id": f"doc-{i % NUM_DOCUMENTS}",
+            "content": f"chunk {i}",
+            "chunk_index": i,
+            "embedding": vector,
+        }
+        for i, vector in enumerate(vectors)
+    ]
+
+
+def time_ms(fn) -> float:
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        fn()
+    return (time.perf_counter() - start) / REPEATS * 1000
+
+
+def main():
+    rng = np.random.default_rng(7)
+    queries = rng.normal(size=(NUM_QUERIES, DIMENSIONS)).tolist()
+    document_ids = [f"doc-{i}" for i in range(0, NUM_DOCUMENTS, 2)]
+    
+    print(f"{'store':>10} {'rows':>7} {'upsert ms':>10} {'loop ms':>9} {'batched ms':>11}")
+    
+    for count in CORPUS_SIZES:
+        chunks = make_chunks(count, rng)
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            stores = {
+                "memory": InMemoryVectorStore(),
+                "local": LocalIndexVectorStore("benchmark", LocalIndexManager(tmp)),
+            }
+            
+            for name, store in stores.items():
+                start = time.perf_counter()
+                store.upsert(chunks)
+                upsert_ms = (time.perf_counter() - start) * 1000
+                
+                def loop():
+                    return [store.search(q, document_ids, -1.0, CHUNKS_PER_SEARCH) for q in queries]
+                
+                def batched():
+                    return store.search_many(queries, document_ids, -1.0, CHUNKS_PER_SEARCH)
+                
+                batched()   # warm up (opens the local index)
+                print(
+                    f"{name:>10} {count:>7} {upsert_ms:>10.0f} "
+                    f"{time_ms(loop):>9.1f} {time_ms(batched):>11.1f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+"""
+Semantic Answer Cache for Agents
+
+Shared helpers used by the streaming agent and the agent runner to reuse
+answers to near-duplicate questions within a project.
+
+The query embedding comes from the embedding service, whose query cache
+means retrieval reuses the same vector instead of embedding twice.
+
+Usage:
+    from src.agents.answer_cache import find_cached_answer, remember_answer
+    
+    cached, namespace = find_cached_answer(query, document_ids, settings)
+    if cached:
+        return cached["answer"], cached["citations"]
+    
+    answer, citations = generate(...)
+    remember_answer(query, namespace, answer, citations)
+    
+    # In async code
+    cached, namespace = await afind_cached_answer(query, document_ids, settings)
+"""
+
+import asyncio
+import re
+from typing import List, Dict, Any, Optional, Tuple
+
+from src.services.cache.semantic_cache import semantic_answer_cache
+from src.services.llm.embeddings import embedding_service
+
+
+# Word-plus-trailing-whitespace pieces, so joined tokens equal the answer
+_TOKEN_PATTERN = re.compile(r"\S+\s*|\s+")
+
+
+def find_cached_answer(
+    query: str,
+    document_ids: List[str],
+    settings: Dict[str, Any]
+) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """
+    Look up a cached answer for a semantically similar question.
+    
+    The namespace (which pins the project's document-set version) is
+    resolved here, before retrieval, and must be passed to remember_answer:
+    an answer generated while a document was ingested or deleted then stays
+    under the version it was grounded in.
+    
+    Args:
+        query: User's (sanitized) question
+        document_ids: Document IDs available in the project
+        settings: Project settings (must include project_id)
+    
+    Returns:
+        Tuple of (dict with 'answer', 'citations', 'query' and 'similarity'
+        or None, namespace to remember the new answer under or None)
+    """
+    project_id = settings.get("project_id")
+    if not semantic_answer_cache.enabled or not project_id or not document_ids:
+        return None, None
+    
+    try:
+        namespace = _namespace(project_id, settings)
+    except Exception as e:
+        print(f"⚠️ Semantic cache lookup failed: {e}")
+        return None, None
+    
+    try:
+        cached = semantic_answer_cache.lookup(namespace, embedding_service.embed_query(query))
+    except Exception as e:
+        print(f"⚠️ Semantic cache lookup failed: {e}")
+        return None, namespace
+    
+    _log_hit(cached)
+    return cached, namespace
+
+
+def remember_answer(
+    query: str,
+    namespace: Optional[str],
+    answer: str,
+    citations: List[Dict[str, Any]]
+) -> None:
+    """
+    Cache a document-grounded answer for future near-duplicate questions.
+    
+    Only call this for answers generated from document context; web and
+    general-knowledge answers are not tied to the project's documents.
+    
+    Args:
+        query: User's (sanitized) question
+        namespace: Namespace returned by find_cached_answer (None skips caching)
+        answer: Generated answer
+        citations: Citations of the answer
+    """
+    if not semantic_answer_cache.enabled or not namespace or not citations:
+        return
+    
+    try:
+        semantic_answer_cache.store(
+            namespace,
+            query,
+            embedding_service.embed_query(query),
+            answer,
+            citations
+        )
+    except Exception as e:
+        print(f"⚠️ Semantic cache store failed: {e}")
+
+
+async def afind_cached_answer(
+    query: str,
+    document_ids: List[str],
+    settings: Dict[str, Any]
+) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """
+    Async find_cached_answer.
+    
+    The embedding is awaited and every Redis call (the document set version
+    behind the namespace and the lookup itself) runs in a worker thread.
+    """
+    project_id = settings.get("project_id")
+    if not semantic_answer_cache.enabled or not project_id or not document_ids:
+        return None, None
+    
+    try:
+        namespace = await asyncio.to_thread(_namespace, project_id, settings)
+    except Exception as e:
+        print(f"⚠️ Semantic cache lookup failed: {e}")
+        return None, None
+    
+    try:
+        query_embedding = await embedding_service.aembed_query(query)
+        cached = await asyncio.to_thread(semantic_answer_cache.lookup, namespace, query_embedding)
+    except Exception as e:
+        print(f"⚠️ Semantic cache lookup failed: {e}")
+        return None, namespace
+    
+    _log_hit(cached)
+    return cached, namespace
+
+
+async def aremember_answer(
+    query: str,
+    namespace: Optional[str],
+    answer: str,
+    citations: List[Dict[str, Any]]
+) -> None:
+    """Async remember_answer; the Redis write runs in a worker thread."""
+    if not semantic_answer_cache.enabled or not namespace or not citations:
+        return
+    
+    try:
+        query_embedding = await embedding_service.aembed_query(query)
+        await asyncio.to_thread(
+            semantic_answer_cache.store,
+            namespace,
+            query,
+            query_embedding,
+            answer,
+            citations
+        )
+    except Exception as e:
+        print(f"⚠️ Semantic cache store failed: {e}")
+
+
+def split_answer_tokens(answer: str) -> List[str]:
+    """Split a cached answer into token-sized pieces for streaming."""
+    return _TOKEN_PATTERN.findall(answer)
+
+
+def _namespace(project_id: str, settings: Dict[str, Any]) -> str:
+    model = f"{embedding_service.provider_name}:{embedding_service.provider.model}:{embedding_service.dimensions}"
+    return semantic_answer_cache.namespace(project_id, model, settings)
+
+
+def _log_hit(cached: Optional[Dict[str, Any]]) -> None:
+    if cached:
+        print(f"⚡ Semantic cache hit ({cached['similarity']:.3f}): '{cached['query'][:50]}'")
+
+
+__all__ = [
+    "find_cached_answer",
+    "remember_answer",
+    "afind_cached_answer",
+    "aremember_answer",
+    "split_answer_tokens",
+]
@@ -4,11 +4,13 @@ Streaming Agentic Agent with Guardrails
 Place this file at: src/agents/graphs/streaming_agent.py
 """
 
+import asyncio
 from typing import List, Dict, Any, AsyncGenerator
 from langchain_core.messages import SystemMessage, HumanMessage
 
-from src.agents.tools.rag_tool import execute_rag_search
+from src.agents.tools.rag_tool import aexecute_rag_search
 from src.agents.tools.web_search_tool import web_search_tool, execute_web_search
+from src.agents.answer_cache import afind_cached_answer, aremember_answer, split_answer_tokens
 from src.agents.guardrails import (
     check_input_guardrails,
     check_output_guardrails,
@@ -121,6 +123,20 @@ async def stream_agentic_agent(
     
     citations = []
     
+    # ==================== STEP 0: SEMANTIC ANSWER CACHE ====================
+    cached, cache_namespace = await afind_cached_answer(query, document_ids, settings)
+    
+    if cached:
+        yield {"type": "status", "content": "⚡ Found an answer to a similar question..."}
+        yield {"type": "citations", "content": cached["citations"]}
+        
+        for token in split_answer_tokens(cached["answer"]):
+            yield {"type": "token", "content": token}
+        
+        yield {"type": "done"}
+        print("✅ Streaming complete (semantic cache)\n")
+        return
+    
     # ==================== STEP 1: RAG SEARCH ====================
     yield {"type": "status", "content": "🔍 Searching your documents..."}
     
@@ -129,7 +145,7 @@ async def stream_agentic_agent(
     
     if document_ids:
         try:
-            doc_context, citations = execute_rag_search(
+            doc_context, citations = await aexecute_rag_search(
                 query=query,
                 document_ids=document_ids,
                 settings=settings
@@ -173,7 +189,7 @@ async def stream_agentic_agent(
                 yield {"type": "status", "content": "🌐 Searching the web..."}
                 
                 try:
-                    web_context, web_sources = execute_web_search(query)
+                    web_context, web_sources = await asyncio.to_thread(execute_web_search, query)
                     print(f"🌐 Web: {len(web_sources)} sources")
                 except Exception as e:
                     print(f"❌ Web error: {e}")
@@ -202,6 +218,9 @@ async def stream_agentic_agent(
     output_result = check_output_guardrails(full_response, query)
     if output_result.status == GuardrailStatus.BLOCK:
         print(f"🚫 Output blocked: {output_result.category}")
+    elif has_results:
+        # Only document-grounded answers are reused for similar questions
+        await aremember_answer(query, cache_namespace, full_response, citations)
     
     yield {"type": "done"}
     print("✅ Streaming complete\n")
@@ -217,7 +236,7 @@ async def _should_use_web_search(llm, query: str) -> bool:
         HumanMessage(content=query)
     ]
     
-    response = llm_with_tools.invoke(messages)
+    response = await llm_with_tools.ainvoke(messages)
     
     if response.tool_calls:
         print("🤖 Decision: WEB SEARCH")
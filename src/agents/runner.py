@@ -23,6 +23,12 @@ from typing import List, Dict, Any, Optional
 from src.agents.state import AgentState, create_initial_state
 from src.agents.graphs.simple_agent import get_simple_agent
 from src.agents.graphs.agentic_agent import get_agentic_agent
+from src.agents.answer_cache import (
+    find_cached_answer,
+    remember_answer,
+    afind_cached_answer,
+    aremember_answer,
+)
 
 
 class AgentResult:
@@ -150,6 +156,11 @@ def run_simple_agent(
         settings=settings
     )
     
+    # Reuse the answer to a near-duplicate question if we have one
+    cached, cache_namespace = find_cached_answer(query, document_ids, settings)
+    if cached:
+        return _cached_result(initial_state, cached)
+    
     # Get the agent graph
     agent = get_simple_agent()
     
@@ -160,6 +171,9 @@ def run_simple_agent(
     # Wrap result
     result = AgentResult(final_state)
     
+    if result.has_results:
+        remember_answer(query, cache_namespace, result.response, result.citations)
+    
     print("\n" + "="*60)
     print("✅ SIMPLE AGENT - Execution complete")
     print(f"📊 Found relevant docs: {result.has_results}")
@@ -179,7 +193,9 @@ async def run_simple_agent_async(
     """
     Async version of run_simple_agent.
     
-    For use in async endpoints.
+    For use in async endpoints. The graph runs with ainvoke, which executes
+    its synchronous nodes in worker threads, and the answer cache uses the
+    async embedding client, so the event loop is never blocked.
     
     Args:
         Same as run_simple_agent
@@ -187,14 +203,27 @@ async def run_simple_agent_async(
     Returns:
         AgentResult with response and citations
     """
-    # For now, just wrap the sync version
-    # LangGraph supports async natively if needed
-    return run_simple_agent(
+    print(f"\n🚀 SIMPLE AGENT (async) - Query: {query[:100]}...")
+    
+    initial_state = create_initial_state(
         query=query,
         chat_history=chat_history,
         document_ids=document_ids,
         settings=settings
     )
+    
+    cached, cache_namespace = await afind_cached_answer(query, document_ids, settings)
+    if cached:
+        return _cached_result(initial_state, cached)
+    
+    final_state = await get_simple_agent().ainvoke(initial_state)
+    result = AgentResult(final_state)
+    
+    if result.has_results:
+        await aremember_answer(query, cache_namespace, result.response, result.citations)
+    
+    print(f"✅ SIMPLE AGENT (async) - {len(result.citations)} citations, {len(result.response)} chars\n")
+    return result
 
 
 def run_agentic_agent(
@@ -249,6 +278,11 @@ def run_agentic_agent(
         settings=settings
     )
     
+    # Reuse the answer to a near-duplicate question if we have one
+    cached, cache_namespace = find_cached_answer(query, document_ids, settings)
+    if cached:
+        return _cached_result(initial_state, cached)
+    
     # Get the agentic agent graph
     agent = get_agentic_agent()
     
@@ -259,6 +293,9 @@ def run_agentic_agent(
     # Wrap result
     result = AgentResult(final_state)
     
+    if result.has_results:
+        remember_answer(query, cache_namespace, result.response, result.citations)
+    
     print("\n" + "="*60)
     print("✅ AGENTIC AGENT - Execution complete")
     print(f"📊 Found in docs: {result.has_results}")
@@ -280,14 +317,44 @@ async def run_agentic_agent_async(
     """
     Async version of run_agentic_agent.
     
-    For use in async endpoints.
+    For use in async endpoints; see run_simple_agent_async.
     """
-    return run_agentic_agent(
+    print(f"\n🚀 AGENTIC AGENT (async) - Query: {query[:100]}...")
+    
+    initial_state = create_initial_state(
         query=query,
         chat_history=chat_history,
         document_ids=document_ids,
         settings=settings
     )
+    
+    cached, cache_namespace = await afind_cached_answer(query, document_ids, settings)
+    if cached:
+        return _cached_result(initial_state, cached)
+    
+    final_state = await get_agentic_agent().ainvoke(initial_state)
+    result = AgentResult(final_state)
+    
+    if result.has_results:
+        await aremember_answer(query, cache_namespace, result.response, result.citations)
+    
+    print(
+        f"✅ AGENTIC AGENT (async) - {len(result.citations)} citations, "
+        f"web search: {result.used_web_search}, {len(result.response)} chars\n"
+    )
+    return result
+
+
+def _cached_result(initial_state: AgentState, cached: Dict[str, Any]) -> AgentResult:
+    """Wrap a semantic cache hit as a document-grounded AgentResult."""
+    print(f"✅ Served from semantic answer cache ({len(cached['answer'])} chars)\n")
+    
+    return AgentResult({
+        **initial_state,
+        "response": cached["answer"],
+        "citations": cached["citations"],
+        "has_results": True
+    })
 
 
 __all__ = [
@@ -8,12 +8,13 @@ Available Tools:
 - web_search_tool: Search the internet using Tavily
 """
 
-from src.agents.tools.rag_tool import rag_search_tool, execute_rag_search
+from src.agents.tools.rag_tool import rag_search_tool, execute_rag_search, aexecute_rag_search
 from src.agents.tools.web_search_tool import web_search_tool, execute_web_search
 
 __all__ = [
     "rag_search_tool",
     "execute_rag_search",
+    "aexecute_rag_search",
     "web_search_tool",
     "execute_web_search",
 ]
\ No newline at end of file
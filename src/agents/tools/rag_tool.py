@@ -5,14 +5,17 @@ This tool allows the agent to search through uploaded documents.
 It uses the existing RAGPipeline for retrieval.
 
 Usage:
-    from src.agents.tools.rag_tool import rag_search_tool, execute_rag_search
+    from src.agents.tools.rag_tool import rag_search_tool, execute_rag_search, aexecute_rag_search
 """
 
+import asyncio
 from typing import List, Dict, Any, Tuple
 from langchain_core.tools import tool
 
 from src.rag.pipeline import RAGPipeline
 from src.rag.context_builder import build_context
+from src.rag.context_packer import context_packer
+from src.rag.context_compressor import context_compressor
 
 
 # Reuse existing pipeline instance
@@ -77,16 +80,20 @@ def execute_rag_search(
     if not chunks:
         return "No relevant information found in the documents.", []
     
-    # Trim to final context size
-    final_size = settings.get("final_context_size", 5)
-    chunks = chunks[:final_size]
+    # Rerank (if enabled) and trim to final context size
+    chunks = rag_pipeline.select_context(query, chunks, settings)
+    
+    # Fit the chunks into the provider's prompt token budget
+    chunks = context_packer.pack(chunks, settings.get("llm_provider", "openai"))
+    if settings.get("context_compression"):
+        chunks = context_compressor.compress_chunks(query, chunks)
     print(f"📄 Using {len(chunks)} chunks for context")
     
     # Use existing context builder
-    texts, images, tables, citations = build_context(chunks)
+    texts, images, tables, citations = build_context(chunks, fetch_images=False)
     
     # Format context for agent
-    formatted_context = _format_context_for_agent(texts, chunks)
+    formatted_context = _format_context_for_agent(chunks)
     
     # Convert citations to dict format
     citations_list = [c.model_dump() for c in citations]
@@ -94,29 +101,47 @@ def execute_rag_search(
     return formatted_context, citations_list
 
 
-def _format_context_for_agent(
-    texts: List[str],
-    chunks: List[Dict[str, Any]]
-) -> str:
+async def aexecute_rag_search(
+    query: str,
+    document_ids: List[str],
+    settings: Dict[str, Any]
+) -> Tuple[str, List[Dict[str, Any]]]:
     """
-    Format retrieved context for the agent.
+    Async execute_rag_search for async agents and endpoints.
     
-    Includes source attribution for each chunk.
+    Retrieval is database- and CPU-bound (RPCs, reranking), so it runs in
+    a worker thread instead of blocking the event loop.
     """
-    if not texts:
-        return "No relevant content found in documents."
+    return await asyncio.to_thread(execute_rag_search, query, document_ids, settings)
+
+
+def _format_context_for_agent(chunks: List[Dict[str, Any]]) -> str:
+    """
+    Format packed chunks for the agent.
     
+    Includes source attribution for each chunk, and its tables in the
+    compact form produced by the context packer.
+    """
     context_parts = []
     
-    for i, (text, chunk) in enumerate(zip(texts, chunks), 1):
+    for chunk in chunks:
+        original_content = chunk.get("original_content") or {}
+        body = "\n\n".join(
+            part for part in [original_content.get("text", "")] + original_content.get("tables", []) if part
+        )
+        if not body:
+            continue
+        
         filename = chunk.get("filename", "Unknown")
         page = chunk.get("page_number", 1)
-        
         context_parts.append(
-            f"[Source {i}: {filename}, Page {page}]\n{text}"
+            f"[Source {len(context_parts) + 1}: {filename}, Page {page}]\n{body}"
         )
+        
+    if not context_parts:
+        return "No relevant content found in documents."
     
     return "\n\n---\n\n".join(context_parts)
 
 
-__all__ = ["rag_search_tool", "execute_rag_search"]
\ No newline at end of file
+__all__ = ["rag_search_tool", "execute_rag_search", "aexecute_rag_search"]
\ No newline at end of file
@@ -1,6 +1,9 @@
+import asyncio
+
 from fastapi import APIRouter, HTTPException, status
 from src.api.deps import CurrentUser
 from src.services.database.repositories.chunk_repo import chunk_repo
+from src.services.storage.asset_store import asset_store
 from src.schemas.chunks import ChunkResponse
 
 router = APIRouter()
@@ -27,6 +30,11 @@ async def get_chunk_details(
                 detail="Chunk not found or access denied"
             )
         
+        # Asset reads are blocking S3/disk I/O
+        original_content = await asyncio.to_thread(
+            asset_store.resolve, chunk.get("original_content") or {}
+        )
+        
         return ChunkResponse(
             id=chunk["id"],
             document_id=chunk["document_id"],
@@ -35,7 +43,7 @@ async def get_chunk_details(
             page_number=chunk["page_number"],
             char_count=chunk["char_count"],
             type=chunk["type"],
-            original_content=chunk.get("original_content"),
+            original_content=original_content,
             filename=chunk["project_documents"]["filename"]
         )
         
@@ -1,3 +1,5 @@
+import asyncio
+
 from fastapi import APIRouter, HTTPException, status
 
 from src.api.deps import CurrentUser
@@ -15,6 +17,10 @@ from src.services.database.repositories.document_repo import (
     DocumentChunkRepository,
 )
 from src.services.storage.s3 import S3Service
+from src.services.storage.asset_store import asset_store
+from src.services.cache.retrieval_cache import bump_document_set_version
+from src.services.cache.document_cache import document_cache
+from src.rag.index_sync import on_document_deleted
 from src.tasks.celery_app import celery_app
 
 router = APIRouter()
@@ -108,6 +114,7 @@ async def confirm_file_upload(
     
     document = result.data[0]
     document_id = document["id"]
+    document_cache.invalidate(document_id)
     
     # Start Celery task
     task = celery_app.send_task(
@@ -197,6 +204,7 @@ async def delete_file(
         s3_client.delete_file(s3_key)
     
     # Delete document (chunks deleted via CASCADE)
+    image_refs = chunk_repo.get_image_refs(file_id)
     deleted = doc_repo.delete(file_id)
     
     if not deleted:
@@ -205,6 +213,12 @@ async def delete_file(
             detail="Failed to delete document"
         )
     
+    # Drop local index rows first, then invalidate cached retrievals, so
+    # nothing cached against the new version still holds this document
+    on_document_deleted(project_id, file_id)
+    bump_document_set_version(project_id)
+    await asyncio.to_thread(chunk_repo.release_image_assets, image_refs)
+    
     return {
         "message": "Document deleted successfully",
         "data": deleted
@@ -225,8 +239,8 @@ async def get_document_chunks(
             detail="Project not found or access denied"
         )
     
-    # Verify document exists
-    doc = doc_repo.get_by_id(file_id)
+    # Verify document exists (metadata cache, no full row needed)
+    doc = doc_repo.get_metadata([file_id]).get(file_id)
     if not doc or doc.get("project_id") != project_id:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -234,6 +248,8 @@ async def get_document_chunks(
         )
     
     chunks = chunk_repo.get_by_document(file_id)
+    # Inline images stored as assets (blocking S3/disk reads, off the loop)
+    chunks = await asyncio.to_thread(asset_store.resolve_many, chunks)
     
     return {
         "message": "Document chunks retrieved successfully",
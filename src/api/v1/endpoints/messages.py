@@ -1,10 +1,12 @@
+import asyncio
+
 from fastapi import APIRouter, HTTPException, status
 from src.api.deps import CurrentUser
 from src.schemas.chat import SendMessageRequest
 from src.services.database.repositories.chat_repo import MessageRepository
 from src.services.database.repositories.project_repo import ProjectSettingsRepository
 from src.services.database.repositories.document_repo import DocumentRepository
-from src.agents import run_simple_agent,run_agentic_agent
+from src.agents import run_simple_agent_async, run_agentic_agent_async
 
 router = APIRouter()
 
@@ -34,7 +36,8 @@ async def send_message(
         
         # 1. Save user message
         print("💾 Saving user message...")
-        user_message = message_repo.create_user_message(
+        user_message = await asyncio.to_thread(
+            message_repo.create_user_message,
             chat_id=chat_id,
             content=message,
             clerk_id=clerk_id
@@ -42,7 +45,7 @@ async def send_message(
         print(f"✅ User message saved: {user_message['id']}")
         
         # 2. Load project settings
-        settings = settings_repo.get_by_project_id(project_id)
+        settings = await asyncio.to_thread(settings_repo.get_by_project_id, project_id)
         if not settings:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -55,17 +58,17 @@ async def send_message(
         print(f"🤖 Using agent: {agent_type}, provider: {llm_provider}")
 
         # 4. Get document IDs
-        document_ids = doc_repo.get_document_ids(project_id)
+        document_ids = await asyncio.to_thread(doc_repo.get_document_ids, project_id)
         print(f"📄 Found {len(document_ids)} documents")
 
         # 5. Load chat history for context
-        chat_history = _load_chat_history(chat_id)
+        chat_history = await asyncio.to_thread(_load_chat_history, chat_id)
         print(f"💬 Loaded {len(chat_history)} history messages")
 
         # 6. Run the appropriate agent
         if agent_type == "agentic":
             print("🚀 Running Agentic Agent (RAG + Web Search)...")
-            result = run_agentic_agent(
+            result = await run_agentic_agent_async(
                 query=message,
                 chat_history=chat_history,
                 document_ids=document_ids,
@@ -73,7 +76,7 @@ async def send_message(
             )
         else:
             print("🚀 Running Simple Agent (RAG only)...")
-            result = run_simple_agent(
+            result = await run_simple_agent_async(
                 query=message,
                 chat_history=chat_history,
                 document_ids=document_ids,
@@ -84,7 +87,8 @@ async def send_message(
 
         # 7. Save AI response
         print("💾 Saving AI message...")
-        ai_message = message_repo.create_assistant_message(
+        ai_message = await asyncio.to_thread(
+            message_repo.create_assistant_message,
             chat_id=chat_id,
             content=result.response,
             clerk_id=clerk_id,
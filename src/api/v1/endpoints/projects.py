@@ -1,3 +1,5 @@
+import asyncio
+
 from fastapi import APIRouter, HTTPException, status
 
 from src.api.deps import CurrentUser
@@ -10,6 +12,7 @@ from src.services.database.repositories.project_repo import (
     ProjectSettingsRepository,
 )
 from src.services.database.repositories.chat_repo import ChatRepository
+from src.rag.adaptive import adaptive_controller
 
 router = APIRouter()
 
@@ -166,6 +169,24 @@ async def update_project_settings(
     }
 
 
+@router.get("/{project_id}/settings/adaptive-stats")
+async def get_adaptive_retrieval_stats(project_id: str, clerk_id: CurrentUser):
+    """Get how often adaptive retrieval escalated, and how often that helped."""
+    # Verify project access
+    if not project_repo.exists(project_id, clerk_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Project not found or access denied"
+        )
+    
+    stats = await asyncio.to_thread(adaptive_controller.stats.get, project_id)
+    
+    return {
+        "message": "Adaptive retrieval stats retrieved successfully",
+        "data": stats
+    }
+
+
 @router.get("/{project_id}/chats")
 async def get_project_chats(project_id: str, clerk_id: CurrentUser):
     """Get all chats for a project."""   
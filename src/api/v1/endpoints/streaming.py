@@ -4,6 +4,7 @@ Streaming Messages Endpoint with Guardrails Support
 Place at: src/api/v1/endpoints/streaming.py
 """
 
+import asyncio
 import json
 from fastapi import APIRouter, HTTPException
 from fastapi.responses import StreamingResponse
@@ -39,7 +40,8 @@ async def stream_message(
         print(f"\n💬 [STREAM] New message: {message[:50]}...")
         
         # 1. Save user message
-        user_message = message_repo.create_user_message(
+        user_message = await asyncio.to_thread(
+            message_repo.create_user_message,
             chat_id=chat_id,
             content=message,
             clerk_id=clerk_id
@@ -47,15 +49,15 @@ async def stream_message(
         print(f"✅ User message saved: {user_message['id']}")
         
         # 2. Load settings
-        settings = settings_repo.get_by_project_id(project_id)
+        settings = await asyncio.to_thread(settings_repo.get_by_project_id, project_id)
         if not settings:
             raise HTTPException(status_code=404, detail="Project settings not found")
         
         # 3. Get document IDs
-        document_ids = doc_repo.get_document_ids(project_id)
+        document_ids = await asyncio.to_thread(doc_repo.get_document_ids, project_id)
         
         # 4. Load chat history
-        chat_history = _load_chat_history(chat_id)
+        chat_history = await asyncio.to_thread(_load_chat_history, chat_id)
         
         # 5. Stream response
         async def generate_events():
@@ -97,7 +99,8 @@ async def stream_message(
                     yield format_sse_event(event)
                 
                 # Save AI message (even if blocked - save the block message)
-                ai_message = message_repo.create_assistant_message(
+                ai_message = await asyncio.to_thread(
+                    message_repo.create_assistant_message,
                     chat_id=chat_id,
                     content=full_response if full_response else "I couldn't process that request.",
                     clerk_id=clerk_id,
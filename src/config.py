@@ -52,6 +52,11 @@ class Settings(BaseSettings):
     AWS_SECRET_ACCESS_KEY: str
     AWS_REGION: str = "ap-south-1"
     S3_BUCKET_NAME: str
+    # Chunk images by content hash ("inline" keeps them in document_chunks rows)
+    ASSET_STORE_BACKEND: Literal["inline", "s3", "disk"] = "s3"
+    ASSET_STORE_DIR: str = "data/assets"
+    ASSET_STORE_PREFIX: str = "assets/images"
+    ASSET_STORE_MAX_WORKERS: int = 8
     
     # =========================================================================
     # LLM Provider Selection
@@ -77,6 +82,75 @@ class Settings(BaseSettings):
     # =========================================================================
     EMBEDDING_DIMENSIONS: int = 1536
     
+    # Prefix stored in document_chunks.embedding_short (vector(256) column, 0 disables)
+    EMBEDDING_SHORT_DIMENSIONS: int = 256
+    
+    # Query embedding cache (in-process LRU in front of Redis)
+    EMBEDDING_CACHE_ENABLED: bool = True
+    EMBEDDING_CACHE_MAX_ITEMS: int = 2048
+    EMBEDDING_CACHE_TTL: int = 7 * 24 * 3600
+    
+    # =========================================================================
+    # RAG Retrieval
+    # =========================================================================
+    RAG_SEARCH_MAX_WORKERS: int = 8
+    HYBRID_SEARCH_MODE: Literal["sequential", "concurrent", "server"] = "concurrent"
+    MULTI_QUERY_DEDUP_THRESHOLD: float = 0.95
+    RAG_FUSION_METHOD: Literal["rrf", "combsum", "combmnz"] = "rrf"
+    RETRIEVAL_CACHE_ENABLED: bool = True
+    RETRIEVAL_CACHE_TTL: int = 3600
+    SEMANTIC_CACHE_ENABLED: bool = True
+    SEMANTIC_CACHE_THRESHOLD: float = 0.95
+    SEMANTIC_CACHE_MAX_ENTRIES: int = 500
+    SEMANTIC_CACHE_TTL: int = 24 * 3600
+    QUERY_VARIATION_CACHE_ENABLED: bool = True
+    QUERY_VARIATION_CACHE_TTL: int = 7 * 24 * 3600
+    DOCUMENT_CACHE_ENABLED: bool = True
+    DOCUMENT_CACHE_MAX_ITEMS: int = 4096
+    DOCUMENT_CACHE_TTL: int = 24 * 3600
+    DOCUMENT_CACHE_LOCAL_TTL: int = 60
+    RERANKER_MAX_CANDIDATES: int = 30
+    RERANKER_BATCH_SIZE: int = 16
+    RERANKER_SCORE_CACHE_SIZE: int = 4096
+    RERANKER_DEVICE: str = "cpu"
+    RERANKER_RETRY_SECONDS: int = 300
+    RERANKER_WARMUP: bool = True
+    MMR_MAX_CANDIDATES: int = 50
+    VECTOR_STORE_UPSERT_BATCH_SIZE: int = 100
+    VECTOR_SEARCH_EF_SEARCH: int = 100
+    VECTOR_SEARCH_RESCORE_CANDIDATES: int = 100
+    # Prompt context token budgets per LLM provider
+    CONTEXT_TOKEN_BUDGET_OPENAI: int = 6000
+    CONTEXT_TOKEN_BUDGET_OLLAMA: int = 3000
+    # Extractive compression (projects with context_compression enabled)
+    CONTEXT_COMPRESSION_MAX_SENTENCES: int = 4
+    CONTEXT_COMPRESSION_NEIGHBOURS: int = 1
+    CONTEXT_COMPRESSION_CACHE_SIZE: int = 2048
+    # Images per multimodal prompt, downscaled to IMAGE_MAX_DIMENSION pixels
+    IMAGE_BUDGET_OPENAI: int = 6
+    IMAGE_BUDGET_OLLAMA: int = 2
+    IMAGE_MAX_DIMENSION: int = 1024
+    IMAGE_JPEG_QUALITY: int = 80
+    IMAGE_CACHE_ENABLED: bool = True
+    IMAGE_CACHE_TTL: int = 7 * 24 * 3600
+    # Adaptive retrieval: confident when top similarity >= threshold + margin
+    ADAPTIVE_RETRIEVAL_MARGIN: float = 0.25
+    
+    # Local Vector Index (projects with vector_backend = "local")
+    LOCAL_INDEX_DIR: str = "data/vector_indexes"
+    LOCAL_INDEX_DTYPE: Literal["float16", "float32"] = "float16"
+    LOCAL_INDEX_EXACT_MAX_ROWS: int = 20000
+    LOCAL_INDEX_NPROBE: int = 8
+    LOCAL_INDEX_KMEANS_ITERATIONS: int = 8
+    LOCAL_INDEX_COMPACT_RATIO: float = 0.3
+    
+    # BM25 Keyword Index (projects with keyword_backend = "bm25")
+    BM25_SNAPSHOT_BACKEND: Literal["disk", "redis"] = "disk"
+    BM25_INDEX_DIR: str = "data/bm25_indexes"
+    BM25_K1: float = 1.2
+    BM25_B: float = 0.75
+    BM25_COMPACT_RATIO: float = 0.3
+    
     # =========================================================================
     # Clerk Authentication
     # =========================================================================
@@ -0,0 +1,69 @@
+import json
+from typing import List, Sequence
+
+import numpy as np
+
+
+def to_matrix(vectors: Sequence[Sequence[float]], dtype=np.float32) -> np.ndarray:
+    """Stack a list of vectors into a 2-D array."""
+    return np.asarray(vectors, dtype=dtype).reshape(len(vectors), -1)
+
+
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """L2-normalize each row; zero rows are left as zeros."""
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def truncate_rows(matrix: np.ndarray, dimensions: int) -> np.ndarray:
+    """
+    Keep the first `dimensions` components of each row and re-normalize.
+    
+    Matryoshka-trained embeddings (OpenAI text-embedding-3-*) stay usable
+    when shortened this way.
+    """
+    return normalize_rows(matrix[:, :dimensions])
+
+
+def cosine_similarity_matrix(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Pairwise cosine similarity between the rows of a and the rows of b."""
+    return normalize_rows(a) @ normalize_rows(b).T
+
+
+def dedupe_by_similarity(
+    vectors: Sequence[Sequence[float]],
+    threshold: float
+) -> List[int]:
+    """
+    Greedily drop vectors that are near-duplicates of an earlier one.
+    
+    Args:
+        vectors: Vectors in priority order (earlier ones win)
+        threshold: Cosine similarity at or above which a vector is a duplicate
+    
+    Returns:
+        Indices of the vectors to keep, in their original order
+    """
+    if not vectors:
+        return []
+    
+    similarities = cosine_similarity_matrix(to_matrix(vectors), to_matrix(vectors))
+    kept: List[int] = []
+    
+    for i in range(len(vectors)):
+        if all(similarities[i, j] < threshold for j in kept):
+            kept.append(i)
+    
+    return kept
+
+
+def parse_vector(value) -> List[float]:
+    """
+    Parse a pgvector value as returned by PostgREST.
+    
+    Vectors come back either as a JSON list or as its text form "[0.1,0.2,...]".
+    """
+    if isinstance(value, str):
+        return json.loads(value)
+    return list(value)
@@ -1,4 +1,5 @@
 import logging
+import asyncio
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
@@ -8,6 +9,7 @@ from src.config import settings
 from src.api.v1.router import api_router
 from src.core.middleware import LoggingMiddleware, RequestIDMiddleware
 from src.services.cache.redis import redis_service
+from src.rag.reranker import warm_up_scorer
 
 # Configure logging
 logging.basicConfig(
@@ -32,6 +34,11 @@ async def lifespan(app: FastAPI):
     else:
         logger.warning("⚠️ Redis connection failed - caching disabled")
     
+    # Load the reranking model in the background; requests keep retrieval
+    # order until it is ready instead of waiting for the download
+    if settings.RERANKER_WARMUP:
+        asyncio.get_running_loop().run_in_executor(None, warm_up_scorer)
+    
     yield
     
     # Shutdown
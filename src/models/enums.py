@@ -21,6 +21,40 @@ class RAGStrategy(str, Enum):
     MULTI_QUERY_HYBRID = "multi-query-hybrid"    # Multiple query variations + hybrid
 
 
+class HybridSearchMode(str, Enum):
+    """Execution modes for hybrid (vector + keyword) search."""
+    SEQUENTIAL = "sequential"            # Vector leg, then keyword leg
+    CONCURRENT = "concurrent"            # Both legs at once on the search pool
+    SERVER = "server"                    # Single RPC, RRF fused in Postgres
+
+
+class VectorBackend(str, Enum):
+    """Where vector similarity search runs."""
+    PGVECTOR = "pgvector"                # Supabase RPC against the HNSW index
+    LOCAL = "local"                      # Per-project memory-mapped index in the API process
+
+
+class VectorSearchMode(str, Enum):
+    """Embedding representation used for the first ANN pass (pgvector backend)."""
+    FULL = "full"                        # float32 vector(1536) HNSW index
+    HALFVEC = "halfvec"                  # float16 copy, candidates rescored with full vectors
+    BINARY = "binary"                    # 1-bit quantization (Hamming), rescored with full vectors
+    MATRYOSHKA = "matryoshka"            # 256-dim prefix (embedding_short), rescored with full vectors
+
+
+class KeywordBackend(str, Enum):
+    """Where keyword search runs."""
+    POSTGRES = "postgres"                # Postgres full-text search (ts_rank_cd) RPC
+    BM25 = "bm25"                        # Per-project in-process BM25 inverted index
+
+
+class FusionMethod(str, Enum):
+    """Methods for fusing several ranked result lists."""
+    RRF = "rrf"                          # Reciprocal rank fusion
+    COMBSUM = "combsum"                  # Sum of min-max normalized scores
+    COMBMNZ = "combmnz"                  # CombSUM x number of lists containing the chunk
+
+
 class AgentType(str, Enum):
     """Agent behavior types."""
     AGENTIC = "agentic"
@@ -1,14 +1,25 @@
 from src.rag.vector_search import VectorSearch, vector_search
 from src.rag.keyword_search import KeywordSearch, keyword_search
 from src.rag.hybrid_search import HybridSearch, hybrid_search
+from src.rag.vector_store import VectorStore, PgVectorStore, InMemoryVectorStore, pg_vector_store
+from src.rag.local_index import LocalVectorIndex, LocalIndexVectorStore, local_index_manager
+from src.rag.bm25_index import BM25Index, BM25KeywordSearch, bm25_index_manager
 from src.rag.rrf import reciprocal_rank_fusion, fuse_two_lists
+from src.rag.fusion import fuse
 from src.rag.query_expansion import generate_query_variations, expand_query_with_context
 from src.rag.context_builder import build_context, format_context_for_prompt
+from src.rag.context_packer import ContextPacker, context_packer, count_tokens, compact_table
+from src.rag.context_compressor import ContextCompressor, context_compressor
+from src.rag.image_selector import ImageSelector, image_selector
 from src.rag.prompt_builder import (
     build_system_prompt,
     prepare_prompt_and_invoke_llm,
+    aprepare_prompt_and_invoke_llm,
     prepare_simple_prompt,
 )
+from src.rag.reranker import Reranker, LexicalScorer, reranker
+from src.rag.mmr import MMRSelector, mmr_select, mmr_selector
+from src.rag.adaptive import AdaptiveRetrievalController, AdaptiveStats, adaptive_controller
 from src.rag.pipeline import RAGPipeline, rag_pipeline
 
 __all__ = [
@@ -16,6 +27,17 @@ __all__ = [
     "VectorSearch",
     "KeywordSearch",
     "HybridSearch",
+    "LocalVectorIndex",
+    "local_index_manager",
+    "BM25Index",
+    "BM25KeywordSearch",
+    "bm25_index_manager",
+    # Vector stores
+    "VectorStore",
+    "PgVectorStore",
+    "InMemoryVectorStore",
+    "LocalIndexVectorStore",
+    "pg_vector_store",
     # Search instances
     "vector_search",
     "keyword_search",
@@ -23,16 +45,38 @@ __all__ = [
     # RRF
     "reciprocal_rank_fusion",
     "fuse_two_lists",
+    "fuse",
     # Query expansion
     "generate_query_variations",
     "expand_query_with_context",
     # Context
     "build_context",
     "format_context_for_prompt",
+    "ContextPacker",
+    "context_packer",
+    "count_tokens",
+    "compact_table",
+    "ContextCompressor",
+    "context_compressor",
+    "ImageSelector",
+    "image_selector",
     # Prompt
     "build_system_prompt",
     "prepare_prompt_and_invoke_llm",
+    "aprepare_prompt_and_invoke_llm",
     "prepare_simple_prompt",
+    # Reranking
+    "Reranker",
+    "LexicalScorer",
+    "reranker",
+    # Diversification
+    "MMRSelector",
+    "mmr_select",
+    "mmr_selector",
+    # Adaptive retrieval
+    "AdaptiveRetrievalController",
+    "AdaptiveStats",
+    "adaptive_controller",
     # Pipeline
     "RAGPipeline",
     "rag_pipeline",
@@ -0,0 +1,105 @@
+from typing import List, Dict, Any, Optional
+
+from src.config import settings as app_settings
+from src.models.enums import RAGStrategy
+from src.services.cache.redis import redis_service
+
+
+class AdaptiveStats:
+    """
+    Per-project counters of adaptive retrieval outcomes, kept in Redis.
+    
+    Counters:
+    - confident: the first vector pass was used as is
+    - hybrid / multi-query-vector / multi-query-hybrid: escalations to that strategy
+    - <strategy>:helped: escalations that put new chunks into the final context
+    """
+    
+    KEY_PREFIX = "rag:adaptive:v1"
+    
+    def __init__(self, redis=None):
+        self.redis = redis or redis_service
+    
+    def record(self, project_id: Optional[str], outcome: str, helped: bool = False) -> None:
+        """Count one retrieval outcome. Never raises."""
+        if not project_id:
+            return
+        
+        try:
+            self.redis.incr(f"{self.KEY_PREFIX}:{project_id}:{outcome}")
+            if helped:
+                self.redis.incr(f"{self.KEY_PREFIX}:{project_id}:{outcome}:helped")
+        except Exception as e:
+            print(f"⚠️ Adaptive retrieval stats write failed: {e}")
+    
+    def get(self, project_id: str) -> Dict[str, int]:
+        """All counters of a project in one MGET (missing counters are 0). Never raises."""
+        names = ["confident"]
+        for strategy in RAGStrategy:
+            if strategy != RAGStrategy.BASIC:
+                names += [strategy.value, f"{strategy.value}:helped"]
+        
+        try:
+            values = self.redis.get_many([f"{self.KEY_PREFIX}:{project_id}:{name}" for name in names])
+        except Exception as e:
+            print(f"⚠️ Adaptive retrieval stats read failed: {e}")
+            values = [None] * len(names)
+        
+        return {name: int(value or 0) for name, value in zip(names, values)}
+
+
+class AdaptiveRetrievalController:
+    """
+    Decides whether a cheap vector pass is good enough for a costlier strategy.
+    
+    The first pass is confident when its best similarity clears
+    similarity_threshold by ADAPTIVE_RETRIEVAL_MARGIN and it filled the
+    final context. Otherwise the controller escalates:
+    - confident top hit but too few results: add the keyword leg (hybrid)
+    - weak top hit: the configured strategy, including LLM query expansion
+    Escalation never goes beyond the project's configured strategy.
+    """
+    
+    def __init__(self, margin: Optional[float] = None, stats: Optional[AdaptiveStats] = None):
+        self.margin = app_settings.ADAPTIVE_RETRIEVAL_MARGIN if margin is None else margin
+        self.stats = stats or AdaptiveStats()
+    
+    def escalation(
+        self,
+        strategy: str,
+        first_pass: List[Dict[str, Any]],
+        settings: Dict[str, Any]
+    ) -> Optional[str]:
+        """
+        Strategy to escalate to after the first vector pass.
+        
+        Returns:
+            None when the first pass is good enough, else a RAGStrategy value
+        """
+        if strategy == RAGStrategy.BASIC.value:
+            return None
+        
+        confidence = settings.get("similarity_threshold", 0.3) + self.margin
+        top_similarity = max((chunk.get("similarity") or 0.0 for chunk in first_pass), default=0.0)
+        confident = top_similarity >= confidence
+        
+        if confident and len(first_pass) >= settings.get("final_context_size", 5):
+            return None
+        
+        if confident and strategy == RAGStrategy.MULTI_QUERY_HYBRID.value:
+            return RAGStrategy.HYBRID.value
+        return strategy
+    
+    @staticmethod
+    def helped(
+        first_pass: List[Dict[str, Any]],
+        escalated: List[Dict[str, Any]],
+        final_size: int
+    ) -> bool:
+        """Whether escalation brought chunks the first pass missed into the final context."""
+        seen = {chunk.get("id") for chunk in first_pass}
+        return any(chunk.get("id") not in seen for chunk in escalated[:final_size])
+
+
+# Default instance
+adaptive_controller = AdaptiveRetrievalController()
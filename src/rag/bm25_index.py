@@ -0,0 +1,461 @@
+import fcntl
+import io
+import json
+import math
+import os
+import re
+import threading
+from array import array
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.config import settings as app_settings
+from src.rag.keyword_search import LEAN_COLUMNS as KEYWORD_COLUMNS
+from src.rag.vector_store import project_columns
+from src.services.cache.redis import redis_service
+from src.services.database.repositories.document_repo import DocumentChunkRepository
+
+
+# Chunk fields kept with each row so results need no database round trip
+PAYLOAD_COLUMNS = tuple(c for c in KEYWORD_COLUMNS if c != "rank")
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+# Postgres' english stop words, so both backends ignore the same terms
+STOPWORDS = frozenset("""
+a about above after again against all am an and any are as at be because been before being below
+between both but by can did do does doing don down during each few for from further had has have
+having he her here hers herself him himself his how i if in into is it its itself just me more most
+my myself no nor not now of off on once only or other our ours ourselves out over own s same she
+should so some such t than that the their theirs them themselves then there these they this those
+through to too under until up very was we were what when where which while who whom why will with
+you your yours yourself yourselves
+""".split())
+
+SNAPSHOT_VERSION = 1
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased word tokens without stop words (no stemming)."""
+    return [token for token in TOKEN_PATTERN.findall(text.lower()) if token not in STOPWORDS]
+
+
+class BM25Index:
+    """
+    In-process Okapi BM25 inverted index over one project's chunks.
+    
+    Postings are compact per-term arrays of (row, term frequency) that
+    only ever grow: adding a document appends rows, deleting one retires
+    its document code so its rows drop out of scoring and statistics.
+    compacted() rebuilds without retired rows once they pile up.
+    
+    A lock guards every read and write, since NumPy views over the
+    postings block the arrays from growing while they are alive.
+    """
+    
+    def __init__(self, k1: Optional[float] = None, b: Optional[float] = None):
+        self.k1 = k1 if k1 is not None else app_settings.BM25_K1
+        self.b = b if b is not None else app_settings.BM25_B
+        
+        self.terms: Dict[str, int] = {}
+        self.posting_rows: List[array] = []
+        self.posting_freqs: List[array] = []
+        
+        self.row_lengths = array("I")
+        self.row_codes = array("I")
+        self.payloads: List[Dict[str, Any]] = []
+        
+        # Live document id -> code; codes of deleted documents are never reused
+        self.documents: Dict[str, int] = {}
+        self.next_code = 0
+        self.live_rows = 0
+        self.live_length = 0
+        
+        self._lock = threading.RLock()
+    
+    @property
+    def count(self) -> int:
+        return len(self.payloads)
+    
+    @property
+    def deleted_ratio(self) -> float:
+        """Share of rows that belong to deleted documents."""
+        return 1.0 - self.live_rows / self.count if self.count else 0.0
+    
+    # ==================== WRITING ====================
+    
+    def add(self, rows: List[Dict[str, Any]]) -> int:
+        """
+        Index chunk rows; a document that is already indexed is replaced.
+        
+        Returns:
+            Number of rows added
+        """
+        with self._lock:
+            for document_id in dict.fromkeys(row["document_id"] for row in rows):
+                self.delete_document(document_id)
+                self.documents[document_id] = self.next_code
+                self.next_code += 1
+            
+            for row in rows:
+                tokens = tokenize(row.get("content") or "")
+                row_id = len(self.payloads)
+                
+                for term, freq in Counter(tokens).items():
+                    term_id = self.terms.get(term)
+                    if term_id is None:
+                        term_id = self.terms[term] = len(self.posting_rows)
+                        self.posting_rows.append(array("I"))
+                        self.posting_freqs.append(array("I"))
+                    self.posting_rows[term_id].append(row_id)
+                    self.posting_freqs[term_id].append(freq)
+                
+                self.row_lengths.append(len(tokens))
+                self.row_codes.append(self.documents[row["document_id"]])
+                self.payloads.append({column: row.get(column) for column in PAYLOAD_COLUMNS})
+                self.live_rows += 1
+                self.live_length += len(tokens)
+        
+        return len(rows)
+    
+    def delete_document(self, document_id: str) -> int:
+        """Retire a document's rows; returns how many were live."""
+        with self._lock:
+            code = self.documents.pop(document_id, None)
+            if code is None:
+                return 0
+            
+            rows = np.frombuffer(self.row_codes, dtype=np.uint32) == code
+            removed = int(rows.sum())
+            self.live_rows -= removed
+            self.live_length -= int(np.frombuffer(self.row_lengths, dtype=np.uint32)[rows].sum())
+            del rows
+            return removed
+    
+    def compacted(self) -> "BM25Index":
+        """A fresh index holding only the live rows."""
+        with self._lock:
+            live_codes = set(self.documents.values())
+            rows = [
+                payload for payload, code in zip(self.payloads, self.row_codes)
+                if code in live_codes
+            ]
+        
+        index = BM25Index(self.k1, self.b)
+        index.add(rows)
+        return index
+    
+    # ==================== SEARCH ====================
+    
+    def search(
+        self,
+        query: str,
+        document_ids: Optional[List[str]],
+        chunks_per_search: int = 10
+    ) -> List[Dict[str, Any]]:
+        """
+        Score live rows of the given documents against the query.
+        
+        Only postings of the query terms are touched; idf and the average
+        row length come from every live row of the project.
+        
+        Returns:
+            Chunk payloads with a BM25 'rank', best first
+        """
+        tokens = dict.fromkeys(tokenize(query))
+        
+        with self._lock:
+            terms = [self.terms[t] for t in tokens if t in self.terms]
+            if not terms or not self.live_rows:
+                return []
+            
+            # Per document code: live at all, and inside the requested documents
+            live = np.zeros(self.next_code, dtype=bool)
+            live[list(self.documents.values())] = True
+            if document_ids is None:
+                wanted = live
+            else:
+                wanted = np.zeros(self.next_code, dtype=bool)
+                wanted[[self.documents[d] for d in document_ids if d in self.documents]] = True
+            
+            row_codes = np.frombuffer(self.row_codes, dtype=np.uint32)
+            row_lengths = np.frombuffer(self.row_lengths, dtype=np.uint32)
+            avg_length = self.live_length / self.live_rows if self.live_length else 1.0
+            
+            matched_rows, matched_scores = [], []
+            for term_id in terms:
+                rows = np.frombuffer(self.posting_rows[term_id], dtype=np.uint32)
+                freqs = np.frombuffer(self.posting_freqs[term_id], dtype=np.uint32)
+                codes = row_codes[rows]
+                
+                df = int(live[codes].sum())
+                if not df:
+                    continue
+                idf = math.log(1.0 + (self.live_rows - df + 0.5) / (df + 0.5))
+                
+                keep = wanted[codes]
+                rows, freqs = rows[keep], freqs[keep].astype(np.float32)
+                norm = self.k1 * (1.0 - self.b + self.b * row_lengths[rows] / avg_length)
+                matched_rows.append(rows)
+                matched_scores.append(idf * freqs * (self.k1 + 1.0) / (freqs + norm))
+            
+            del row_codes, row_lengths
+            if not matched_rows:
+                return []
+            
+            rows, inverse = np.unique(np.concatenate(matched_rows), return_inverse=True)
+            scores = np.bincount(inverse, weights=np.concatenate(matched_scores))
+            
+            if len(rows) > chunks_per_search:
+                top = np.argpartition(-scores, chunks_per_search - 1)[:chunks_per_search]
+                rows, scores = rows[top], scores[top]
+            order = np.argsort(-scores, kind="stable")
+            
+            return [{**self.payloads[int(rows[i])], "rank": float(scores[i])} for i in order]
+    
+    # ==================== SNAPSHOTS ====================
+    
+    def to_bytes(self) -> bytes:
+        """Serialize to an .npz blob (no pickled objects)."""
+        with self._lock:
+            lengths = [len(rows) for rows in self.posting_rows]
+            buffer = io.BytesIO()
+            np.savez(
+                buffer,
+                header=_encode({
+                    "version": SNAPSHOT_VERSION,
+                    "k1": self.k1,
+                    "b": self.b,
+                    "documents": self.documents,
+                    "next_code": self.next_code,
+                    "live_rows": self.live_rows,
+                    "live_length": self.live_length,
+                }),
+                terms=_encode(list(self.terms)),
+                offsets=np.concatenate([[0], np.cumsum(lengths, dtype=np.int64)]),
+                posting_rows=_concat(self.posting_rows),
+                posting_freqs=_concat(self.posting_freqs),
+                row_lengths=np.array(self.row_lengths, dtype=np.uint32),
+                row_codes=np.array(self.row_codes, dtype=np.uint32),
+                payloads=_encode(self.payloads),
+            )
+        return buffer.getvalue()
+    
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "BM25Index":
+        with np.load(io.BytesIO(data), allow_pickle=False) as snapshot:
+            header = _decode(snapshot["header"])
+            if header["version"] != SNAPSHOT_VERSION:
+                raise ValueError(f"Unsupported BM25 snapshot version {header['version']}")
+            
+            index = cls(header["k1"], header["b"])
+            index.documents = header["documents"]
+            index.next_code = header["next_code"]
+            index.live_rows = header["live_rows"]
+            index.live_length = header["live_length"]
+            
+            offsets = snapshot["offsets"]
+            posting_rows, posting_freqs = snapshot["posting_rows"], snapshot["posting_freqs"]
+            index.terms = {term: i for i, term in enumerate(_decode(snapshot["terms"]))}
+            index.posting_rows = [_array(posting_rows[offsets[i]:offsets[i + 1]]) for i in range(len(index.terms))]
+            index.posting_freqs = [_array(posting_freqs[offsets[i]:offsets[i + 1]]) for i in range(len(index.terms))]
+            
+            index.row_lengths = _array(snapshot["row_lengths"])
+            index.row_codes = _array(snapshot["row_codes"])
+            index.payloads = _decode(snapshot["payloads"])
+        
+        return index
+
+
+class BM25IndexManager:
+    """
+    Loads, caches and persists per-project BM25 snapshots.
+    
+    Snapshots live on disk (one .npz per project) or in Redis. Each save
+    bumps a generation (file mtime or a Redis counter), and get() reloads
+    a project's index when the generation changes, so additions made by
+    ingestion workers reach the API process on its next query.
+    """
+    
+    KEY_PREFIX = "rag:bm25:v1"
+    
+    def __init__(self, backend: Optional[str] = None, root: Optional[str] = None, redis=None):
+        self.backend = backend or app_settings.BM25_SNAPSHOT_BACKEND
+        self.root = Path(root or app_settings.BM25_INDEX_DIR)
+        self.redis = redis or redis_service
+        self._indexes: Dict[str, Tuple[Any, BM25Index]] = {}
+        self._lock = threading.Lock()
+    
+    def exists(self, project_id: str) -> bool:
+        return self._generation(project_id) is not None
+    
+    def get(self, project_id: str) -> Optional[BM25Index]:
+        """Open (or reuse) a project's index; None if it has no snapshot."""
+        generation = self._generation(project_id)
+        if generation is None:
+            return None
+        
+        with self._lock:
+            cached = self._indexes.get(project_id)
+            if cached and cached[0] == generation:
+                return cached[1]
+        
+        data = self._read(project_id)
+        if data is None:
+            return None
+        
+        index = BM25Index.from_bytes(data)
+        with self._lock:
+            self._indexes[project_id] = (generation, index)
+        return index
+    
+    def save(self, project_id: str, index: BM25Index) -> None:
+        """Persist a snapshot and make it the cached copy."""
+        self._write(project_id, index.to_bytes())
+        with self._lock:
+            self._indexes[project_id] = (self._generation(project_id), index)
+    
+    def update(self, project_id: str, change) -> Optional[BM25Index]:
+        """
+        Apply change(index) to the latest snapshot and save it.
+        
+        Writers are serialized per project, and the index is compacted when
+        too many of its rows belong to deleted documents.
+        
+        Returns:
+            The saved index, or None if the project has no snapshot
+        """
+        with self._writer_lock(project_id):
+            index = self.get(project_id)
+            if index is None:
+                return None
+            
+            change(index)
+            if index.deleted_ratio > app_settings.BM25_COMPACT_RATIO:
+                index = index.compacted()
+            
+            self.save(project_id, index)
+            return index
+    
+    def evict(self, project_id: str) -> None:
+        with self._lock:
+            self._indexes.pop(project_id, None)
+    
+    # ==================== STORAGE ====================
+    
+    def _path(self, project_id: str) -> Path:
+        return self.root / f"{project_id}.npz"
+    
+    def _key(self, project_id: str, suffix: str) -> str:
+        return f"{self.KEY_PREFIX}:{project_id}:{suffix}"
+    
+    def _generation(self, project_id: str):
+        if self.backend == "redis":
+            return self.redis.get(self._key(project_id, "generation"))
+        try:
+            return self._path(project_id).stat().st_mtime_ns
+        except FileNotFoundError:
+            return None
+    
+    def _read(self, project_id: str) -> Optional[bytes]:
+        if self.backend == "redis":
+            return self.redis.get_bytes(self._key(project_id, "snapshot"))
+        try:
+            return self._path(project_id).read_bytes()
+        except FileNotFoundError:
+            return None
+    
+    def _write(self, project_id: str, data: bytes) -> None:
+        if self.backend == "redis":
+            self.redis.set_bytes(self._key(project_id, "snapshot"), data)
+            self.redis.incr(self._key(project_id, "generation"))
+            return
+        
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp_path = self._path(project_id).with_suffix(".npz.tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, self._path(project_id))
+    
+    @contextmanager
+    def _writer_lock(self, project_id: str):
+        if self.backend == "redis":
+            with self.redis.lock(self._key(project_id, "lock")):
+                yield
+            return
+        
+        self.root.mkdir(parents=True, exist_ok=True)
+        with open(self.root / f"{project_id}.lock", "w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+class BM25KeywordSearch:
+    """
+    Keyword search against a project's BM25 index.
+    
+    Drop-in for KeywordSearch: same search method and result shape, with
+    the BM25 score in 'rank'. The index is built from document_chunks the
+    first time a project is queried.
+    """
+    
+    def __init__(self, project_id: str, manager: Optional[BM25IndexManager] = None):
+        self.project_id = project_id
+        self.manager = manager or bm25_index_manager
+        self.include_embeddings = False
+    
+    def search(
+        self,
+        query: str,
+        document_ids: List[str],
+        chunks_per_search: int = 10,
+        columns: Optional[Sequence[str]] = None,
+        include_embeddings: Optional[bool] = None
+    ) -> List[Dict[str, Any]]:
+        """Search the project's BM25 index, building it on first use."""
+        if include_embeddings is None:
+            include_embeddings = self.include_embeddings
+        
+        index = self.manager.get(self.project_id)
+        if index is None:
+            from src.rag.index_sync import rebuild_keyword_index
+            index = rebuild_keyword_index(self.project_id)
+        
+        results = index.search(query, document_ids, chunks_per_search)
+        
+        if include_embeddings and results:
+            embeddings = DocumentChunkRepository().get_embeddings([r["id"] for r in results])
+            results = [{**r, "embedding": embeddings.get(r["id"])} for r in results]
+        
+        return project_columns(results, columns, include_embeddings, KEYWORD_COLUMNS)
+
+
+def _encode(value: Any) -> np.ndarray:
+    """JSON as a byte array, so snapshots load without pickle."""
+    return np.frombuffer(json.dumps(value).encode("utf-8"), dtype=np.uint8)
+
+
+def _decode(data: np.ndarray) -> Any:
+    return json.loads(data.tobytes().decode("utf-8"))
+
+
+def _concat(arrays: List[array]) -> np.ndarray:
+    if not arrays:
+        return np.zeros(0, dtype=np.uint32)
+    return np.concatenate([np.array(a, dtype=np.uint32) for a in arrays])
+
+
+def _array(values: np.ndarray) -> array:
+    result = array("I")
+    result.frombytes(np.ascontiguousarray(values, dtype=np.uint32).tobytes())
+    return result
+
+
+# Default instance
+bm25_index_manager = BM25IndexManager()
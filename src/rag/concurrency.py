@@ -0,0 +1,42 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, Callable, Tuple
+
+from src.config import settings
+
+
+SEARCH_THREAD_PREFIX = "rag-search"
+
+
+@lru_cache
+def get_search_executor() -> ThreadPoolExecutor:
+    """
+    Get the shared thread pool used to fan out retrieval calls.
+    
+    Search legs are network-bound (embedding API, Supabase RPC), so threads
+    are enough to overlap them. Tasks submitted here must never block on
+    other tasks in the same pool, otherwise a saturated pool can deadlock.
+    """
+    return ThreadPoolExecutor(
+        max_workers=settings.RAG_SEARCH_MAX_WORKERS,
+        thread_name_prefix=SEARCH_THREAD_PREFIX
+    )
+
+
+def in_search_pool() -> bool:
+    """Whether the current thread is a worker of the shared search pool."""
+    return threading.current_thread().name.startswith(SEARCH_THREAD_PREFIX)
+
+
+def timed_call(fn: Callable[..., Any], *args, **kwargs) -> Tuple[Any, float]:
+    """
+    Call a function and measure its wall-clock duration.
+    
+    Returns:
+        Tuple of (result, elapsed_ms)
+    """
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, (time.perf_counter() - start) * 1000
@@ -1,19 +1,27 @@
 from typing import List, Dict, Any, Tuple
 
-from src.services.database.supabase import supabase
+from src.services.database.repositories.document_repo import DocumentRepository
+from src.services.storage.asset_store import asset_store
 from src.schemas.common import Citation
 
 
+doc_repo = DocumentRepository()
+
+
 def build_context(
-    chunks: List[Dict[str, Any]]
+    chunks: List[Dict[str, Any]],
+    fetch_images: bool = True
 ) -> Tuple[List[str], List[str], List[str], List[Citation]]:
     """
     Build RAG context from retrieved chunks.
     
     Extracts text, images, tables, and generates citations from chunks.
+    Images still held as asset references are fetched here, in one batch,
+    so only the chunks that reach the prompt pay for them.
     
     Args:
         chunks: List of document chunks from search
+        fetch_images: Fetch referenced images (off for text-only callers)
         
     Returns:
         Tuple of (texts, images, tables, citations)
@@ -27,26 +35,33 @@ def build_context(
     tables: List[str] = []
     citations: List[Citation] = []
     
-    # Get unique document IDs to fetch filenames
-    doc_ids = [
-        chunk["document_id"] 
-        for chunk in chunks 
-        if chunk.get("document_id")
-    ]
-    unique_doc_ids = list(set(doc_ids))
+    # Lean search results already carry the filename
+    filename_map: Dict[str, str] = {
+        chunk["document_id"]: chunk["filename"]
+        for chunk in chunks
+        if chunk.get("document_id") and chunk.get("filename")
+    }
+    
+    # Fetch filenames only for documents the search didn't label
+    unique_doc_ids = list({
+        chunk["document_id"]
+        for chunk in chunks
+        if chunk.get("document_id") and chunk["document_id"] not in filename_map
+    })
     
-    # Fetch document filenames
-    filename_map: Dict[str, str] = {}
     if unique_doc_ids:
-        result = supabase.table("project_documents")\
-            .select("id", "filename")\
-            .in_("id", unique_doc_ids)\
-            .execute()
-        
-        filename_map = {
-            doc["id"]: doc["filename"] 
-            for doc in result.data
-        }
+        filename_map.update({
+            doc_id: doc["filename"]
+            for doc_id, doc in doc_repo.get_metadata(unique_doc_ids).items()
+        })
+    
+    # Fetch images the chunks only reference
+    image_refs = [
+        ref
+        for chunk in chunks
+        for ref in (chunk.get("original_content") or {}).get("image_refs", [])
+    ]
+    assets = asset_store.get_images(image_refs) if image_refs and fetch_images else {}
     
     # Process each chunk
     for chunk in chunks:
@@ -54,7 +69,9 @@ def build_context(
         
         # Extract content by type
         chunk_text = original_content.get("text", "")
-        chunk_images = original_content.get("images", [])
+        chunk_images = original_content.get("images", []) + [
+            assets[ref] for ref in original_content.get("image_refs", []) if ref in assets
+        ]
         chunk_tables = original_content.get("tables", [])
         
         # Collect content
@@ -0,0 +1,140 @@
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional
+
+import numpy as np
+
+from src.config import settings as app_settings
+from src.core.vector_math import to_matrix, normalize_rows
+from src.services.llm.embeddings import embedding_service
+
+
+# Sentence boundary: ., ! or ? followed by whitespace, or a line break
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+|\n+")
+
+# Marks text dropped between kept sentences
+GAP_MARKER = "…"
+
+
+def split_sentences(text: str) -> List[str]:
+    """Split text into non-empty, stripped sentences."""
+    return [sentence.strip() for sentence in _SENTENCE_END.split(text) if sentence and sentence.strip()]
+
+
+class ContextCompressor:
+    """
+    Query-focused extractive compression of context texts.
+    
+    Each text is split into sentences, which are scored by cosine
+    similarity to the query embedding. The top max_sentences, plus
+    `neighbours` sentences on either side, are kept in their original
+    order. Sentence embeddings are cached per text, and every uncached
+    text is embedded in a single batched call.
+    """
+    
+    def __init__(
+        self,
+        max_sentences: Optional[int] = None,
+        neighbours: Optional[int] = None,
+        cache_size: Optional[int] = None
+    ):
+        self.max_sentences = app_settings.CONTEXT_COMPRESSION_MAX_SENTENCES if max_sentences is None else max_sentences
+        self.neighbours = app_settings.CONTEXT_COMPRESSION_NEIGHBOURS if neighbours is None else neighbours
+        self.cache_size = app_settings.CONTEXT_COMPRESSION_CACHE_SIZE if cache_size is None else cache_size
+        self.embeddings = embedding_service
+        self._cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def compress_texts(self, query: str, texts: List[str]) -> List[str]:
+        """
+        Compress each text to the sentences most relevant to the query.
+        
+        Texts short enough to keep whole are returned unchanged. On an
+        embedding failure the texts are returned uncompressed.
+        """
+        sentences = [split_sentences(text) for text in texts]
+        long_texts = [
+            i for i, text_sentences in enumerate(sentences)
+            if len(text_sentences) > self.max_sentences + 2 * self.neighbours
+        ]
+        if not long_texts:
+            return list(texts)
+        
+        try:
+            query_vector = normalize_rows(to_matrix([self.embeddings.embed_query(query)]))[0]
+            matrices = self._sentence_matrices([sentences[i] for i in long_texts], [texts[i] for i in long_texts])
+        except Exception as e:
+            print(f"⚠️ Context compression failed, using full texts: {e}")
+            return list(texts)
+        
+        compressed = list(texts)
+        before = sum(len(texts[i]) for i in long_texts)
+        for i, matrix in zip(long_texts, matrices):
+            compressed[i] = self._select(sentences[i], matrix @ query_vector)
+        after = sum(len(compressed[i]) for i in long_texts)
+        
+        print(f"🗜️ Compressed {len(long_texts)} context text(s): {before} -> {after} characters")
+        return compressed
+    
+    def compress_chunks(self, query: str, chunks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """compress_texts applied to original_content.text of each chunk (copies)."""
+        texts = [(chunk.get("original_content") or {}).get("text", "") or "" for chunk in chunks]
+        compressed = self.compress_texts(query, texts)
+        
+        result = []
+        for chunk, text, new_text in zip(chunks, texts, compressed):
+            if new_text != text:
+                chunk = {**chunk, "original_content": {**chunk["original_content"], "text": new_text}}
+            result.append(chunk)
+        return result
+    
+    def _select(self, sentences: List[str], scores: np.ndarray) -> str:
+        """Top sentences plus their neighbours, in order, with gap markers."""
+        top = np.argsort(-scores, kind="stable")[:self.max_sentences]
+        keep = sorted({
+            j
+            for i in top
+            for j in range(max(i - self.neighbours, 0), min(i + self.neighbours + 1, len(sentences)))
+        })
+        
+        parts = []
+        for position, j in enumerate(keep):
+            if position and j != keep[position - 1] + 1:
+                parts.append(GAP_MARKER)
+            parts.append(sentences[j])
+        return " ".join(parts)
+    
+    def _sentence_matrices(self, sentences: List[List[str]], texts: List[str]) -> List[np.ndarray]:
+        """Normalized sentence embeddings per text, embedding all misses in one call."""
+        keys = [hashlib.sha256(text.encode("utf-8")).hexdigest() for text in texts]
+        matrices: List[Optional[np.ndarray]] = []
+        with self._lock:
+            for key in keys:
+                matrix = self._cache.get(key)
+                if matrix is not None:
+                    self._cache.move_to_end(key)
+                matrices.append(matrix)
+        
+        missing = [i for i, matrix in enumerate(matrices) if matrix is None]
+        if missing:
+            flat = [sentence for i in missing for sentence in sentences[i]]
+            vectors = normalize_rows(to_matrix(self.embeddings.embed_documents(flat)))
+            
+            offset = 0
+            with self._lock:
+                for i in missing:
+                    count = len(sentences[i])
+                    matrices[i] = vectors[offset:offset + count]
+                    offset += count
+                    self._cache[keys[i]] = matrices[i]
+                    self._cache.move_to_end(keys[i])
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        
+        return matrices
+
+
+# Default instance
+context_compressor = ContextCompressor()
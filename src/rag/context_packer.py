@@ -0,0 +1,217 @@
+import re
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Tuple
+
+from src.config import settings as app_settings
+
+
+# Shortest shared run of characters treated as overlap between adjacent chunks
+MIN_OVERLAP_CHARS = 40
+MAX_OVERLAP_CHARS = 1500
+
+# Tokens spent per chunk on headers and separators in the formatted prompt
+CHUNK_OVERHEAD_TOKENS = 12
+
+_ROW_END = re.compile(r"</tr\s*>", re.IGNORECASE)
+_CELL_END = re.compile(r"</t[dh]\s*>", re.IGNORECASE)
+_TAG = re.compile(r"<[^>]+>")
+_SPACE = re.compile(r"\s+")
+
+
+@lru_cache
+def _encoding():
+    """tiktoken encoding for the configured OpenAI model, or None if unavailable."""
+    try:
+        import tiktoken
+        
+        try:
+            return tiktoken.encoding_for_model(app_settings.OPENAI_MODEL)
+        except KeyError:
+            return tiktoken.get_encoding("o200k_base")
+    except Exception as e:
+        print(f"⚠️ tiktoken unavailable ({e}), estimating tokens from characters")
+        return None
+
+
+def count_tokens(text: str) -> int:
+    """Token count with tiktoken, falling back to ~4 characters per token."""
+    if not text:
+        return 0
+    
+    encoding = _encoding()
+    if encoding is None:
+        return (len(text) + 3) // 4
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def compact_table(table_html: str) -> str:
+    """
+    Reduce an HTML table to one line per row with " | " between cells.
+    
+    Drops tags, attributes and whitespace runs, which are most of the
+    tokens of extracted tables.
+    """
+    rows = []
+    for row_html in _ROW_END.split(table_html):
+        cells = [
+            _SPACE.sub(" ", _TAG.sub(" ", cell)).strip()
+            for cell in _CELL_END.split(row_html)
+        ]
+        cells = [cell for cell in cells if cell]
+        if cells:
+            rows.append(" | ".join(cells))
+    
+    if not rows:
+        # Not a table after all: plain text without markup
+        return _SPACE.sub(" ", _TAG.sub(" ", table_html)).strip()
+    return "\n".join(rows)
+
+
+def overlap_length(left: str, right: str) -> int:
+    """Length of the longest suffix of left that is a prefix of right (0 if short)."""
+    tail = left[-MAX_OVERLAP_CHARS:]
+    head = right[:MIN_OVERLAP_CHARS]
+    if len(head) < MIN_OVERLAP_CHARS:
+        return 0
+    
+    start = tail.find(head)
+    while start != -1:
+        if right.startswith(tail[start:]):
+            return len(tail) - start
+        start = tail.find(head, start + 1)
+    return 0
+
+
+class ContextPacker:
+    """
+    Packs retrieved chunks into a per-provider prompt token budget.
+    
+    Chunks are taken in relevance order. Tables are reduced to compact
+    text, text repeated between adjacent chunks of the same document is
+    dropped, and a chunk that does not fit is skipped in favour of
+    smaller, less relevant ones. Token counts are cached per chunk id.
+    """
+    
+    def __init__(self, budgets: Optional[Dict[str, int]] = None, max_cached: int = 8192):
+        self.budgets = budgets or {
+            "openai": app_settings.CONTEXT_TOKEN_BUDGET_OPENAI,
+            "ollama": app_settings.CONTEXT_TOKEN_BUDGET_OLLAMA,
+        }
+        self.max_cached = max_cached
+        self._token_counts: "OrderedDict[str, int]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def budget_for(self, llm_provider: str) -> int:
+        """Token budget of a provider (the OpenAI budget for unknown ones)."""
+        return self.budgets.get(llm_provider, self.budgets["openai"])
+    
+    def pack(
+        self,
+        chunks: List[Dict[str, Any]],
+        llm_provider: str = "openai",
+        budget: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Select and compact chunks to fit the token budget.
+        
+        Args:
+            chunks: Chunks in relevance order
+            llm_provider: Provider whose budget applies
+            budget: Explicit token budget (overrides the provider's)
+        
+        Returns:
+            Copies of the packed chunks, still in relevance order, whose
+            original_content holds the trimmed text and compact tables
+        """
+        budget = self.budget_for(llm_provider) if budget is None else budget
+        packed: List[Dict[str, Any]] = []
+        packed_texts: Dict[Tuple[Any, Any], str] = {}
+        used = 0
+        
+        for chunk in chunks:
+            original_content = chunk.get("original_content") or {}
+            text = original_content.get("text", "") or ""
+            tables = [compact_table(table) for table in original_content.get("tables", [])]
+            
+            trimmed = self._strip_neighbour_overlap(chunk, text, packed_texts)
+            if trimmed == text:
+                tokens = self._cached_count(chunk, text, tables)
+            else:
+                tokens = self._count(trimmed, tables)
+            
+            if used + tokens > budget:
+                if packed:
+                    continue
+                # The most relevant chunk alone is over budget: keep its head
+                trimmed, tables = self._truncate(trimmed, budget - CHUNK_OVERHEAD_TOKENS), []
+                tokens = budget
+            
+            packed_chunk = dict(chunk)
+            packed_chunk["original_content"] = {**original_content, "text": trimmed, "tables": tables}
+            packed.append(packed_chunk)
+            packed_texts[self._position(chunk)] = text
+            used += tokens
+        
+        if len(packed) < len(chunks):
+            print(f"✂️ Packed {len(packed)}/{len(chunks)} chunks into {used}/{budget} tokens")
+        return packed
+    
+    def _strip_neighbour_overlap(
+        self,
+        chunk: Dict[str, Any],
+        text: str,
+        packed_texts: Dict[Tuple[Any, Any], str]
+    ) -> str:
+        """Drop text this chunk shares with an already packed neighbour."""
+        document_id, index = self._position(chunk)
+        if index is None or not text:
+            return text
+        
+        previous = packed_texts.get((document_id, index - 1))
+        if previous:
+            text = text[overlap_length(previous, text):]
+        
+        following = packed_texts.get((document_id, index + 1))
+        if following:
+            text = text[:len(text) - overlap_length(text, following)]
+        
+        return text
+    
+    def _cached_count(self, chunk: Dict[str, Any], text: str, tables: List[str]) -> int:
+        chunk_id = chunk.get("id")
+        if not chunk_id:
+            return self._count(text, tables)
+        
+        with self._lock:
+            tokens = self._token_counts.get(chunk_id)
+            if tokens is not None:
+                self._token_counts.move_to_end(chunk_id)
+                return tokens
+        
+        tokens = self._count(text, tables)
+        with self._lock:
+            self._token_counts[chunk_id] = tokens
+            while len(self._token_counts) > self.max_cached:
+                self._token_counts.popitem(last=False)
+        return tokens
+    
+    @staticmethod
+    def _count(text: str, tables: List[str]) -> int:
+        return CHUNK_OVERHEAD_TOKENS + count_tokens(text) + sum(count_tokens(table) for table in tables)
+    
+    @staticmethod
+    def _truncate(text: str, max_tokens: int) -> str:
+        encoding = _encoding()
+        if encoding is None:
+            return text[:max(max_tokens, 0) * 4]
+        return encoding.decode(encoding.encode(text, disallowed_special=())[:max(max_tokens, 0)])
+    
+    @staticmethod
+    def _position(chunk: Dict[str, Any]) -> Tuple[Any, Any]:
+        return chunk.get("document_id"), chunk.get("chunk_index")
+
+
+# Default instance
+context_packer = ContextPacker()
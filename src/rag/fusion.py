@@ -0,0 +1,135 @@
+import heapq
+from operator import itemgetter
+from typing import List, Dict, Any, Optional
+
+from src.models.enums import FusionMethod
+
+
+# Per-list score fields, in the order they are looked for
+SCORE_KEYS = ("rerank_score", "rrf_score", "similarity", "rank")
+
+
+def fuse(
+    search_results_list: List[List[Dict[str, Any]]],
+    method: str = FusionMethod.RRF.value,
+    weights: Optional[List[float]] = None,
+    k: int = 60,
+    top_k: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """
+    Fuse several ranked result lists into one.
+    
+    Scores are accumulated per chunk id in a plain dict. With top_k the
+    winners are picked with a heap instead of a full sort, and only the
+    returned chunks are copied (to attach their fused score).
+    
+    Methods:
+    - rrf: Σ weight_i / (k + rank_i + 1), stored as 'rrf_score'
+    - combsum: Σ weight_i * min-max normalized score_i, stored as 'fusion_score'
+    - combmnz: combsum * number of lists containing the chunk, stored as 'fusion_score'
+    
+    Args:
+        search_results_list: List of search result lists to fuse
+        method: Fusion method (see FusionMethod)
+        weights: Optional weights for each result list (defaults to equal)
+        k: RRF ranking constant
+        top_k: Number of fused results to return (None returns all)
+    
+    Returns:
+        Fused results sorted by fused score; ties keep first-seen order
+    """
+    if not search_results_list or not any(search_results_list):
+        return []
+    
+    method = FusionMethod(method)
+    
+    # Default to equal weights
+    if weights is None:
+        weights = [1.0 / len(search_results_list)] * len(search_results_list)
+    
+    if method == FusionMethod.RRF:
+        scores, first_seen = _rrf_scores(search_results_list, weights, k)
+        score_key = "rrf_score"
+    else:
+        scores, first_seen, hits = _normalized_scores(search_results_list, weights)
+        if method == FusionMethod.COMBMNZ:
+            scores = {cid: score * hits[cid] for cid, score in scores.items()}
+        score_key = "fusion_score"
+    
+    if top_k is None or top_k >= len(scores):
+        winners = sorted(scores.items(), key=itemgetter(1), reverse=True)
+    else:
+        winners = heapq.nlargest(top_k, scores.items(), key=itemgetter(1))
+    
+    return [{**first_seen[cid], score_key: score} for cid, score in winners]
+
+
+def _rrf_scores(
+    search_results_list: List[List[Dict[str, Any]]],
+    weights: List[float],
+    k: int
+):
+    scores: Dict[str, float] = {}
+    first_seen: Dict[str, Dict[str, Any]] = {}
+    
+    for weight, results in zip(weights, search_results_list):
+        for rank, chunk in enumerate(results):
+            chunk_id = chunk.get("id")
+            if not chunk_id:
+                continue
+            
+            if chunk_id in scores:
+                scores[chunk_id] += weight * (1.0 / (k + rank + 1))
+            else:
+                scores[chunk_id] = weight * (1.0 / (k + rank + 1))
+                first_seen[chunk_id] = chunk
+    
+    return scores, first_seen
+
+
+def _normalized_scores(
+    search_results_list: List[List[Dict[str, Any]]],
+    weights: List[float]
+):
+    scores: Dict[str, float] = {}
+    first_seen: Dict[str, Dict[str, Any]] = {}
+    hits: Dict[str, int] = {}
+    
+    for weight, results in zip(weights, search_results_list):
+        for chunk, normalized in zip(results, _min_max(results)):
+            chunk_id = chunk.get("id")
+            if not chunk_id:
+                continue
+            
+            if chunk_id in scores:
+                scores[chunk_id] += weight * normalized
+                hits[chunk_id] += 1
+            else:
+                scores[chunk_id] = weight * normalized
+                hits[chunk_id] = 1
+                first_seen[chunk_id] = chunk
+    
+    return scores, first_seen, hits
+
+
+def _min_max(results: List[Dict[str, Any]]) -> List[float]:
+    """
+    Min-max normalize a list's scores to [0, 1].
+    
+    Uses the first score field present on the list's top result; lists
+    without scores fall back to a linear rank-based score.
+    """
+    if not results:
+        return []
+    
+    score_key = next((key for key in SCORE_KEYS if results[0].get(key) is not None), None)
+    if score_key is None:
+        n = len(results)
+        return [1.0 - rank / n for rank in range(n)]
+    
+    raw = [float(chunk.get(score_key) or 0.0) for chunk in results]
+    low, high = min(raw), max(raw)
+    if high == low:
+        return [1.0] * len(raw)
+    
+    return [(score - low) / (high - low) for score in raw]
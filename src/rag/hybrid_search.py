@@ -1,16 +1,35 @@
-from typing import List, Dict, Any
+import time
+from typing import List, Dict, Any, Optional, Tuple
 
+from src.config import settings
+from src.services.database.supabase import supabase
+from src.models.enums import HybridSearchMode
 from src.rag.vector_search import VectorSearch
 from src.rag.keyword_search import KeywordSearch
 from src.rag.rrf import fuse_two_lists
+from src.rag.concurrency import get_search_executor, timed_call
 
 
 class HybridSearch:
-    """Hybrid search combining vector and keyword search with RRF fusion."""
+    """
+    Hybrid search combining vector and keyword search with RRF fusion.
     
-    def __init__(self):
-        self.vector_search = VectorSearch()
-        self.keyword_search = KeywordSearch()
+    project_id scopes the server-side RPC to a project's completed
+    documents; the client-side legs carry their own scope.
+    """
+    
+    def __init__(
+        self,
+        mode: Optional[str] = None,
+        vector_search=None,
+        keyword_search=None,
+        project_id: Optional[str] = None
+    ):
+        self.vector_search = vector_search or VectorSearch()
+        self.keyword_search = keyword_search or KeywordSearch()
+        self.mode = HybridSearchMode(mode or settings.HYBRID_SEARCH_MODE)
+        self.project_id = project_id
+        self.db = supabase
     
     def search(
         self,
@@ -35,23 +54,109 @@ class HybridSearch:
         Returns:
             Fused results sorted by RRF score
         """
-        # Perform both searches
-        vector_results = self.vector_search.search(
+        fused_results, _ = self.search_with_timings(
             query=query,
             document_ids=document_ids,
             match_threshold=match_threshold,
-            chunks_per_search=chunks_per_search
+            chunks_per_search=chunks_per_search,
+            vector_weight=vector_weight,
+            keyword_weight=keyword_weight
+        )
+        return fused_results
+    
+    def search_with_timings(
+        self,
+        query: str,
+        document_ids: List[str],
+        match_threshold: float = 0.3,
+        chunks_per_search: int = 10,
+        vector_weight: float = 0.7,
+        keyword_weight: float = 0.3
+    ) -> Tuple[List[Dict[str, Any]], Dict[str, float]]:
+        """
+        Perform hybrid search and report how long each leg took.
+        
+        In concurrent mode both legs are submitted to the shared search pool
+        at once, so the wall-clock cost is the slower leg rather than the sum.
+        In server mode the query is embedded and both legs plus fusion run
+        inside a single hybrid_search_document_chunks RPC.
+        
+        Returns:
+            Tuple of (fused results, timings) where timings holds
+            vector_ms, keyword_ms, fusion_ms and total_ms
+            (embed_ms, rpc_ms and total_ms in server mode)
+        """
+        if self.mode == HybridSearchMode.SERVER:
+            return self._server_search(
+                query=query,
+                document_ids=document_ids,
+                match_threshold=match_threshold,
+                chunks_per_search=chunks_per_search,
+                vector_weight=vector_weight,
+                keyword_weight=keyword_weight
+            )
+        
+        vector_kwargs = {
+            "query": query,
+            "document_ids": document_ids,
+            "match_threshold": match_threshold,
+            "chunks_per_search": chunks_per_search
+        }
+        keyword_kwargs = {
+            "query": query,
+            "document_ids": document_ids,
+            "chunks_per_search": chunks_per_search
+        }
+        
+        (vector_results, vector_ms), (keyword_results, keyword_ms), total_ms = self._run_legs(
+            vector_kwargs, keyword_kwargs
         )
-        print(f"📊 Vector Search: {len(vector_results)} chunks")
+        print(f"📊 Vector Search: {len(vector_results)} chunks ({vector_ms:.0f} ms)")
+        print(f"📊 Keyword Search: {len(keyword_results)} chunks ({keyword_ms:.0f} ms)")
         
-        keyword_results = self.keyword_search.search(
+        # Fuse with RRF
+        fused_results, fusion_ms = timed_call(
+            fuse_two_lists,
+            vector_results=vector_results,
+            keyword_results=keyword_results,
+            vector_weight=vector_weight,
+            keyword_weight=keyword_weight
+        )
+        print(f"🔗 RRF Fusion: {len(fused_results)} unique chunks")
+        
+        timings = {
+            "vector_ms": vector_ms,
+            "keyword_ms": keyword_ms,
+            "fusion_ms": fusion_ms,
+            "total_ms": total_ms + fusion_ms,
+        }
+        print(f"⏱️ Hybrid search ({self.mode.value}): {timings['total_ms']:.0f} ms")
+        
+        return fused_results, timings
+    
+    def fuse_with_keyword(
+        self,
+        query: str,
+        vector_results: List[Dict[str, Any]],
+        document_ids: List[str],
+        chunks_per_search: int = 10,
+        vector_weight: float = 0.7,
+        keyword_weight: float = 0.3
+    ) -> List[Dict[str, Any]]:
+        """
+        Hybrid results for a query whose vector leg already ran.
+        
+        Only the keyword leg is searched; it is fused client-side with
+        vector_results (also in server mode, which would redo the vector leg).
+        """
+        keyword_results, keyword_ms = timed_call(
+            self.keyword_search.search,
             query=query,
             document_ids=document_ids,
             chunks_per_search=chunks_per_search
         )
-        print(f"📊 Keyword Search: {len(keyword_results)} chunks")
+        print(f"📊 Keyword Search: {len(keyword_results)} chunks ({keyword_ms:.0f} ms)")
         
-        # Fuse with RRF
         fused_results = fuse_two_lists(
             vector_results=vector_results,
             keyword_results=keyword_results,
@@ -59,8 +164,110 @@ class HybridSearch:
             keyword_weight=keyword_weight
         )
         print(f"🔗 RRF Fusion: {len(fused_results)} unique chunks")
-        
         return fused_results
+    
+    def search_with_embedding(
+        self,
+        query: str,
+        query_embedding: List[float],
+        document_ids: List[str],
+        match_threshold: float = 0.3,
+        chunks_per_search: int = 10,
+        vector_weight: float = 0.7,
+        keyword_weight: float = 0.3,
+        match_count: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Run server-side hybrid search with a pre-computed query embedding.
+        
+        Args:
+            query: Search query string (keyword leg)
+            query_embedding: Pre-computed embedding vector (vector leg)
+            document_ids: List of document IDs to search within
+            match_threshold: Similarity threshold for vector search
+            chunks_per_search: Max results per search method
+            vector_weight: Weight for vector search in RRF
+            keyword_weight: Weight for keyword search in RRF
+            match_count: Max fused rows to return (None returns all)
+        
+        Returns:
+            Fused results sorted by RRF score
+        """
+        params = {
+            "query_text": query,
+            "query_embedding": query_embedding,
+            "match_threshold": match_threshold,
+            "chunks_per_search": chunks_per_search,
+            "vector_weight": vector_weight,
+            "keyword_weight": keyword_weight,
+            "match_count": match_count
+        }
+        if self.project_id:
+            function_name = "hybrid_search_project_chunks"
+            params["filter_project_id"] = self.project_id
+        else:
+            function_name = "hybrid_search_document_chunks"
+            params["filter_document_ids"] = document_ids
+        
+        result = self.db.rpc(function_name, params).execute()
+        
+        return result.data if result.data else []
+    
+    def _server_search(
+        self,
+        query: str,
+        document_ids: List[str],
+        match_threshold: float,
+        chunks_per_search: int,
+        vector_weight: float,
+        keyword_weight: float
+    ) -> Tuple[List[Dict[str, Any]], Dict[str, float]]:
+        """Embed the query and run the single-round-trip hybrid RPC."""
+        query_embedding, embed_ms = timed_call(
+            self.vector_search.embeddings.embed_query, query
+        )
+        
+        fused_results, rpc_ms = timed_call(
+            self.search_with_embedding,
+            query=query,
+            query_embedding=query_embedding,
+            document_ids=document_ids,
+            match_threshold=match_threshold,
+            chunks_per_search=chunks_per_search,
+            vector_weight=vector_weight,
+            keyword_weight=keyword_weight
+        )
+        print(f"🔗 Server-side RRF: {len(fused_results)} unique chunks")
+        
+        timings = {
+            "embed_ms": embed_ms,
+            "rpc_ms": rpc_ms,
+            "total_ms": embed_ms + rpc_ms,
+        }
+        print(f"⏱️ Hybrid search (server): {timings['total_ms']:.0f} ms")
+        
+        return fused_results, timings
+    
+    def _run_legs(
+        self,
+        vector_kwargs: Dict[str, Any],
+        keyword_kwargs: Dict[str, Any]
+    ) -> Tuple[Tuple[List[Dict[str, Any]], float], Tuple[List[Dict[str, Any]], float], float]:
+        """Run the vector and keyword legs according to the configured mode."""
+        start = time.perf_counter()
+        
+        if self.mode == HybridSearchMode.CONCURRENT:
+            executor = get_search_executor()
+            vector_future = executor.submit(timed_call, self.vector_search.search, **vector_kwargs)
+            keyword_future = executor.submit(timed_call, self.keyword_search.search, **keyword_kwargs)
+            vector_leg = vector_future.result()
+            keyword_leg = keyword_future.result()
+        else:
+            vector_leg = timed_call(self.vector_search.search, **vector_kwargs)
+            keyword_leg = timed_call(self.keyword_search.search, **keyword_kwargs)
+        
+        total_ms = (time.perf_counter() - start) * 1000
+        return vector_leg, keyword_leg, total_ms
 
 
 # Default instance
@@ -0,0 +1,224 @@
+import base64
+import binascii
+import hashlib
+import io
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Tuple
+
+from src.config import settings as app_settings
+from src.services.cache.redis import redis_service
+from src.services.storage.asset_store import AssetStore, asset_store
+
+
+@lru_cache
+def _pil_image():
+    """PIL.Image module, or None if Pillow is not installed."""
+    try:
+        from PIL import Image
+        
+        return Image
+    except ImportError as e:
+        print(f"⚠️ Pillow unavailable ({e}), sending images at original size")
+        return None
+
+
+def strip_data_url(image_base64: str) -> str:
+    """Drop a "data:image/...;base64," prefix if present."""
+    if image_base64.startswith("data:image"):
+        return image_base64.split(",", 1)[1]
+    return image_base64
+
+
+class ImageSelector:
+    """
+    Picks and shrinks the images attached to a multimodal prompt.
+    
+    Images are taken round-robin across chunks in relevance order (the
+    first image of every chunk before any chunk's second), identical images
+    are sent once, and at most the provider's image budget is kept. Kept
+    images are downscaled to max_dimension and re-encoded as JPEG; the
+    resized variant is cached in Redis by content hash, so a slide seen in
+    many answers is only resized (and fetched from the asset store) once.
+    Redis failures are treated as misses.
+    """
+    
+    KEY_PREFIX = "rag:image:v1"
+    
+    def __init__(
+        self,
+        budgets: Optional[Dict[str, int]] = None,
+        max_dimension: Optional[int] = None,
+        quality: Optional[int] = None,
+        redis=None,
+        ttl: Optional[int] = None,
+        enabled: Optional[bool] = None,
+        assets=None
+    ):
+        self.budgets = budgets or {
+            "openai": app_settings.IMAGE_BUDGET_OPENAI,
+            "ollama": app_settings.IMAGE_BUDGET_OLLAMA,
+        }
+        self.max_dimension = max_dimension or app_settings.IMAGE_MAX_DIMENSION
+        self.quality = quality or app_settings.IMAGE_JPEG_QUALITY
+        self.redis = redis or redis_service
+        self.ttl = ttl or app_settings.IMAGE_CACHE_TTL
+        self.enabled = app_settings.IMAGE_CACHE_ENABLED if enabled is None else enabled
+        self.assets = assets or asset_store
+    
+    def budget_for(self, llm_provider: str) -> int:
+        """Image budget of a provider (the OpenAI budget for unknown ones)."""
+        return self.budgets.get(llm_provider, self.budgets["openai"])
+    
+    def make_key(self, digest: str) -> str:
+        """Build the cache key of an image's resized variant."""
+        return f"{self.KEY_PREFIX}:{self.max_dimension}:{self.quality}:{digest}"
+    
+    def select(
+        self,
+        chunks: List[Dict[str, Any]],
+        llm_provider: str = "openai",
+        budget: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Keep the most relevant images within the budget, downscaled.
+        
+        Images referenced through the asset store (image_refs) are only
+        fetched if they are selected and their resized variant is not cached.
+        
+        Args:
+            chunks: Chunks in relevance order
+            llm_provider: Provider whose budget applies
+            budget: Explicit image budget (overrides the provider's)
+        
+        Returns:
+            Copies of the chunks whose original_content.images hold only
+            the selected, resized images (and no image_refs)
+        """
+        budget = self.budget_for(llm_provider) if budget is None else budget
+        queues = [self._candidates(chunk.get("original_content") or {}) for chunk in chunks]
+        total = sum(len(queue) for queue in queues)
+        if not total:
+            return chunks
+        
+        picks: List[Tuple[int, str, Optional[str]]] = []
+        seen = set()
+        
+        while len(picks) < budget and any(queues):
+            for position, queue in enumerate(queues):
+                if len(picks) >= budget:
+                    break
+                while queue:
+                    digest, image = queue.pop(0)
+                    if digest in seen:
+                        continue
+                    seen.add(digest)
+                    picks.append((position, digest, image))
+                    break
+        
+        resized = {digest: self._cache_get(digest) for _, digest, _ in picks}
+        to_fetch = [digest for _, digest, image in picks if image is None and resized[digest] is None]
+        fetched = self.assets.get_images(to_fetch) if to_fetch else {}
+        
+        selected: List[List[str]] = [[] for _ in chunks]
+        for position, digest, image in picks:
+            if resized[digest] is not None:
+                selected[position].append(base64.b64encode(resized[digest]).decode("ascii"))
+                continue
+            image = image or fetched.get(digest)
+            if image is not None:
+                selected[position].append(self._resize(image, digest))
+        
+        kept = sum(len(images) for images in selected)
+        if kept < total:
+            print(f"🖼️ Selected {kept}/{total} images for the prompt")
+        
+        result = []
+        for chunk, images in zip(chunks, selected):
+            original_content = chunk.get("original_content") or {}
+            if original_content.get("images") or original_content.get("image_refs"):
+                original_content = {k: v for k, v in original_content.items() if k != "image_refs"}
+                chunk = {**chunk, "original_content": {**original_content, "images": images}}
+            result.append(chunk)
+        return result
+    
+    def shrink(self, image_base64: str, digest: Optional[str] = None) -> str:
+        """
+        Downscale and re-encode one base64 image as JPEG.
+        
+        The original is returned when Pillow is missing or the image cannot
+        be decoded.
+        """
+        image_base64 = strip_data_url(image_base64)
+        digest = digest or self._digest(image_base64)
+        
+        cached = self._cache_get(digest)
+        if cached is not None:
+            return base64.b64encode(cached).decode("ascii")
+        return self._resize(image_base64, digest)
+        
+    def _resize(self, image_base64: str, digest: str) -> str:
+        Image = _pil_image()
+        if Image is None:
+            return image_base64
+        
+        try:
+            raw = base64.b64decode(image_base64)
+            with Image.open(io.BytesIO(raw)) as image:
+                image.thumbnail((self.max_dimension, self.max_dimension))
+                if image.mode not in ("RGB", "L"):
+                    image = image.convert("RGB")
+                output = io.BytesIO()
+                image.save(output, format="JPEG", quality=self.quality, optimize=True)
+        except (binascii.Error, OSError, ValueError) as e:
+            print(f"⚠️ Image downscaling failed, sending original: {e}")
+            return image_base64
+        
+        resized = output.getvalue()
+        self._cache_set(digest, resized)
+        return base64.b64encode(resized).decode("ascii")
+    
+    def _candidates(self, original_content: Dict[str, Any]) -> List[Tuple[str, Optional[str]]]:
+        """(digest, base64 or None if stored as an asset) for a chunk's images."""
+        candidates = []
+        for image in original_content.get("images", []):
+            image = strip_data_url(image)
+            candidates.append((self._digest(image), image))
+        for ref in original_content.get("image_refs", []):
+            candidates.append((ref, None))
+        return candidates
+    
+    @staticmethod
+    def _digest(image_base64: str) -> str:
+        """
+        Content hash of an inline image, matching the asset store's refs.
+        
+        Refs are the sha256 of the decoded bytes, so an image is deduplicated
+        and shares its resized variant whether it arrives inline or by ref.
+        """
+        try:
+            return AssetStore.make_ref(base64.b64decode(image_base64))
+        except (binascii.Error, ValueError):
+            return hashlib.sha256(image_base64.encode("ascii", "ignore")).hexdigest()
+    
+    def _cache_get(self, digest: str) -> Optional[bytes]:
+        if not self.enabled:
+            return None
+        
+        try:
+            return self.redis.get_bytes(self.make_key(digest))
+        except Exception as e:
+            print(f"⚠️ Image cache read failed: {e}")
+            return None
+    
+    def _cache_set(self, digest: str, resized: bytes) -> None:
+        if not self.enabled:
+            return
+        
+        try:
+            self.redis.set_bytes(self.make_key(digest), resized, expire=self.ttl)
+        except Exception as e:
+            print(f"⚠️ Image cache write failed: {e}")
+
+
+# Default instance
+image_selector = ImageSelector()
@@ -0,0 +1,165 @@
+"""
+Local Index Sync
+
+Keeps per-project local indexes in step with document_chunks: the
+memory-mapped vector index (vector_backend = "local") and the BM25
+keyword index (keyword_backend = "bm25"). Ingestion adds a document's
+rows when processing completes, deletion retires them, and indexes are
+compacted once too many rows belong to deleted documents.
+
+None of these hooks raise: a local index problem must never fail
+ingestion or deletion (indexes are rebuilt from the database on demand).
+"""
+
+from typing import List, Dict, Any, Optional
+
+from src.config import settings as app_settings
+from src.models.enums import VectorBackend, KeywordBackend
+from src.core.vector_math import parse_vector
+from src.rag.local_index import LocalVectorIndex, LocalIndexVectorStore, local_index_manager
+from src.rag.bm25_index import BM25Index, bm25_index_manager
+from src.services.database.repositories.document_repo import (
+    DocumentRepository,
+    DocumentChunkRepository,
+)
+from src.services.database.repositories.project_repo import ProjectSettingsRepository
+from src.services.llm.embeddings import embedding_service
+
+
+def _project_settings(project_id: str) -> Dict[str, Any]:
+    return ProjectSettingsRepository().get_by_project_id(project_id) or {}
+
+
+def uses_local_index(project_id: str) -> bool:
+    """Whether a project is configured for the local vector backend."""
+    return _project_settings(project_id).get("vector_backend") == VectorBackend.LOCAL.value
+
+
+def uses_bm25_index(project_id: str) -> bool:
+    """Whether a project is configured for the BM25 keyword backend."""
+    return _project_settings(project_id).get("keyword_backend") == KeywordBackend.BM25.value
+
+
+def _project_rows(project_id: str, with_embedding: bool) -> List[Dict[str, Any]]:
+    """Chunk rows (with filenames) of every completed document in a project."""
+    doc_repo = DocumentRepository()
+    chunk_repo = DocumentChunkRepository()
+    
+    rows: List[Dict[str, Any]] = []
+    for document in doc_repo.get_completed_documents(project_id):
+        rows.extend(_with_filename(
+            chunk_repo.get_index_rows(document["id"], with_embedding=with_embedding),
+            document.get("filename")
+        ))
+    return rows
+
+
+def rebuild_project_index(project_id: str) -> LocalVectorIndex:
+    """Build a project's local index from all of its completed documents."""
+    print(f"🗂️ Building local vector index for project {project_id}")
+    rows = _project_rows(project_id, with_embedding=True)
+    
+    dimensions = len(parse_vector(rows[0]["embedding"])) if rows else embedding_service.dimensions
+    index = LocalVectorIndex.create(local_index_manager.path_for(project_id), rows, dimensions)
+    local_index_manager.evict(project_id)
+    
+    print(f"✅ Local vector index ready: {index.count} rows")
+    return index
+
+
+def rebuild_keyword_index(project_id: str) -> BM25Index:
+    """Build a project's BM25 index from all of its completed documents."""
+    print(f"🔤 Building BM25 index for project {project_id}")
+    index = BM25Index()
+    index.add(_project_rows(project_id, with_embedding=False))
+    bm25_index_manager.save(project_id, index)
+    
+    print(f"✅ BM25 index ready: {index.count} rows, {len(index.terms)} terms")
+    return index
+
+
+def on_document_completed(
+    project_id: Optional[str],
+    document_id: str,
+    rows: Optional[List[Dict[str, Any]]] = None,
+    filename: Optional[str] = None
+) -> None:
+    """
+    Add a freshly processed document to the project's local indexes.
+    
+    Args:
+        project_id: Project the document belongs to
+        document_id: Processed document
+        rows: Stored chunk rows (with embeddings); fetched if omitted
+        filename: Document filename stored with each row
+    """
+    if not project_id:
+        return
+    
+    try:
+        settings = _project_settings(project_id)
+        use_vector = settings.get("vector_backend") == VectorBackend.LOCAL.value
+        use_keyword = settings.get("keyword_backend") == KeywordBackend.BM25.value
+        if not (use_vector or use_keyword):
+            return
+        
+        if rows is None:
+            rows = DocumentChunkRepository().get_index_rows(document_id)
+        rows = _with_filename(rows, filename)
+    except Exception as e:
+        print(f"⚠️ Local index update failed for document {document_id}: {e}")
+        return
+        
+    if use_vector:
+        try:
+            if not local_index_manager.exists(project_id):
+                rebuild_project_index(project_id)
+            else:
+                appended = LocalIndexVectorStore(project_id).upsert(rows)
+                print(f"🗂️ Added {len(appended)} rows to the local vector index for project {project_id}")
+        except Exception as e:
+            print(f"⚠️ Local index update failed for document {document_id}: {e}")
+
+    if use_keyword:
+        try:
+            if bm25_index_manager.update(project_id, lambda index: index.add(rows)) is None:
+                rebuild_keyword_index(project_id)
+            else:
+                print(f"🔤 Added {len(rows)} rows to the BM25 index for project {project_id}")
+        except Exception as e:
+            print(f"⚠️ BM25 index update failed for document {document_id}: {e}")
+
+
+def on_document_deleted(project_id: Optional[str], document_id: str) -> None:
+    """Remove a deleted document from the project's local indexes, if it has any."""
+    if not project_id:
+        return
+    
+    if local_index_manager.exists(project_id):
+        try:
+            LocalIndexVectorStore(project_id).delete_by_document(document_id)
+        
+            index = local_index_manager.get(project_id)
+            if index and index.deleted_ratio > app_settings.LOCAL_INDEX_COMPACT_RATIO and uses_local_index(project_id):
+                rebuild_project_index(project_id)
+        except Exception as e:
+            print(f"⚠️ Local index removal failed for document {document_id}: {e}")
+
+    try:
+        bm25_index_manager.update(project_id, lambda index: index.delete_document(document_id))
+    except Exception as e:
+        print(f"⚠️ BM25 index removal failed for document {document_id}: {e}")
+
+
+def _with_filename(rows: List[Dict[str, Any]], filename: Optional[str]) -> List[Dict[str, Any]]:
+    return [{**row, "filename": filename} for row in rows]
+
+
+__all__ = [
+    "uses_local_index",
+    "uses_bm25_index",
+    "rebuild_project_index",
+    "rebuild_keyword_index",
+    "on_document_completed",
+    "on_document_deleted",
+]
@@ -1,19 +1,45 @@
-from typing import List, Dict, Any
+import asyncio
+from typing import List, Dict, Any, Optional, Sequence, Tuple
 
 from src.services.database.supabase import supabase
+from src.rag.vector_store import resolve_columns
+
+
+# Columns returned by default - same shape as vector search, scored by rank
+LEAN_COLUMNS: Tuple[str, ...] = (
+    "id",
+    "document_id",
+    "content",
+    "chunk_index",
+    "page_number",
+    "char_count",
+    "type",
+    "original_content",
+    "rank",
+    "filename",
+)
 
 
 class KeywordSearch:
-    """Full-text keyword search using PostgreSQL GIN index."""
+    """
+    Full-text keyword search using PostgreSQL GIN index.
+    
+    Scoped to a project, it searches all completed documents of that
+    project by project_id instead of sending document_ids.
+    """
     
-    def __init__(self):
+    def __init__(self, include_embeddings: bool = False, project_id: Optional[str] = None):
         self.db = supabase
+        self.include_embeddings = include_embeddings
+        self.project_id = project_id
     
     def search(
         self,
         query: str,
         document_ids: List[str],
-        chunks_per_search: int = 10
+        chunks_per_search: int = 10,
+        columns: Optional[Sequence[str]] = None,
+        include_embeddings: Optional[bool] = None
     ) -> List[Dict[str, Any]]:
         """
         Perform full-text keyword search.
@@ -22,21 +48,52 @@ class KeywordSearch:
             query: Search query string
             document_ids: List of document IDs to search within
             chunks_per_search: Maximum number of results
+            columns: Columns to return (defaults to LEAN_COLUMNS)
+            include_embeddings: Also return chunk embeddings (e.g. for MMR);
+                defaults to the instance setting
             
         Returns:
             List of matching chunks with BM25-style scores
         """
-        result = self.db.rpc(
-            "keyword_search_document_chunks",
-            {
-                "query_text": query,
-                "filter_document_ids": document_ids,
-                "chunks_per_search": chunks_per_search
-            }
+        if include_embeddings is None:
+            include_embeddings = self.include_embeddings
+        
+        params = {
+            "query_text": query,
+            "chunks_per_search": chunks_per_search,
+            "include_embedding": include_embeddings
+        }
+        if self.project_id:
+            function_name = "keyword_search_project_chunks"
+            params["filter_project_id"] = self.project_id
+        else:
+            function_name = "keyword_search_chunks"
+            params["filter_document_ids"] = document_ids
+        
+        result = self.db.rpc(function_name, params).select(
+            *resolve_columns(columns, LEAN_COLUMNS, include_embeddings)
         ).execute()
         
         return result.data if result.data else []
 
+    async def asearch(
+        self,
+        query: str,
+        document_ids: List[str],
+        chunks_per_search: int = 10,
+        columns: Optional[Sequence[str]] = None,
+        include_embeddings: Optional[bool] = None
+    ) -> List[Dict[str, Any]]:
+        """Async search (the RPC runs in a worker thread)."""
+        return await asyncio.to_thread(
+            self.search,
+            query,
+            document_ids,
+            chunks_per_search=chunks_per_search,
+            columns=columns,
+            include_embeddings=include_embeddings
+        )
+
 
 # Default instance
 keyword_search = KeywordSearch()
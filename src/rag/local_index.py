@@ -0,0 +1,466 @@
+import fcntl
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.config import settings as app_settings
+from src.core.vector_math import to_matrix, normalize_rows, parse_vector
+from src.rag.vector_store import LEAN_COLUMNS, project_columns
+
+
+# Chunk fields kept next to each vector so results need no database round trip
+PAYLOAD_COLUMNS = tuple(c for c in LEAN_COLUMNS if c != "similarity")
+
+# Rows scored per block during exact search, bounding float32 temporaries
+SCAN_BLOCK_ROWS = 65536
+
+
+class LocalVectorIndex:
+    """
+    Per-project embedding index stored in a memory-mapped file.
+    
+    On-disk layout (one directory per project):
+    - vectors.bin: L2-normalized rows (float16 or float32), append-only
+    - rows.jsonl: one chunk payload per row, in the same order
+    - meta.json: dimensions, dtype, row count, payload size and
+      per-document tombstones
+    
+    meta.json is replaced atomically after every write, and readers only
+    trust the row count it records. A tombstone hides every row of a
+    document below a row number; deleting a document, or appending new rows
+    for it, tombstones its earlier rows until the next rebuild. Small indexes are searched exactly; larger ones
+    go through an in-memory IVF index built when the index is opened.
+    """
+    
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.meta = self._read_meta()
+        self.dimensions: int = self.meta["dimensions"]
+        self.dtype = np.dtype(self.meta["dtype"])
+        self.count: int = self.meta["count"]
+        
+        self.vectors = self._open_vectors()
+        self.payloads = self._read_payloads()
+        
+        # Integer document codes per row for fast filtering
+        document_ids = [payload["document_id"] for payload in self.payloads]
+        self.document_codes = {doc_id: code for code, doc_id in enumerate(dict.fromkeys(document_ids))}
+        self.row_documents = np.fromiter(
+            (self.document_codes[doc_id] for doc_id in document_ids),
+            dtype=np.int32,
+            count=self.count
+        )
+        # A row is live unless its document was tombstoned after it was written
+        floors = np.zeros(len(self.document_codes) + 1, dtype=np.int64)
+        for doc_id, floor in _tombstones(self.meta).items():
+            if doc_id in self.document_codes:
+                floors[self.document_codes[doc_id]] = floor
+        self.live = np.arange(self.count) >= floors[self.row_documents]
+        
+        self.centroids: Optional[np.ndarray] = None
+        self.lists: List[np.ndarray] = []
+        if self.count > app_settings.LOCAL_INDEX_EXACT_MAX_ROWS:
+            self._build_ivf()
+    
+    # ==================== WRITING ====================
+    
+    @classmethod
+    def create(
+        cls,
+        path: Path,
+        rows: List[Dict[str, Any]],
+        dimensions: int,
+        dtype: Optional[str] = None
+    ) -> "LocalVectorIndex":
+        """Write a fresh index from chunk rows (each with an 'embedding')."""
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        
+        with _locked(path):
+            for name in ("vectors.bin", "rows.jsonl"):
+                (path / name).unlink(missing_ok=True)
+            
+            meta = {
+                "dimensions": dimensions,
+                "dtype": dtype or app_settings.LOCAL_INDEX_DTYPE,
+                "count": 0,
+                "payload_bytes": 0,
+                "tombstones": {},
+            }
+            _write_meta(path, meta)
+            _append_rows(path, meta, rows)
+        
+        return cls(path)
+    
+    @staticmethod
+    def append(path: Path, rows: List[Dict[str, Any]]) -> int:
+        """
+        Append chunk rows to an existing index; returns the new row count.
+        
+        The rows replace every earlier row of their documents, so appending a
+        document again (re-ingestion, retried upserts) never duplicates it.
+        """
+        with _locked(path):
+            meta = json.loads((Path(path) / "meta.json").read_text())
+            tombstones = _tombstones(meta)
+            for document_id in {row["document_id"] for row in rows}:
+                tombstones[document_id] = meta["count"]
+            meta["tombstones"] = tombstones
+            meta.pop("deleted_documents", None)
+            _append_rows(Path(path), meta, rows)
+            return meta["count"]
+    
+    @staticmethod
+    def remove_document(path: Path, document_id: str) -> None:
+        """Tombstone every row of a document."""
+        with _locked(path):
+            meta = json.loads((Path(path) / "meta.json").read_text())
+            tombstones = _tombstones(meta)
+            if tombstones.get(document_id) != meta["count"]:
+                tombstones[document_id] = meta["count"]
+                meta["tombstones"] = tombstones
+                meta.pop("deleted_documents", None)
+                _write_meta(Path(path), meta)
+    
+    # ==================== SEARCH ====================
+    
+    def search(
+        self,
+        query_embedding: Sequence[float],
+        document_ids: Optional[List[str]],
+        match_threshold: float = 0.3,
+        chunks_per_search: int = 10,
+        include_embeddings: bool = False
+    ) -> List[Dict[str, Any]]:
+        """
+        Cosine similarity search over live rows of the given documents.
+        
+        Returns:
+            Chunk payloads with 'similarity' (and 'embedding' if requested),
+            best first
+        """
+        if not self.count:
+            return []
+        
+        query = normalize_rows(to_matrix([query_embedding]))[0]
+        mask = self.live.copy()
+        if document_ids is not None:
+            codes = [self.document_codes[d] for d in document_ids if d in self.document_codes]
+            mask &= np.isin(self.row_documents, codes)
+        
+        rows = self._candidate_rows(query, mask)
+        if not len(rows):
+            return []
+        
+        scores = self._score(rows, query)
+        keep = scores > match_threshold
+        rows, scores = rows[keep], scores[keep]
+        
+        if len(rows) > chunks_per_search:
+            top = np.argpartition(-scores, chunks_per_search - 1)[:chunks_per_search]
+            rows, scores = rows[top], scores[top]
+        order = np.argsort(-scores, kind="stable")
+        
+        results = []
+        for i in order:
+            row = int(rows[i])
+            result = {**self.payloads[row], "similarity": float(scores[i])}
+            if include_embeddings:
+                result["embedding"] = self.vectors[row].astype(np.float32).tolist()
+            results.append(result)
+        
+        return results
+    
+    def _candidate_rows(self, query: np.ndarray, mask: np.ndarray) -> np.ndarray:
+        """Rows to score exactly: all matching rows, or the probed IVF lists."""
+        if self.centroids is None or mask.sum() <= app_settings.LOCAL_INDEX_EXACT_MAX_ROWS:
+            return np.flatnonzero(mask)
+        
+        nprobe = min(app_settings.LOCAL_INDEX_NPROBE, len(self.centroids))
+        probed = np.argpartition(-(self.centroids @ query), nprobe - 1)[:nprobe]
+        rows = np.concatenate([self.lists[c] for c in probed])
+        return np.sort(rows[mask[rows]])
+    
+    def _score(self, rows: np.ndarray, query: np.ndarray) -> np.ndarray:
+        if len(rows) == self.count:
+            return np.concatenate([
+                np.asarray(self.vectors[start:start + SCAN_BLOCK_ROWS], dtype=np.float32) @ query
+                for start in range(0, self.count, SCAN_BLOCK_ROWS)
+            ])
+        return np.asarray(self.vectors[rows], dtype=np.float32) @ query
+    
+    def _build_ivf(self) -> None:
+        """Spherical k-means over a sample of rows, then assign every row."""
+        start = time.perf_counter()
+        nlist = max(1, int(np.sqrt(self.count)))
+        rng = np.random.default_rng(0)
+        
+        sample_size = min(self.count, nlist * 64)
+        sample = np.asarray(self.vectors[np.sort(rng.choice(self.count, sample_size, replace=False))], dtype=np.float32)
+        centroids = sample[rng.choice(sample_size, nlist, replace=False)]
+        
+        for _ in range(app_settings.LOCAL_INDEX_KMEANS_ITERATIONS):
+            assignment = np.argmax(sample @ centroids.T, axis=1)
+            for c in range(nlist):
+                members = sample[assignment == c]
+                if len(members):
+                    centroids[c] = members.sum(axis=0)
+            centroids = normalize_rows(centroids)
+        
+        assignment = np.concatenate([
+            np.argmax(np.asarray(self.vectors[s:s + SCAN_BLOCK_ROWS], dtype=np.float32) @ centroids.T, axis=1)
+            for s in range(0, self.count, SCAN_BLOCK_ROWS)
+        ])
+        order = np.argsort(assignment, kind="stable")
+        bounds = np.searchsorted(assignment[order], np.arange(nlist + 1))
+        
+        self.centroids = centroids
+        self.lists = [order[bounds[c]:bounds[c + 1]] for c in range(nlist)]
+        print(f"🗂️ Built IVF index ({nlist} lists, {self.count} rows) in {(time.perf_counter() - start) * 1000:.0f} ms")
+    
+    # ==================== LOADING ====================
+    
+    def _read_meta(self) -> Dict[str, Any]:
+        return json.loads((self.path / "meta.json").read_text())
+    
+    def _open_vectors(self) -> np.ndarray:
+        if not self.count:
+            return np.zeros((0, self.dimensions), dtype=self.dtype)
+        return np.memmap(
+            self.path / "vectors.bin",
+            dtype=self.dtype,
+            mode="r",
+            shape=(self.count, self.dimensions)
+        )
+    
+    def _read_payloads(self) -> List[Dict[str, Any]]:
+        payloads = []
+        if self.count:
+            with open(self.path / "rows.jsonl", encoding="utf-8") as f:
+                for line in f:
+                    payloads.append(json.loads(line))
+                    if len(payloads) == self.count:
+                        break
+        return payloads
+    
+    @property
+    def deleted_ratio(self) -> float:
+        """Share of rows that are tombstoned."""
+        return float((~self.live).sum()) / self.count if self.count else 0.0
+
+
+class LocalIndexManager:
+    """
+    Process-wide cache of opened project indexes.
+    
+    An index is reopened whenever its meta.json changes on disk, so rows
+    appended by ingestion workers become visible on the next query.
+    """
+    
+    def __init__(self, root: Optional[str] = None):
+        self.root = Path(root or app_settings.LOCAL_INDEX_DIR)
+        self._indexes: Dict[str, Tuple[int, LocalVectorIndex]] = {}
+        self._lock = threading.Lock()
+    
+    def path_for(self, project_id: str) -> Path:
+        return self.root / project_id
+    
+    def exists(self, project_id: str) -> bool:
+        return (self.path_for(project_id) / "meta.json").exists()
+    
+    def get(self, project_id: str) -> Optional[LocalVectorIndex]:
+        """Open (or reuse) a project's index; None if it has not been built."""
+        meta_path = self.path_for(project_id) / "meta.json"
+        try:
+            mtime = meta_path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return None
+        
+        with self._lock:
+            cached = self._indexes.get(project_id)
+            if cached and cached[0] == mtime:
+                return cached[1]
+        
+        index = LocalVectorIndex(self.path_for(project_id))
+        with self._lock:
+            self._indexes[project_id] = (mtime, index)
+        return index
+    
+    def evict(self, project_id: str) -> None:
+        with self._lock:
+            self._indexes.pop(project_id, None)
+
+
+class LocalIndexVectorStore:
+    """
+    VectorStore backed by a project's local index.
+    
+    The index is built from document_chunks the first time a project is
+    queried. Writes go through the same locked append / tombstone path as
+    ingestion, so they are visible to every process on the next query.
+    """
+    
+    def __init__(self, project_id: str, manager: Optional[LocalIndexManager] = None):
+        self.project_id = project_id
+        self.manager = manager or local_index_manager
+    
+    def upsert(self, chunks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Append chunks (with ids) to the index, creating it if needed.
+        
+        Chunks replace the earlier rows of their documents (tombstoned), so
+        upserts must carry whole documents, as ingestion does.
+        """
+        rows = [chunk for chunk in chunks if chunk.get("embedding") is not None]
+        if not rows:
+            return []
+        
+        path = self.manager.path_for(self.project_id)
+        if self.manager.exists(self.project_id):
+            LocalVectorIndex.append(path, rows)
+        else:
+            LocalVectorIndex.create(path, rows, len(parse_vector(rows[0]["embedding"])))
+        return rows
+    
+    def delete_by_document(self, document_id: str) -> int:
+        """Tombstone a document's rows; returns how many were live."""
+        index = self.manager.get(self.project_id)
+        if index is None or document_id not in index.document_codes:
+            return 0
+        
+        removed = int((index.live & (index.row_documents == index.document_codes[document_id])).sum())
+        LocalVectorIndex.remove_document(index.path, document_id)
+        return removed
+    
+    def search(
+        self,
+        query_embedding: Sequence[float],
+        document_ids: Optional[List[str]],
+        match_threshold: float = 0.3,
+        chunks_per_search: int = 10,
+        columns: Optional[Sequence[str]] = None,
+        include_embeddings: bool = False
+    ) -> List[Dict[str, Any]]:
+        """Search the local index, building it on first use."""
+        results = self._index().search(
+            query_embedding,
+            document_ids,
+            match_threshold=match_threshold,
+            chunks_per_search=chunks_per_search,
+            include_embeddings=include_embeddings
+        )
+        return project_columns(results, columns, include_embeddings)
+    
+    def search_many(
+        self,
+        query_embeddings: Sequence[Sequence[float]],
+        document_ids: Optional[List[str]],
+        match_threshold: float = 0.3,
+        chunks_per_search: int = 10,
+        columns: Optional[Sequence[str]] = None,
+        include_embeddings: bool = False
+    ) -> List[List[Dict[str, Any]]]:
+        """Search each embedding against the same opened index."""
+        index = self._index()
+        return [
+            project_columns(
+                index.search(
+                    embedding,
+                    document_ids,
+                    match_threshold=match_threshold,
+                    chunks_per_search=chunks_per_search,
+                    include_embeddings=include_embeddings
+                ),
+                columns,
+                include_embeddings
+            )
+            for embedding in query_embeddings
+        ]
+    
+    def _index(self) -> LocalVectorIndex:
+        index = self.manager.get(self.project_id)
+        if index is None:
+            from src.rag.index_sync import rebuild_project_index
+            index = rebuild_project_index(self.project_id)
+        return index
+
+
+@contextmanager
+def _locked(path: Path):
+    """Exclusive writer lock for an index directory."""
+    Path(path).mkdir(parents=True, exist_ok=True)
+    with open(Path(path) / ".lock", "w") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _append_rows(path: Path, meta: Dict[str, Any], rows: List[Dict[str, Any]]) -> None:
+    """
+    Append vectors and payloads in place, truncating any torn tail first.
+    
+    Readers only trust the first meta["count"] rows of either file, so the
+    appends become visible when meta.json is replaced at the end.
+    """
+    dtype = np.dtype(meta["dtype"])
+    row_bytes = meta["dimensions"] * dtype.itemsize
+    
+    rows = [row for row in rows if row.get("embedding") is not None]
+    if rows:
+        vectors = normalize_rows(to_matrix([parse_vector(row["embedding"]) for row in rows])).astype(dtype)
+        payloads = "".join(
+            json.dumps({column: row.get(column) for column in PAYLOAD_COLUMNS}) + "\n"
+            for row in rows
+        ).encode("utf-8")
+        payload_bytes = _payload_bytes(path, meta)
+        
+        with open(path / "vectors.bin", "ab") as f:
+            f.truncate(meta["count"] * row_bytes)
+            f.write(vectors.tobytes())
+        
+        with open(path / "rows.jsonl", "ab") as f:
+            f.truncate(payload_bytes)
+            f.write(payloads)
+        
+        meta["count"] += len(rows)
+        meta["payload_bytes"] = payload_bytes + len(payloads)
+    
+    _write_meta(path, meta)
+
+
+def _payload_bytes(path: Path, meta: Dict[str, Any]) -> int:
+    """Byte length of the first meta["count"] payload lines."""
+    if "payload_bytes" in meta:
+        return meta["payload_bytes"]
+    if not meta["count"]:
+        return 0
+    # Indexes written before payload_bytes was recorded: measure once
+    with open(path / "rows.jsonl", "rb") as f:
+        return sum(len(line) for _, line in zip(range(meta["count"]), f))
+
+
+def _tombstones(meta: Dict[str, Any]) -> Dict[str, int]:
+    """Document id -> row number below which its rows are deleted."""
+    tombstones = dict(meta.get("tombstones", {}))
+    # Indexes written before row-level tombstones deleted whole documents
+    for document_id in meta.get("deleted_documents", []):
+        tombstones.setdefault(document_id, meta["count"])
+    return tombstones
+
+
+def _write_meta(path: Path, meta: Dict[str, Any]) -> None:
+    tmp_path = path / "meta.json.tmp"
+    tmp_path.write_text(json.dumps(meta))
+    os.replace(tmp_path, path / "meta.json")
+
+
+# Default instance
+local_index_manager = LocalIndexManager()
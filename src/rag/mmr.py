@@ -0,0 +1,151 @@
+import time
+from typing import List, Dict, Any, Optional, Sequence
+
+import numpy as np
+
+from src.config import settings as app_settings
+from src.core.vector_math import to_matrix, normalize_rows, parse_vector
+from src.services.database.repositories.document_repo import DocumentChunkRepository
+from src.services.llm.embeddings import embedding_service
+
+
+def mmr_select(
+    query_embedding: Sequence[float],
+    candidate_embeddings: Sequence[Sequence[float]],
+    k: int,
+    lambda_mult: float = 0.7,
+    relevance: Optional[Sequence[float]] = None
+) -> List[int]:
+    """
+    Maximal marginal relevance selection.
+    
+    Each step picks the candidate maximizing
+    lambda * relevance - (1 - lambda) * max similarity to already selected,
+    using one matrix product for all pairwise similarities and a running
+    max vector, so the loop is O(k * n) vector ops.
+    
+    Args:
+        query_embedding: Query vector
+        candidate_embeddings: Candidate vectors
+        k: Number of candidates to select
+        lambda_mult: 1.0 is pure relevance, 0.0 is pure diversity
+        relevance: Optional relevance scores in [0, 1] to use instead of
+            query cosine similarity (e.g. normalized rerank scores)
+    
+    Returns:
+        Indices of the selected candidates, in selection order
+    """
+    n = len(candidate_embeddings)
+    if n == 0 or k <= 0:
+        return []
+    
+    candidates = normalize_rows(to_matrix(candidate_embeddings))
+    if relevance is None:
+        query = normalize_rows(to_matrix([query_embedding]))[0]
+        relevance_scores = candidates @ query
+    else:
+        relevance_scores = np.asarray(relevance, dtype=np.float32)
+    
+    similarity = candidates @ candidates.T
+    max_similarity = np.full(n, -np.inf, dtype=np.float32)
+    available = np.ones(n, dtype=bool)
+    selected: List[int] = []
+    
+    for _ in range(min(k, n)):
+        redundancy = np.where(np.isfinite(max_similarity), max_similarity, 0.0)
+        scores = lambda_mult * relevance_scores - (1 - lambda_mult) * redundancy
+        scores[~available] = -np.inf
+        
+        best = int(np.argmax(scores))
+        selected.append(best)
+        available[best] = False
+        max_similarity = np.maximum(max_similarity, similarity[:, best])
+    
+    return selected
+
+
+class MMRSelector:
+    """
+    Diversify the final context with MMR over candidate chunk embeddings.
+    
+    Candidate embeddings are taken from the chunks when retrieval returned
+    them, otherwise fetched in a single query for the capped candidate set.
+    """
+    
+    def __init__(self, max_candidates: Optional[int] = None):
+        self.chunk_repo = DocumentChunkRepository()
+        self.embeddings = embedding_service
+        self.max_candidates = max_candidates or app_settings.MMR_MAX_CANDIDATES
+    
+    def select(
+        self,
+        query: str,
+        chunks: List[Dict[str, Any]],
+        k: int,
+        lambda_mult: float = 0.7
+    ) -> List[Dict[str, Any]]:
+        """
+        Select k diverse, relevant chunks.
+        
+        Args:
+            query: User's question
+            chunks: Candidates in relevance order (reranked or retrieval order)
+            k: Number of chunks to keep
+            lambda_mult: Relevance/diversity trade-off
+        
+        Returns:
+            Selected chunks in selection order
+        """
+        candidates = chunks[:self.max_candidates]
+        if len(candidates) <= k:
+            return candidates
+        
+        start = time.perf_counter()
+        vectors = self._candidate_embeddings(candidates)
+        
+        # Chunks without an embedding cannot be compared; keep retrieval order
+        usable = [i for i, vector in enumerate(vectors) if vector is not None]
+        if len(usable) <= k:
+            return candidates[:k]
+        
+        # Rerank scores stand in for query similarity, so no query embedding then
+        relevance = self._rerank_relevance([candidates[i] for i in usable])
+        query_embedding = self.embeddings.embed_query(query) if relevance is None else []
+        
+        picked = mmr_select(
+            query_embedding,
+            [vectors[i] for i in usable],
+            k,
+            lambda_mult,
+            relevance=relevance
+        )
+        selected = [candidates[usable[i]] for i in picked]
+        
+        print(
+            f"🧩 MMR (λ={lambda_mult}) kept {len(selected)} of {len(candidates)} candidates "
+            f"in {(time.perf_counter() - start) * 1000:.1f} ms"
+        )
+        return selected
+    
+    def _candidate_embeddings(self, chunks: List[Dict[str, Any]]) -> List[Optional[List[float]]]:
+        missing = [c["id"] for c in chunks if c.get("embedding") is None and c.get("id")]
+        fetched = self.chunk_repo.get_embeddings(missing) if missing else {}
+        
+        return [
+            parse_vector(c["embedding"]) if c.get("embedding") is not None else fetched.get(c.get("id"))
+            for c in chunks
+        ]
+    
+    @staticmethod
+    def _rerank_relevance(chunks: List[Dict[str, Any]]) -> Optional[List[float]]:
+        """Min-max normalized rerank scores, if the candidates were reranked."""
+        if not all("rerank_score" in c for c in chunks):
+            return None
+        
+        scores = np.asarray([c["rerank_score"] for c in chunks], dtype=np.float32)
+        spread = float(scores.max() - scores.min())
+        return ((scores - scores.min()) / spread).tolist() if spread else [1.0] * len(chunks)
+
+
+# Default instance
+mmr_selector = MMRSelector()
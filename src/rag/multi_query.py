@@ -0,0 +1,255 @@
+import time
+from typing import List, Dict, Any, Optional
+
+from src.config import settings as app_settings
+from src.models.enums import HybridSearchMode
+from src.core.vector_math import dedupe_by_similarity
+from src.rag.vector_search import VectorSearch
+from src.rag.keyword_search import KeywordSearch
+from src.rag.hybrid_search import HybridSearch
+from src.rag.rrf import fuse_two_lists
+from src.rag.fusion import fuse
+from src.rag.concurrency import get_search_executor, timed_call
+from src.rag.query_expansion import generate_query_variations
+from src.services.llm.embeddings import embedding_service
+
+
+class MultiQueryRetriever:
+    """
+    Batched, concurrent retrieval over a set of query variations.
+    
+    Embeds every variation in a single embedding call, drops variations
+    that are near-duplicates of an earlier one, then runs every search at
+    once (keyword legs on the shared search pool, vector legs through the
+    store's search_many) before fusing with RRF.
+    
+    retrieve_expanded also generates the variations, overlapping that LLM
+    call with the search of the original query.
+    """
+    
+    def __init__(
+        self,
+        dedup_threshold: Optional[float] = None,
+        fusion_method: Optional[str] = None,
+        vector_search=None,
+        hybrid_search: Optional[HybridSearch] = None,
+        keyword_search=None
+    ):
+        self.vector_search = vector_search or VectorSearch()
+        self.keyword_search = keyword_search or KeywordSearch()
+        self.hybrid_search = hybrid_search or HybridSearch()
+        self.embeddings = embedding_service
+        self.expand = generate_query_variations
+        self.dedup_threshold = app_settings.MULTI_QUERY_DEDUP_THRESHOLD if dedup_threshold is None else dedup_threshold
+        self.fusion_method = fusion_method or app_settings.RAG_FUSION_METHOD
+    
+    def retrieve(
+        self,
+        queries: List[str],
+        document_ids: List[str],
+        settings: Dict[str, Any],
+        hybrid: bool = False,
+        top_k: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Search every query variation and fuse the results.
+        
+        Args:
+            queries: Query variations, original query first
+            document_ids: List of document IDs to search within
+            settings: Project settings dict with RAG configuration
+            hybrid: Also run a keyword leg per variation and fuse it in
+            top_k: Only keep the top_k fused results (None keeps all)
+        
+        Returns:
+            Fused results sorted by fused score
+        """
+        if not queries:
+            return []
+        
+        start = time.perf_counter()
+        
+        # Step 1: One embedding call for all (uncached) variations
+        query_embeddings, embed_ms = timed_call(self.embeddings.embed_queries, queries)
+        
+        # Step 2: Drop near-duplicate variations (original query always kept)
+        kept = dedupe_by_similarity(query_embeddings, self.dedup_threshold)
+        if len(kept) < len(queries):
+            print(f"🧹 Dropped {len(queries) - len(kept)} near-duplicate query variation(s)")
+        queries = [queries[i] for i in kept]
+        query_embeddings = [query_embeddings[i] for i in kept]
+        
+        # Step 3: Fan out every search at once
+        search_start = time.perf_counter()
+        all_results = self._search_all(queries, query_embeddings, document_ids, settings, hybrid)
+        search_ms = (time.perf_counter() - search_start) * 1000
+        
+        for i, (q, results) in enumerate(zip(queries, all_results)):
+            print(f"📈 Query {i+1} '{q[:50]}...' returned: {len(results)} chunks")
+        
+        # Step 4: Fuse all results (RRF by default)
+        chunks, fusion_ms = timed_call(fuse, all_results, method=self.fusion_method, top_k=top_k)
+        print(f"🔗 {self.fusion_method.upper()} fusion returned: {len(chunks)} chunks")
+        
+        total_ms = (time.perf_counter() - start) * 1000
+        print(
+            f"⏱️ Multi-query ({len(queries)} queries): embed {embed_ms:.0f} ms, "
+            f"search {search_ms:.0f} ms, fusion {fusion_ms:.0f} ms, total {total_ms:.0f} ms"
+        )
+        
+        return chunks
+    
+    def retrieve_expanded(
+        self,
+        query: str,
+        num_queries: int,
+        document_ids: List[str],
+        settings: Dict[str, Any],
+        hybrid: bool = False,
+        top_k: Optional[int] = None,
+        first_pass: Optional[List[Dict[str, Any]]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Generate query variations and search them, speculatively.
+        
+        The LLM variation request runs on the search pool while the original
+        query is embedded and searched on this thread. Once the variations
+        arrive they are embedded in one call, near-duplicates (of the
+        original or each other) are dropped, the rest are searched, and all
+        lists are fused.
+        
+        Args:
+            query: The user's original query
+            num_queries: Total number of queries (original + variations)
+            document_ids: List of document IDs to search within
+            settings: Project settings dict with RAG configuration
+            hybrid: Also run a keyword leg per query and fuse it in
+            top_k: Only keep the top_k fused results (None keeps all)
+            first_pass: Vector results already retrieved for the original
+                query (same settings); only its keyword leg is searched
+        
+        Returns:
+            Fused results sorted by fused score
+        """
+        start = time.perf_counter()
+        variations_future = get_search_executor().submit(self.expand, query, num_queries)
+        
+        # Step 1: The original query does not wait for the LLM
+        query_embedding = self.embeddings.embed_queries([query])[0]
+        if first_pass is None:
+            all_results = self._search_all([query], [query_embedding], document_ids, settings, hybrid)
+        elif hybrid:
+            all_results = [self.hybrid_search.fuse_with_keyword(
+                query,
+                first_pass,
+                document_ids,
+                chunks_per_search=settings.get("chunks_per_search", 10),
+                vector_weight=settings.get("vector_weight", 0.7),
+                keyword_weight=settings.get("keyword_weight", 0.3)
+            )]
+        else:
+            all_results = [first_pass]
+        first_pass_ms = (time.perf_counter() - start) * 1000
+        print(f"📈 Original query returned: {len(all_results[0])} chunks")
+        
+        # Step 2: Variations (the original query comes back first)
+        queries = variations_future.result()
+        expansion_wait_ms = (time.perf_counter() - start) * 1000 - first_pass_ms
+        print(f"🔄 Generated queries: {queries}")
+        variations = [q for q in queries if q != query]
+        
+        # Step 3: Embed, dedupe against the original and search the rest
+        if variations:
+            embeddings = self.embeddings.embed_queries(variations)
+            kept = [i - 1 for i in dedupe_by_similarity([query_embedding] + embeddings, self.dedup_threshold)[1:]]
+            if len(kept) < len(variations):
+                print(f"🧹 Dropped {len(variations) - len(kept)} near-duplicate query variation(s)")
+            
+            variation_results = self._search_all(
+                [variations[i] for i in kept],
+                [embeddings[i] for i in kept],
+                document_ids,
+                settings,
+                hybrid
+            )
+            for i, results in zip(kept, variation_results):
+                print(f"📈 Variation '{variations[i][:50]}...' returned: {len(results)} chunks")
+            all_results.extend(variation_results)
+        
+        # Step 4: Fuse all results (RRF by default)
+        chunks = fuse(all_results, method=self.fusion_method, top_k=top_k)
+        print(f"🔗 {self.fusion_method.upper()} fusion returned: {len(chunks)} chunks")
+        
+        total_ms = (time.perf_counter() - start) * 1000
+        print(
+            f"⏱️ Speculative multi-query ({len(all_results)} queries): first pass {first_pass_ms:.0f} ms, "
+            f"waited {expansion_wait_ms:.0f} ms for variations, total {total_ms:.0f} ms"
+        )
+        
+        return chunks
+    
+    def _search_all(
+        self,
+        queries: List[str],
+        query_embeddings: List[List[float]],
+        document_ids: List[str],
+        settings: Dict[str, Any],
+        hybrid: bool
+    ) -> List[List[Dict[str, Any]]]:
+        """Submit every vector (and keyword) search, then collect per-variation lists."""
+        executor = get_search_executor()
+        match_threshold = settings.get("similarity_threshold", 0.3)
+        chunks_per_search = settings.get("chunks_per_search", 10)
+        
+        if hybrid and self.hybrid_search.mode == HybridSearchMode.SERVER:
+            # One fused hybrid RPC per variation
+            hybrid_futures = [
+                executor.submit(
+                    self.hybrid_search.search_with_embedding,
+                    query=q,
+                    query_embedding=embedding,
+                    document_ids=document_ids,
+                    match_threshold=match_threshold,
+                    chunks_per_search=chunks_per_search,
+                    vector_weight=settings.get("vector_weight", 0.7),
+                    keyword_weight=settings.get("keyword_weight", 0.3)
+                )
+                for q, embedding in zip(queries, query_embeddings)
+            ]
+            return [future.result() for future in hybrid_futures]
+        
+        keyword_futures = [
+            executor.submit(
+                self.keyword_search.search,
+                query=q,
+                document_ids=document_ids,
+                chunks_per_search=chunks_per_search
+            )
+            for q in queries
+        ] if hybrid else []
+        
+        # The vector leg runs on this thread: the store either fans its own
+        # searches out on the pool or scores every variation in one pass
+        vector_lists = self.vector_search.search_with_embeddings(
+            query_embeddings,
+            document_ids=document_ids,
+            match_threshold=match_threshold,
+            chunks_per_search=chunks_per_search
+        )
+        if not hybrid:
+            return vector_lists
+        
+        keyword_lists = [future.result() for future in keyword_futures]
+        return [
+            fuse_two_lists(
+                vector_results=vector_results,
+                keyword_results=keyword_results,
+                vector_weight=settings.get("vector_weight", 0.7),
+                keyword_weight=settings.get("keyword_weight", 0.3)
+            )
+            for vector_results, keyword_results in zip(vector_lists, keyword_lists)
+        ]
+
+
+# Default instance
+multi_query_retriever = MultiQueryRetriever()
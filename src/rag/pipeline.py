@@ -1,13 +1,22 @@
-from typing import List, Dict, Any, Optional
+import asyncio
+from typing import List, Dict, Any, Optional, Tuple
 
-from src.models.enums import RAGStrategy
+from src.models.enums import RAGStrategy, RerankingModel, HybridSearchMode, VectorBackend, KeywordBackend
 from src.rag.vector_search import VectorSearch
+from src.rag.vector_store import PgVectorStore
 from src.rag.keyword_search import KeywordSearch
 from src.rag.hybrid_search import HybridSearch
-from src.rag.rrf import reciprocal_rank_fusion
-from src.rag.query_expansion import generate_query_variations
+from src.rag.multi_query import MultiQueryRetriever
+from src.rag.local_index import LocalIndexVectorStore
+from src.rag.bm25_index import BM25KeywordSearch
+from src.rag.reranker import Reranker
+from src.rag.mmr import MMRSelector
+from src.rag.adaptive import adaptive_controller
 from src.rag.context_builder import build_context
-from src.rag.prompt_builder import prepare_prompt_and_invoke_llm
+from src.rag.context_packer import context_packer
+from src.rag.image_selector import image_selector
+from src.rag.prompt_builder import prepare_prompt_and_invoke_llm, aprepare_prompt_and_invoke_llm
+from src.services.cache.retrieval_cache import retrieval_cache
 from src.schemas.common import Citation
 
 
@@ -30,6 +39,13 @@ class RAGPipeline:
         self.vector_search = VectorSearch()
         self.keyword_search = KeywordSearch()
         self.hybrid_search = HybridSearch()
+        self.multi_query = MultiQueryRetriever()
+        self.retrieval_cache = retrieval_cache
+        self.reranker = Reranker()
+        self.mmr = MMRSelector()
+        self.adaptive = adaptive_controller
+        self.packer = context_packer
+        self.images = image_selector
     
     def process(
         self,
@@ -48,6 +64,65 @@ class RAGPipeline:
         Returns:
             Dict with 'answer', 'citations', and metadata
         """
+        strategy, llm_provider, chunks, texts, images, tables, citations = self._prepare_context(
+            query, document_ids, settings
+        )
+        
+        # Step 6: Generate response with selected LLM provider
+        print(f"🤖 Preparing context and calling LLM ({llm_provider})...")
+        ai_response = prepare_prompt_and_invoke_llm(
+            user_query=query,
+            texts=texts,
+            images=images,
+            tables=tables,
+            llm_provider=llm_provider,
+            compress=settings.get("context_compression", False)
+        )
+        
+        return self._result(ai_response, citations, chunks, strategy, llm_provider)
+    
+    async def aprocess(
+        self,
+        query: str,
+        document_ids: List[str],
+        settings: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Async process, for use in async endpoints.
+        
+        Retrieval and context building (database RPCs, reranking) run in a
+        worker thread and the LLM is called with ainvoke, so the event loop
+        is never blocked.
+        
+        Args:
+            Same as process
+        
+        Returns:
+            Dict with 'answer', 'citations', and metadata
+        """
+        strategy, llm_provider, chunks, texts, images, tables, citations = await asyncio.to_thread(
+            self._prepare_context, query, document_ids, settings
+        )
+        
+        print(f"🤖 Preparing context and calling LLM ({llm_provider})...")
+        ai_response = await aprepare_prompt_and_invoke_llm(
+            user_query=query,
+            texts=texts,
+            images=images,
+            tables=tables,
+            llm_provider=llm_provider,
+            compress=settings.get("context_compression", False)
+        )
+        
+        return self._result(ai_response, citations, chunks, strategy, llm_provider)
+    
+    def _prepare_context(
+        self,
+        query: str,
+        document_ids: List[str],
+        settings: Dict[str, Any]
+    ) -> Tuple[str, str, List[Dict[str, Any]], List[str], List[str], List[str], List[Citation]]:
+        """Steps 1-5 of process: retrieve, select, pack and build the context."""
         strategy = settings.get("rag_strategy", RAGStrategy.BASIC.value)
         llm_provider = settings.get("llm_provider", "openai")
         
@@ -57,24 +132,29 @@ class RAGPipeline:
         # Step 1: Retrieve chunks based on strategy
         chunks = self._retrieve(query, document_ids, settings, strategy)
         
-        # Step 2: Trim to final context size
-        final_size = settings.get("final_context_size", 5)
-        chunks = chunks[:final_size]
+        # Step 2: Rerank (if enabled) and trim to final context size
+        chunks = self.select_context(query, chunks, settings)
         print(f"📄 Trimmed to final context size: {len(chunks)} chunks")
         
-        # Step 3: Build context
+        # Step 3: Fit the chunks into the provider's prompt token budget
+        chunks = self.packer.pack(chunks, llm_provider)
+        
+        # Step 4: Keep the most relevant images within the image budget, downscaled
+        chunks = self.images.select(chunks, llm_provider)
+        
+        # Step 5: Build context
         texts, images, tables, citations = build_context(chunks)
         
-        # Step 4: Generate response with selected LLM provider
-        print(f"🤖 Preparing context and calling LLM ({llm_provider})...")
-        ai_response = prepare_prompt_and_invoke_llm(
-            user_query=query,
-            texts=texts,
-            images=images,
-            tables=tables,
-            llm_provider=llm_provider
-        )
+        return strategy, llm_provider, chunks, texts, images, tables, citations
         
+    @staticmethod
+    def _result(
+        ai_response: str,
+        citations: List[Citation],
+        chunks: List[Dict[str, Any]],
+        strategy: str,
+        llm_provider: str
+    ) -> Dict[str, Any]:
         return {
             "answer": ai_response,
             "citations": [c.model_dump() for c in citations],
@@ -84,6 +164,60 @@ class RAGPipeline:
             "llm_provider": llm_provider
         }
     
+    def select_context(
+        self,
+        query: str,
+        chunks: List[Dict[str, Any]],
+        settings: Dict[str, Any]
+    ) -> List[Dict[str, Any]]:
+        """
+        Pick the final context chunks from retrieved candidates.
+        
+        With reranking enabled the candidates are reordered by the reranker.
+        With MMR enabled the final chunks are picked for relevance and
+        diversity (dropping near-duplicate neighbours); otherwise the top
+        final_context_size chunks are kept.
+        
+        Args:
+            query: User's question
+            chunks: Retrieved chunks in retrieval order
+            settings: Project settings dict with RAG configuration
+        
+        Returns:
+            At most final_context_size chunks
+        """
+        final_size = settings.get("final_context_size", 5)
+        reranking_model = settings.get("reranking_model") or RerankingModel.NONE.value
+        
+        use_mmr = settings.get("mmr_enabled", False)
+        
+        if settings.get("reranking_enabled") and reranking_model != RerankingModel.NONE.value and chunks:
+            # MMR needs the whole reranked pool to choose from
+            top_k = None if use_mmr else final_size
+            chunks, _ = self.reranker.rerank(query, chunks, reranking_model, top_k=top_k)
+        
+        if use_mmr:
+            return self.mmr.select(query, chunks, final_size, settings.get("mmr_lambda", 0.7))
+        
+        return chunks[:final_size]
+    
+    def candidate_pool_size(self, settings: Dict[str, Any]) -> int:
+        """
+        Number of retrieved candidates select_context can make use of.
+        
+        Without reranking or MMR only final_context_size chunks survive;
+        otherwise the larger of their candidate caps.
+        """
+        pool = settings.get("final_context_size", 5)
+        reranking_model = settings.get("reranking_model") or RerankingModel.NONE.value
+        
+        if settings.get("reranking_enabled") and reranking_model != RerankingModel.NONE.value:
+            pool = max(pool, self.reranker.max_candidates)
+        if settings.get("mmr_enabled"):
+            pool = max(pool, self.mmr.max_candidates)
+        
+        return pool
+    
     def _retrieve(
         self,
         query: str,
@@ -91,24 +225,148 @@ class RAGPipeline:
         settings: Dict[str, Any],
         strategy: str
     ) -> List[Dict[str, Any]]:
-        """Execute retrieval based on strategy."""
+        """
+        Execute retrieval based on strategy.
+        
+        Results are cached per project document-set version, so repeated
+        queries skip query expansion, embedding and search entirely.
+        """
+        # One version read: the result is stored under the version it was retrieved at
+        cache_key = self.retrieval_cache.key_for(settings.get("project_id"), query, settings)
+        
+        cached = self.retrieval_cache.get(cache_key)
+        if cached is not None:
+            print(f"⚡ Retrieval cache hit: {len(cached)} chunks")
+            return cached
+        
+        chunks = self._retrieve_uncached(query, document_ids, settings, strategy)
+        self.retrieval_cache.set(cache_key, chunks)
+        return chunks
+    
+    def _retrieve_uncached(
+        self,
+        query: str,
+        document_ids: List[str],
+        settings: Dict[str, Any],
+        strategy: str
+    ) -> List[Dict[str, Any]]:
+        """Run the configured retrieval strategy, adaptively if the project opted in."""
+        if settings.get("adaptive_retrieval") and strategy != RAGStrategy.BASIC.value:
+            return self._adaptive_retrieval(query, document_ids, settings, strategy)
+        
+        return self._run_strategy(query, document_ids, settings, strategy)
+    
+    def _run_strategy(
+        self,
+        query: str,
+        document_ids: List[str],
+        settings: Dict[str, Any],
+        strategy: str,
+        first_pass: Optional[List[Dict[str, Any]]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Dispatch to the retrieval method of a strategy.
+        
+        first_pass holds vector results already retrieved for the query
+        (adaptive retrieval), so escalated strategies only add their other legs.
+        """
         
         if strategy == RAGStrategy.BASIC.value:
-            return self._basic_retrieval(query, document_ids, settings)
+            return first_pass if first_pass is not None else self._basic_retrieval(query, document_ids, settings)
         
         elif strategy == RAGStrategy.HYBRID.value:
-            return self._hybrid_retrieval(query, document_ids, settings)
+            return self._hybrid_retrieval(query, document_ids, settings, first_pass)
         
         elif strategy == RAGStrategy.MULTI_QUERY_VECTOR.value:
-            return self._multi_query_vector(query, document_ids, settings)
+            return self._multi_query_vector(query, document_ids, settings, first_pass)
         
         elif strategy == RAGStrategy.MULTI_QUERY_HYBRID.value:
-            return self._multi_query_hybrid(query, document_ids, settings)
+            return self._multi_query_hybrid(query, document_ids, settings, first_pass)
         
         else:
             print(f"⚠️ Unknown strategy '{strategy}', defaulting to basic")
             return self._basic_retrieval(query, document_ids, settings)
     
+    def _adaptive_retrieval(
+        self,
+        query: str,
+        document_ids: List[str],
+        settings: Dict[str, Any],
+        strategy: str
+    ) -> List[Dict[str, Any]]:
+        """
+        Vector search first; escalate towards the configured strategy only
+        when that pass is not confident (see AdaptiveRetrievalController).
+        """
+        project_id = settings.get("project_id")
+        first_pass = self._basic_retrieval(query, document_ids, settings)
+        
+        escalation = self.adaptive.escalation(strategy, first_pass, settings)
+        if escalation is None:
+            print(f"✅ Adaptive: first vector pass is confident, skipping {strategy}")
+            self.adaptive.stats.record(project_id, "confident")
+            return first_pass
+        
+        print(f"⬆️ Adaptive: escalating to {escalation}")
+        chunks = self._run_strategy(query, document_ids, settings, escalation, first_pass)
+        helped = self.adaptive.helped(first_pass, chunks, settings.get("final_context_size", 5))
+        self.adaptive.stats.record(project_id, escalation, helped)
+        return chunks
+    
+    def _searchers(self, settings: Dict[str, Any]) -> Tuple[Any, HybridSearch, MultiQueryRetriever]:
+        """
+        Vector, hybrid and multi-query searchers for the project's backends.
+        
+        With a project_id in settings every searcher is scoped to the
+        project: Postgres RPCs filter on document_chunks.project_id over
+        completed documents instead of receiving the document_ids array.
+        """
+        project_id = settings.get("project_id")
+        # MMR compares candidates by embedding; have the searches return them
+        # instead of fetching them again afterwards
+        with_embeddings = bool(settings.get("mmr_enabled"))
+        if not project_id and not with_embeddings:
+            return self.vector_search, self.hybrid_search, self.multi_query
+        
+        # The local backends are per-project indexes
+        local_vector = bool(project_id) and settings.get("vector_backend") == VectorBackend.LOCAL.value
+        local_keyword = bool(project_id) and settings.get("keyword_backend") == KeywordBackend.BM25.value
+        
+        if not project_id:
+            vector = VectorSearch(include_embeddings=True, store=self.vector_search.store)
+            keyword = KeywordSearch(include_embeddings=True)
+        else:
+            vector = VectorSearch(
+                include_embeddings=with_embeddings,
+                store=LocalIndexVectorStore(project_id) if local_vector else PgVectorStore(
+                    project_id=project_id,
+                    search_mode=settings.get("vector_search_mode")
+                )
+            )
+            # BM25 hits would need an extra embedding query per search; MMR
+            # fetches the few it is missing in one query instead
+            keyword = BM25KeywordSearch(project_id) if local_keyword else KeywordSearch(
+                include_embeddings=with_embeddings,
+                project_id=project_id
+            )
+        
+        # Server mode fuses inside Postgres, which a local leg bypasses
+        mode = self.hybrid_search.mode
+        if mode == HybridSearchMode.SERVER and (local_vector or local_keyword):
+            mode = HybridSearchMode.CONCURRENT
+        hybrid = HybridSearch(
+            mode=mode.value,
+            vector_search=vector,
+            keyword_search=keyword,
+            project_id=project_id
+        )
+        
+        return vector, hybrid, MultiQueryRetriever(
+            vector_search=vector,
+            hybrid_search=hybrid,
+            keyword_search=keyword
+        )
+    
     def _basic_retrieval(
         self,
         query: str,
@@ -118,7 +376,8 @@ class RAGPipeline:
         """Basic vector search retrieval."""
         print("📊 Executing: Basic Vector Search")
         
-        chunks = self.vector_search.search(
+        vector_search, _, _ = self._searchers(settings)
+        chunks = vector_search.search(
             query=query,
             document_ids=document_ids,
             match_threshold=settings.get("similarity_threshold", 0.3),
@@ -132,19 +391,31 @@ class RAGPipeline:
         self,
         query: str,
         document_ids: List[str],
-        settings: Dict[str, Any]
+        settings: Dict[str, Any],
+        first_pass: Optional[List[Dict[str, Any]]] = None
     ) -> List[Dict[str, Any]]:
-        """Hybrid search with RRF fusion."""
+        """Hybrid search with RRF fusion (keyword leg only when first_pass is given)."""
         print("📊 Executing: Hybrid Search (Vector + Keyword)")
         
-        chunks = self.hybrid_search.search(
-            query=query,
-            document_ids=document_ids,
-            match_threshold=settings.get("similarity_threshold", 0.3),
-            chunks_per_search=settings.get("chunks_per_search", 10),
-            vector_weight=settings.get("vector_weight", 0.7),
-            keyword_weight=settings.get("keyword_weight", 0.3)
-        )
+        _, hybrid_search, _ = self._searchers(settings)
+        if first_pass is not None:
+            chunks = hybrid_search.fuse_with_keyword(
+                query,
+                first_pass,
+                document_ids,
+                chunks_per_search=settings.get("chunks_per_search", 10),
+                vector_weight=settings.get("vector_weight", 0.7),
+                keyword_weight=settings.get("keyword_weight", 0.3)
+            )
+        else:
+            chunks = hybrid_search.search(
+                query=query,
+                document_ids=document_ids,
+                match_threshold=settings.get("similarity_threshold", 0.3),
+                chunks_per_search=settings.get("chunks_per_search", 10),
+                vector_weight=settings.get("vector_weight", 0.7),
+                keyword_weight=settings.get("keyword_weight", 0.3)
+            )
         print(f"📈 Hybrid search returned {len(chunks)} chunks")
         
         return chunks
@@ -153,67 +424,47 @@ class RAGPipeline:
         self,
         query: str,
         document_ids: List[str],
-        settings: Dict[str, Any]
+        settings: Dict[str, Any],
+        first_pass: Optional[List[Dict[str, Any]]] = None
     ) -> List[Dict[str, Any]]:
         """Multi-query with vector search and RRF fusion."""
         num_queries = settings.get("number_of_queries", 3)
         print(f"📊 Executing: Multi-Query Vector Search ({num_queries} queries)")
         
-        # Generate query variations
-        queries = generate_query_variations(query, num_queries)
-        print(f"🔄 Generated queries: {queries}")
-        
-        # Execute searches for each query
-        all_results = []
-        for i, q in enumerate(queries):
-            results = self.vector_search.search(
-                query=q,
-                document_ids=document_ids,
-                match_threshold=settings.get("similarity_threshold", 0.3),
-                chunks_per_search=settings.get("chunks_per_search", 10)
-            )
-            print(f"📈 Query {i+1} '{q[:50]}...' returned: {len(results)} chunks")
-            all_results.append(results)
-        
-        # Fuse all results with RRF
-        chunks = reciprocal_rank_fusion(all_results)
-        print(f"🔗 RRF fusion returned: {len(chunks)} unique chunks")
-        
-        return chunks
+        # Search the original query while the variations are generated
+        _, _, multi_query = self._searchers(settings)
+        return multi_query.retrieve_expanded(
+            query,
+            num_queries,
+            document_ids,
+            settings,
+            hybrid=False,
+            top_k=self.candidate_pool_size(settings),
+            first_pass=first_pass
+        )
     
     def _multi_query_hybrid(
         self,
         query: str,
         document_ids: List[str],
-        settings: Dict[str, Any]
+        settings: Dict[str, Any],
+        first_pass: Optional[List[Dict[str, Any]]] = None
     ) -> List[Dict[str, Any]]:
         """Multi-query with hybrid search and RRF fusion."""
         num_queries = settings.get("number_of_queries", 3)
         print(f"📊 Executing: Multi-Query Hybrid Search ({num_queries} queries)")
         
-        # Generate query variations
-        queries = generate_query_variations(query, num_queries)
-        print(f"🔄 Generated queries: {queries}")
-        
-        # Execute hybrid searches for each query
-        all_results = []
-        for i, q in enumerate(queries):
-            results = self.hybrid_search.search(
-                query=q,
-                document_ids=document_ids,
-                match_threshold=settings.get("similarity_threshold", 0.3),
-                chunks_per_search=settings.get("chunks_per_search", 10),
-                vector_weight=settings.get("vector_weight", 0.7),
-                keyword_weight=settings.get("keyword_weight", 0.3)
-            )
-            print(f"📈 Query {i+1} '{q[:50]}...' returned: {len(results)} chunks")
-            all_results.append(results)
-        
-        # Fuse all results with RRF
-        chunks = reciprocal_rank_fusion(all_results)
-        print(f"🔗 RRF fusion returned: {len(chunks)} unique chunks")
-        
-        return chunks
+        # Search the original query while the variations are generated
+        _, _, multi_query = self._searchers(settings)
+        return multi_query.retrieve_expanded(
+            query,
+            num_queries,
+            document_ids,
+            settings,
+            hybrid=True,
+            top_k=self.candidate_pool_size(settings),
+            first_pass=first_pass
+        )
 
 
 # Default instance
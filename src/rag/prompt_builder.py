@@ -1,7 +1,10 @@
+import asyncio
 from typing import List, Optional
 
 from src.services.llm.factory import get_llm
 from src.rag.context_builder import format_context_for_prompt
+from src.rag.context_compressor import context_compressor
+from src.rag.image_selector import strip_data_url
 
 
 RAG_SYSTEM_PROMPT_TEMPLATE = """You are a helpful AI assistant that answers questions based solely on the provided context.
@@ -45,12 +48,15 @@ def prepare_prompt_and_invoke_llm(
     texts: List[str],
     images: Optional[List[str]] = None,
     tables: Optional[List[str]] = None,
-    llm_provider: str = "openai"
+    llm_provider: str = "openai",
+    compress: bool = False
 ) -> str:
     """
     Build complete RAG prompt and invoke LLM.
     
     Handles multi-modal content (text + images) when images are present.
+    With compress, each text is cut down to the sentences most relevant
+    to the question (see ContextCompressor).
     
     Args:
         user_query: The user's question
@@ -58,6 +64,7 @@ def prepare_prompt_and_invoke_llm(
         images: Optional list of base64-encoded images
         tables: Optional list of HTML table strings
         llm_provider: LLM provider to use ("openai" or "ollama")
+        compress: Apply query-focused extractive compression to texts
         
     Returns:
         AI response string
@@ -71,30 +78,67 @@ def prepare_prompt_and_invoke_llm(
         ...     llm_provider="openai"
         ... )
     """
+    messages = _prepare_messages(user_query, texts, images, tables, llm_provider, compress)
+    
+    # Use multi-modal invocation if images present
+    return get_llm(provider=llm_provider).invoke_with_images(messages=messages)
+
+
+async def aprepare_prompt_and_invoke_llm(
+    user_query: str,
+    texts: List[str],
+    images: Optional[List[str]] = None,
+    tables: Optional[List[str]] = None,
+    llm_provider: str = "openai",
+    compress: bool = False
+) -> str:
+    """
+    Async prepare_prompt_and_invoke_llm.
+    
+    Prompt preparation (which may embed sentences for compression) runs in
+    a worker thread and the LLM is called with ainvoke.
+    
+    Args:
+        Same as prepare_prompt_and_invoke_llm
+    
+    Returns:
+        AI response string
+    """
+    messages = await asyncio.to_thread(
+        _prepare_messages, user_query, texts, images, tables, llm_provider, compress
+    )
+    
+    return await get_llm(provider=llm_provider).ainvoke_with_images(messages)
+
+
+def _prepare_messages(
+    user_query: str,
+    texts: List[str],
+    images: Optional[List[str]],
+    tables: Optional[List[str]],
+    llm_provider: str,
+    compress: bool
+) -> List:
+    """Compress (if asked), build the system prompt and the message list."""
     images = images or []
     tables = tables or []
     
+    if compress:
+        texts = context_compressor.compress_texts(user_query, texts)
+    
     # Build system prompt with context
     system_prompt = build_system_prompt(texts, tables, images)
     
-    # Get LLM based on provider
-    llm = get_llm(provider=llm_provider)
-    
     print(
         f"🤖 Invoking LLM ({llm_provider}) with {len(texts)} texts, "
         f"{len(tables)} tables, {len(images)} images..."
     )
     
-    # Use multi-modal invocation if images present
-    response = llm.invoke_with_images(
-        messages=_build_multimodal_messages(
-            system_prompt=system_prompt,
-            user_query=user_query,
-            images=images if images else None
-        )
+    return _build_multimodal_messages(
+        system_prompt=system_prompt,
+        user_query=user_query,
+        images=images if images else None
     )
-    
-    return response
 
 
 def _build_multimodal_messages(
@@ -123,8 +167,7 @@ def _build_multimodal_messages(
         
         for img_base64 in images:
             # Clean base64 if needed
-            if img_base64.startswith("data:image"):
-                img_base64 = img_base64.split(",", 1)[1]
+            img_base64 = strip_data_url(img_base64)
             
             content_parts.append({
                 "type": "image_url",
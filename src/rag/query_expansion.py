@@ -1,7 +1,9 @@
 from typing import List
 
+from src.config import settings
 from src.schemas.chat import QueryVariations
 from src.services.llm.factory import get_llm
+from src.services.cache.query_variation_cache import query_variation_cache
 
 
 def generate_query_variations(
@@ -11,6 +13,9 @@ def generate_query_variations(
     """
     Generate query variations using LLM for multi-query retrieval.
     
+    Variations are cached by (model, query, num_queries), so repeated
+    questions skip the LLM call.
+    
     Args:
         original_query: The original user query
         num_queries: Total number of queries to return (including original)
@@ -24,6 +29,15 @@ def generate_query_variations(
         >>> #          "What is the process of photosynthesis?",
         >>> #          "Explain plant energy conversion"]
     """
+    if num_queries <= 1:
+        return [original_query]
+    
+    model = f"{settings.LLM_PROVIDER}:{settings.active_llm_model}"
+    cached = query_variation_cache.get(model, original_query, num_queries)
+    if cached is not None:
+        print(f"⚡ Query variation cache hit: {len(cached)} variations")
+        return [original_query] + cached
+    
     system_prompt = f"""Generate {num_queries - 1} alternative ways to phrase this question for document search. 
 Use different keywords and synonyms while maintaining the same intent. 
 Return exactly {num_queries - 1} variations."""
@@ -43,6 +57,7 @@ Return exactly {num_queries - 1} variations."""
         
         # Return original query + variations
         variations = result.queries[:num_queries - 1]
+        query_variation_cache.set(model, original_query, num_queries, variations)
         return [original_query] + variations
         
     except Exception as e:
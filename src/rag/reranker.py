@@ -0,0 +1,260 @@
+import re
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import Counter, OrderedDict
+from typing import List, Dict, Any, Optional, Tuple
+
+from src.config import settings as app_settings
+from src.models.enums import RerankingModel
+
+
+# Local cross-encoders behind the reranking models offered in project settings
+CROSS_ENCODER_MODELS = {
+    RerankingModel.RERANKER_ENGLISH_V3.value: "cross-encoder/ms-marco-MiniLM-L-6-v2",
+    RerankingModel.RERANKER_MULTILINGUAL_V3.value: "cross-encoder/mmarco-mMiniLMv2-L12-H384-v1",
+}
+
+_WORD_PATTERN = re.compile(r"\w+")
+
+
+class RelevanceScorer(ABC):
+    """Scores (query, passage) pairs; higher means more relevant."""
+    
+    name: str = "base"
+    
+    @abstractmethod
+    def score(self, query: str, passages: List[str]) -> List[float]:
+        """Score a batch of passages against one query."""
+
+
+class LexicalScorer(RelevanceScorer):
+    """
+    Dependency-free BM25-style term overlap scorer.
+    
+    Each pair is scored independently of the other candidates so scores
+    can be cached per (query, chunk).
+    """
+    
+    name = "lexical"
+    
+    def __init__(self, k1: float = 1.2, b: float = 0.75, avg_length: int = 200):
+        self.k1 = k1
+        self.b = b
+        self.avg_length = avg_length
+    
+    def score(self, query: str, passages: List[str]) -> List[float]:
+        query_terms = set(_tokenize(query))
+        scores = []
+        
+        for passage in passages:
+            terms = _tokenize(passage)
+            counts = Counter(terms)
+            norm = self.k1 * (1 - self.b + self.b * len(terms) / self.avg_length)
+            scores.append(sum(
+                counts[term] * (self.k1 + 1) / (counts[term] + norm)
+                for term in query_terms if term in counts
+            ))
+        
+        return scores
+
+
+class CrossEncoderScorer(RelevanceScorer):
+    """
+    Local cross-encoder scorer (sentence-transformers).
+    
+    The model is loaded once per process and scores pairs in batches on CPU
+    (or the configured device).
+    """
+    
+    def __init__(self, model_name: str, device: Optional[str] = None, batch_size: Optional[int] = None):
+        from sentence_transformers import CrossEncoder
+        
+        self.name = model_name
+        self.batch_size = batch_size or app_settings.RERANKER_BATCH_SIZE
+        self.model = CrossEncoder(model_name, device=device or app_settings.RERANKER_DEVICE)
+    
+    def score(self, query: str, passages: List[str]) -> List[float]:
+        pairs = [(query, passage) for passage in passages]
+        return [float(s) for s in self.model.predict(pairs, batch_size=self.batch_size)]
+
+
+_scorers: Dict[str, RelevanceScorer] = {}
+_failed_at: Dict[str, float] = {}
+_load_locks: Dict[str, threading.Lock] = {}
+_scorers_lock = threading.Lock()
+
+
+def get_scorer(reranking_model: str, wait: bool = False) -> Optional[RelevanceScorer]:
+    """
+    Get the cross-encoder scorer for a reranking model setting.
+    
+    Returns None when the model is unknown, cannot be loaded, or is still
+    loading in another thread, so the caller keeps retrieval order instead
+    of waiting. Models are loaded outside the shared lock, one thread per
+    model. A failed load is retried only after RERANKER_RETRY_SECONDS.
+    
+    Args:
+        reranking_model: Reranking model setting value
+        wait: Block until a load running in another thread finishes
+    """
+    model_name = CROSS_ENCODER_MODELS.get(reranking_model)
+    if not model_name:
+        return None
+    
+    with _scorers_lock:
+        if model_name in _scorers:
+            return _scorers[model_name]
+        if _backing_off(model_name):
+            return None
+        load_lock = _load_locks.setdefault(model_name, threading.Lock())
+    
+    if not load_lock.acquire(blocking=wait):
+        return None
+    try:
+        with _scorers_lock:
+            if model_name in _scorers or _backing_off(model_name):
+                return _scorers.get(model_name)
+        
+        try:
+            scorer = CrossEncoderScorer(model_name)
+        except Exception as e:
+            print(
+                f"⚠️ Cross-encoder '{model_name}' unavailable ({e}), keeping retrieval order; "
+                f"retrying in {app_settings.RERANKER_RETRY_SECONDS}s"
+            )
+            with _scorers_lock:
+                _failed_at[model_name] = time.monotonic()
+            return None
+        
+        with _scorers_lock:
+            _scorers[model_name] = scorer
+            _failed_at.pop(model_name, None)
+        return scorer
+    finally:
+        load_lock.release()
+
+
+def warm_up_scorer(reranking_model: str = RerankingModel.RERANKER_ENGLISH_V3.value) -> None:
+    """Load a reranking model ahead of the first request (e.g. at startup)."""
+    if get_scorer(reranking_model, wait=True) is not None:
+        print(f"✅ Reranking model '{reranking_model}' loaded")
+
+
+def _backing_off(model_name: str) -> bool:
+    """Whether a recent failed load of the model is still in its retry delay."""
+    failed_at = _failed_at.get(model_name)
+    return failed_at is not None and time.monotonic() - failed_at < app_settings.RERANKER_RETRY_SECONDS
+
+
+class Reranker:
+    """
+    Rerank retrieved chunks by (query, chunk) relevance.
+    
+    Only the first max_candidates chunks (in retrieval order) are scored;
+    scores are computed in batches and cached per (scorer, query, chunk id).
+    """
+    
+    def __init__(
+        self,
+        scorer: Optional[RelevanceScorer] = None,
+        max_candidates: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        cache_size: Optional[int] = None
+    ):
+        self.scorer = scorer
+        self.max_candidates = max_candidates or app_settings.RERANKER_MAX_CANDIDATES
+        self.batch_size = batch_size or app_settings.RERANKER_BATCH_SIZE
+        self.cache_size = cache_size or app_settings.RERANKER_SCORE_CACHE_SIZE
+        
+        self._scores: "OrderedDict[Tuple[str, str, str], float]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def rerank(
+        self,
+        query: str,
+        chunks: List[Dict[str, Any]],
+        reranking_model: str = RerankingModel.RERANKER_ENGLISH_V3.value,
+        top_k: Optional[int] = None
+    ) -> Tuple[List[Dict[str, Any]], Dict[str, float]]:
+        """
+        Reorder chunks by relevance to the query.
+        
+        Args:
+            query: User's question
+            chunks: Retrieved chunks in retrieval order
+            reranking_model: Reranking model from project settings
+            top_k: Number of chunks to return (None returns all candidates)
+        
+        Returns:
+            Tuple of (reranked chunks with 'rerank_score', timings) where
+            timings holds candidates, scored, cache_hits and rerank_ms
+        """
+        start = time.perf_counter()
+        scorer = self.scorer or get_scorer(reranking_model)
+        if scorer is None:
+            # No model to rerank with: a weaker ranker would only reshuffle retrieval order
+            return (chunks if top_k is None else chunks[:top_k]), {
+                "candidates": 0,
+                "scored": 0,
+                "cache_hits": 0,
+                "rerank_ms": 0.0,
+            }
+        
+        candidates = chunks[:self.max_candidates]
+        
+        normalized_query = " ".join(query.split()).casefold()
+        keys = [
+            (scorer.name, normalized_query, str(c["id"])) if c.get("id") else None
+            for c in candidates
+        ]
+        with self._lock:
+            scores = [self._scores.get(key) if key else None for key in keys]
+        
+        missing = [i for i, score in enumerate(scores) if score is None]
+        for batch_start in range(0, len(missing), self.batch_size):
+            batch = missing[batch_start:batch_start + self.batch_size]
+            batch_scores = scorer.score(query, [_chunk_text(candidates[i]) for i in batch])
+            for i, score in zip(batch, batch_scores):
+                scores[i] = score
+        
+        self._remember([(keys[i], scores[i]) for i in missing if keys[i]])
+        
+        order = sorted(range(len(candidates)), key=lambda i: scores[i], reverse=True)
+        if top_k is not None:
+            order = order[:top_k]
+        reranked = [{**candidates[i], "rerank_score": scores[i]} for i in order]
+        
+        timings = {
+            "candidates": len(candidates),
+            "scored": len(missing),
+            "cache_hits": len(candidates) - len(missing),
+            "rerank_ms": (time.perf_counter() - start) * 1000,
+        }
+        print(
+            f"🎯 Reranked {timings['candidates']} candidates with {scorer.name} "
+            f"({timings['scored']} scored, {timings['cache_hits']} cached) "
+            f"in {timings['rerank_ms']:.0f} ms"
+        )
+        
+        return reranked, timings
+    
+    def _remember(self, items: List[Tuple[Tuple[str, str, str], float]]) -> None:
+        with self._lock:
+            for key, score in items:
+                self._scores[key] = score
+                self._scores.move_to_end(key)
+            while len(self._scores) > self.cache_size:
+                self._scores.popitem(last=False)
+
+
+def _tokenize(text: str) -> List[str]:
+    return [word.casefold() for word in _WORD_PATTERN.findall(text or "")]
+
+
+def _chunk_text(chunk: Dict[str, Any]) -> str:
+    return chunk.get("content") or ""
+
+
+# Default instance
+reranker = Reranker()
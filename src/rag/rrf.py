@@ -1,10 +1,14 @@
 from typing import List, Dict, Any, Optional
 
+from src.models.enums import FusionMethod
+from src.rag.fusion import fuse
+
 
 def reciprocal_rank_fusion(
     search_results_list: List[List[Dict[str, Any]]],
     weights: Optional[List[float]] = None,
-    k: int = 60
+    k: int = 60,
+    top_k: Optional[int] = None
 ) -> List[Dict[str, Any]]:
     """
     Combine multiple search result lists using Reciprocal Rank Fusion.
@@ -15,6 +19,7 @@ def reciprocal_rank_fusion(
         search_results_list: List of search result lists to fuse
         weights: Optional weights for each result list (defaults to equal)
         k: Ranking constant (default 60, prevents high ranks from dominating)
+        top_k: Only return the top_k results (heap selection, no full sort)
         
     Returns:
         Fused and sorted results with RRF scores
@@ -27,45 +32,13 @@ def reciprocal_rank_fusion(
         ...     weights=[0.7, 0.3]
         ... )
     """
-    if not search_results_list or not any(search_results_list):
-        return []
-    
-    # Default to equal weights
-    if weights is None:
-        weights = [1.0 / len(search_results_list)] * len(search_results_list)
-    
-    chunk_scores: Dict[str, float] = {}
-    all_chunks: Dict[str, Dict[str, Any]] = {}
-    
-    for search_idx, results in enumerate(search_results_list):
-        weight = weights[search_idx]
-        
-        for rank, chunk in enumerate(results):
-            chunk_id = chunk.get("id")
-            if not chunk_id:
-                continue
-            
-            # RRF score calculation
-            rrf_score = weight * (1.0 / (k + rank + 1))
-            
-            if chunk_id in chunk_scores:
-                chunk_scores[chunk_id] += rrf_score
-            else:
-                chunk_scores[chunk_id] = rrf_score
-                all_chunks[chunk_id] = chunk
-    
-    # Sort by RRF score descending
-    sorted_chunk_ids = sorted(
-        chunk_scores.keys(),
-        key=lambda cid: chunk_scores[cid],
-        reverse=True
+    return fuse(
+        search_results_list,
+        method=FusionMethod.RRF.value,
+        weights=weights,
+        k=k,
+        top_k=top_k
     )
-    
-    # Build result list with RRF scores
-    return [
-        {**all_chunks[chunk_id], "rrf_score": chunk_scores[chunk_id]}
-        for chunk_id in sorted_chunk_ids
-    ]
 
 
 def fuse_two_lists(
@@ -73,7 +46,8 @@ def fuse_two_lists(
     keyword_results: List[Dict[str, Any]],
     vector_weight: float = 0.7,
     keyword_weight: float = 0.3,
-    k: int = 60
+    k: int = 60,
+    top_k: Optional[int] = None
 ) -> List[Dict[str, Any]]:
     """
     Convenience function to fuse vector and keyword search results.
@@ -84,6 +58,7 @@ def fuse_two_lists(
         vector_weight: Weight for vector search (default 0.7)
         keyword_weight: Weight for keyword search (default 0.3)
         k: RRF constant
+        top_k: Only return the top_k results
         
     Returns:
         Fused results sorted by RRF score
@@ -91,5 +66,6 @@ def fuse_two_lists(
     return reciprocal_rank_fusion(
         [vector_results, keyword_results],
         [vector_weight, keyword_weight],
-        k
+        k,
+        top_k
     )
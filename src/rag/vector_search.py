@@ -1,22 +1,26 @@
-from typing import List, Dict, Any
+import asyncio
+from typing import List, Dict, Any, Optional, Sequence
 
-from src.services.database.supabase import supabase
 from src.services.llm.embeddings import embedding_service
+from src.rag.vector_store import VectorStore, PgVectorStore
 
 
 class VectorSearch:
-    """Vector similarity search using pgvector."""
+    """Vector similarity search over a VectorStore (pgvector by default)."""
     
-    def __init__(self):
-        self.db = supabase
+    def __init__(self, include_embeddings: bool = False, store: Optional[VectorStore] = None):
+        self.store = store or PgVectorStore()
         self.embeddings = embedding_service
+        self.include_embeddings = include_embeddings
     
     def search(
         self,
         query: str,
         document_ids: List[str],
         match_threshold: float = 0.3,
-        chunks_per_search: int = 10
+        chunks_per_search: int = 10,
+        columns: Optional[Sequence[str]] = None,
+        include_embeddings: Optional[bool] = None
     ) -> List[Dict[str, Any]]:
         """
         Perform vector similarity search.
@@ -26,6 +30,9 @@ class VectorSearch:
             document_ids: List of document IDs to search within
             match_threshold: Minimum similarity threshold
             chunks_per_search: Maximum number of results
+            columns: Columns to return (defaults to LEAN_COLUMNS)
+            include_embeddings: Also return chunk embeddings (e.g. for MMR);
+                defaults to the instance setting
             
         Returns:
             List of matching chunks with scores
@@ -33,25 +40,54 @@ class VectorSearch:
         # Generate query embedding
         query_embedding = self.embeddings.embed_query(query)
         
-        # Call Supabase RPC function
-        result = self.db.rpc(
-            "vector_search_document_chunks",
-            {
-                "query_embedding": query_embedding,
-                "filter_document_ids": document_ids,
-                "match_threshold": match_threshold,
-                "chunks_per_search": chunks_per_search
-            }
-        ).execute()
+        return self.search_with_embedding(
+            query_embedding=query_embedding,
+            document_ids=document_ids,
+            match_threshold=match_threshold,
+            chunks_per_search=chunks_per_search,
+            columns=columns,
+            include_embeddings=include_embeddings
+        )
+    
+    async def asearch(
+        self,
+        query: str,
+        document_ids: List[str],
+        match_threshold: float = 0.3,
+        chunks_per_search: int = 10,
+        columns: Optional[Sequence[str]] = None,
+        include_embeddings: Optional[bool] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Async search: the query is embedded with the async client and the
+        store lookup runs in a worker thread, so the event loop never blocks.
+        
+        Args:
+            Same as search
         
-        return result.data if result.data else []
+        Returns:
+            List of matching chunks with scores
+        """
+        query_embedding = await self.embeddings.aembed_query(query)
+        
+        return await asyncio.to_thread(
+            self.search_with_embedding,
+            query_embedding=query_embedding,
+            document_ids=document_ids,
+            match_threshold=match_threshold,
+            chunks_per_search=chunks_per_search,
+            columns=columns,
+            include_embeddings=include_embeddings
+        )
     
     def search_with_embedding(
         self,
         query_embedding: List[float],
         document_ids: List[str],
         match_threshold: float = 0.3,
-        chunks_per_search: int = 10
+        chunks_per_search: int = 10,
+        columns: Optional[Sequence[str]] = None,
+        include_embeddings: Optional[bool] = None
     ) -> List[Dict[str, Any]]:
         """
         Perform vector search with pre-computed embedding.
@@ -61,21 +97,55 @@ class VectorSearch:
             document_ids: List of document IDs to search within
             match_threshold: Minimum similarity threshold
             chunks_per_search: Maximum number of results
+            columns: Columns to return (defaults to LEAN_COLUMNS)
+            include_embeddings: Also return chunk embeddings;
+                defaults to the instance setting
             
         Returns:
             List of matching chunks with scores
         """
-        result = self.db.rpc(
-            "vector_search_document_chunks",
-            {
-                "query_embedding": query_embedding,
-                "filter_document_ids": document_ids,
-                "match_threshold": match_threshold,
-                "chunks_per_search": chunks_per_search
-            }
-        ).execute()
+        if include_embeddings is None:
+            include_embeddings = self.include_embeddings
+        
+        return self.store.search(
+            query_embedding,
+            document_ids,
+            match_threshold=match_threshold,
+            chunks_per_search=chunks_per_search,
+            columns=columns,
+            include_embeddings=include_embeddings
+        )
+        
+    def search_with_embeddings(
+        self,
+        query_embeddings: List[List[float]],
+        document_ids: List[str],
+        match_threshold: float = 0.3,
+        chunks_per_search: int = 10,
+        columns: Optional[Sequence[str]] = None,
+        include_embeddings: Optional[bool] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Search several pre-computed embeddings at once.
+        
+        The store decides how: the pgvector store fans the RPCs out on the
+        search pool (so this must not run inside a pool task), in-process
+        stores score all queries together.
+        
+        Returns:
+            One list of matching chunks per embedding, in input order
+        """
+        if include_embeddings is None:
+            include_embeddings = self.include_embeddings
         
-        return result.data if result.data else []
+        return self.store.search_many(
+            query_embeddings,
+            document_ids,
+            match_threshold=match_threshold,
+            chunks_per_search=chunks_per_search,
+            columns=columns,
+            include_embeddings=include_embeddings
+        )
 
 
 # Default instance
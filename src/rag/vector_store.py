@@ -0,0 +1,343 @@
+import threading
+import uuid
+from typing import List, Dict, Any, Optional, Sequence, Tuple, Protocol, runtime_checkable
+
+import numpy as np
+
+from src.config import settings as app_settings
+from src.models.enums import VectorSearchMode
+from src.core.vector_math import to_matrix, normalize_rows, parse_vector
+from src.rag.concurrency import get_search_executor, in_search_pool
+from src.services.database.supabase import supabase
+from src.services.database.repositories.document_repo import DocumentChunkRepository
+
+
+# Columns returned by default - everything the context builder and agents
+# read, without the embedding vector
+LEAN_COLUMNS: Tuple[str, ...] = (
+    "id",
+    "document_id",
+    "content",
+    "chunk_index",
+    "page_number",
+    "char_count",
+    "type",
+    "original_content",
+    "similarity",
+    "filename",
+)
+
+
+def resolve_columns(
+    columns: Optional[Sequence[str]],
+    default_columns: Sequence[str],
+    include_embeddings: bool
+) -> List[str]:
+    """Build the PostgREST column selection for a search RPC."""
+    selected = list(columns or default_columns)
+    
+    if include_embeddings and "embedding" not in selected:
+        selected.append("embedding")
+    
+    return selected
+
+
+def project_columns(
+    results: List[Dict[str, Any]],
+    columns: Optional[Sequence[str]],
+    include_embeddings: bool,
+    default_columns: Sequence[str] = LEAN_COLUMNS
+) -> List[Dict[str, Any]]:
+    """Apply a column selection to results built outside Postgres."""
+    selected = resolve_columns(columns, default_columns, include_embeddings)
+    return [{column: result.get(column) for column in selected} for result in results]
+
+
+@runtime_checkable
+class VectorStore(Protocol):
+    """
+    Storage and similarity search for chunk embeddings.
+    
+    Search results have the same shape whatever the backend: chunk fields
+    (LEAN_COLUMNS by default) with a cosine 'similarity', best first.
+    """
+    
+    def upsert(self, chunks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Insert or replace chunks (each with an 'embedding'); returns the stored rows."""
+        ...
+    
+    def delete_by_document(self, document_id: str) -> int:
+        """Remove every chunk of a document; returns the number removed."""
+        ...
+    
+    def search(
+        self,
+        query_embedding: Sequence[float],
+        document_ids: Optional[List[str]],
+        match_threshold: float = 0.3,
+        chunks_per_search: int = 10,
+        columns: Optional[Sequence[str]] = None,
+        include_embeddings: bool = False
+    ) -> List[Dict[str, Any]]:
+        """Chunks of the given documents most similar to one query embedding."""
+        ...
+    
+    def search_many(
+        self,
+        query_embeddings: Sequence[Sequence[float]],
+        document_ids: Optional[List[str]],
+        match_threshold: float = 0.3,
+        chunks_per_search: int = 10,
+        columns: Optional[Sequence[str]] = None,
+        include_embeddings: bool = False
+    ) -> List[List[Dict[str, Any]]]:
+        """One result list per query embedding, in input order."""
+        ...
+
+
+class PgVectorStore:
+    """
+    Default store: document_chunks in Supabase, searched with pgvector.
+    
+    A store scoped to a project searches all completed documents of that
+    project by project_id, so document_ids are not sent with the RPC. That
+    search sets hnsw.ef_search per call and uses iterative index scans, so
+    the project filter does not cost recall. With any other search_mode
+    the candidates come from a compact index (halfvec, binary or the
+    truncated matryoshka prefix) and are rescored with the full-precision
+    embeddings.
+    """
+    
+    def __init__(
+        self,
+        batch_size: Optional[int] = None,
+        project_id: Optional[str] = None,
+        ef_search: Optional[int] = None,
+        search_mode: Optional[str] = None,
+        rescore_candidates: Optional[int] = None
+    ):
+        self.db = supabase
+        self.chunk_repo = DocumentChunkRepository()
+        self.batch_size = batch_size or app_settings.VECTOR_STORE_UPSERT_BATCH_SIZE
+        self.project_id = project_id
+        self.ef_search = ef_search or app_settings.VECTOR_SEARCH_EF_SEARCH
+        self.search_mode = VectorSearchMode(search_mode or VectorSearchMode.FULL.value)
+        self.rescore_candidates = rescore_candidates or app_settings.VECTOR_SEARCH_RESCORE_CANDIDATES
+    
+    def upsert(self, chunks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Write chunks in batches, one request per batch."""
+        return self.chunk_repo.upsert_chunks(chunks, batch_size=self.batch_size)
+    
+    def delete_by_document(self, document_id: str) -> int:
+        return self.chunk_repo.delete_by_document(document_id)
+    
+    def search(
+        self,
+        query_embedding: Sequence[float],
+        document_ids: Optional[List[str]],
+        match_threshold: float = 0.3,
+        chunks_per_search: int = 10,
+        columns: Optional[Sequence[str]] = None,
+        include_embeddings: bool = False
+    ) -> List[Dict[str, Any]]:
+        """Call the vector search RPC, projecting only the requested columns."""
+        params = {
+            "query_embedding": list(query_embedding),
+            "match_threshold": match_threshold,
+            "chunks_per_search": chunks_per_search,
+            "include_embedding": include_embeddings
+        }
+        if self.project_id and self.search_mode != VectorSearchMode.FULL:
+            function_name = "vector_search_project_chunks_quantized"
+            params["filter_project_id"] = self.project_id
+            params["ef_search"] = self.ef_search
+            params["quantization"] = self.search_mode.value
+            params["rescore_candidates"] = self.rescore_candidates
+        elif self.project_id:
+            function_name = "vector_search_project_chunks_tuned"
+            params["filter_project_id"] = self.project_id
+            params["ef_search"] = self.ef_search
+        else:
+            function_name = "vector_search_chunks"
+            params["filter_document_ids"] = document_ids
+        
+        result = self.db.rpc(function_name, params).select(
+            *resolve_columns(columns, LEAN_COLUMNS, include_embeddings)
+        ).execute()
+        
+        return result.data if result.data else []
+    
+    def search_many(
+        self,
+        query_embeddings: Sequence[Sequence[float]],
+        document_ids: Optional[List[str]],
+        match_threshold: float = 0.3,
+        chunks_per_search: int = 10,
+        columns: Optional[Sequence[str]] = None,
+        include_embeddings: bool = False
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Run one RPC per embedding, concurrently on the shared search pool.
+        
+        Called from a pool worker the RPCs run one after another instead,
+        since blocking on the pool from inside it can deadlock.
+        """
+        if len(query_embeddings) <= 1 or in_search_pool():
+            return [
+                self.search(embedding, document_ids, match_threshold, chunks_per_search, columns, include_embeddings)
+                for embedding in query_embeddings
+            ]
+        
+        executor = get_search_executor()
+        futures = [
+            executor.submit(
+                self.search,
+                embedding,
+                document_ids,
+                match_threshold,
+                chunks_per_search,
+                columns,
+                include_embeddings
+            )
+            for embedding in query_embeddings
+        ]
+        return [future.result() for future in futures]
+
+
+class InMemoryVectorStore:
+    """
+    Exact cosine search over a NumPy matrix held in process memory.
+    
+    Reference implementation for tests, benchmarks and offline runs: no
+    database, no persistence. search_many scores every query with a single
+    matrix product.
+    """
+    
+    def __init__(self, dimensions: Optional[int] = None):
+        self.dimensions = dimensions
+        self._vectors = np.zeros((0, dimensions or 0), dtype=np.float32)
+        self._rows: List[Dict[str, Any]] = []
+        self._positions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+    
+    def __len__(self) -> int:
+        return len(self._rows)
+    
+    def upsert(self, chunks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Add chunks, replacing any with an existing id; chunks without an id get one."""
+        chunks = [chunk for chunk in chunks if chunk.get("embedding") is not None]
+        if not chunks:
+            return []
+        
+        vectors = normalize_rows(to_matrix([parse_vector(chunk["embedding"]) for chunk in chunks]))
+        stored = []
+        
+        with self._lock:
+            if not self._rows:
+                self.dimensions = vectors.shape[1]
+                self._vectors = np.zeros((0, self.dimensions), dtype=np.float32)
+            elif vectors.shape[1] != self.dimensions:
+                raise ValueError(f"Expected {self.dimensions}-dimensional embeddings, got {vectors.shape[1]}")
+            
+            # Copy on write, so concurrent searches keep a consistent snapshot
+            existing = len(self._rows)
+            rows = list(self._rows)
+            positions = dict(self._positions)
+            matrix = self._vectors.copy()
+            appended: List[np.ndarray] = []
+            
+            for chunk, vector in zip(chunks, vectors):
+                row = {key: value for key, value in chunk.items() if key != "embedding"}
+                row["id"] = row.get("id") or str(uuid.uuid4())
+                
+                position = positions.get(row["id"])
+                if position is None:
+                    positions[row["id"]] = len(rows)
+                    rows.append(row)
+                    appended.append(vector)
+                elif position >= existing:
+                    rows[position] = row
+                    appended[position - existing] = vector
+                else:
+                    rows[position] = row
+                    matrix[position] = vector
+                stored.append({**row, "embedding": vector.tolist()})
+            
+            if appended:
+                matrix = np.vstack([matrix, np.stack(appended)])
+            self._rows, self._positions, self._vectors = rows, positions, matrix
+        
+        return stored
+    
+    def delete_by_document(self, document_id: str) -> int:
+        with self._lock:
+            keep = [i for i, row in enumerate(self._rows) if row.get("document_id") != document_id]
+            removed = len(self._rows) - len(keep)
+            if removed:
+                self._rows = [self._rows[i] for i in keep]
+                self._vectors = self._vectors[keep]
+                self._positions = {row["id"]: i for i, row in enumerate(self._rows)}
+        return removed
+    
+    def search(
+        self,
+        query_embedding: Sequence[float],
+        document_ids: Optional[List[str]],
+        match_threshold: float = 0.3,
+        chunks_per_search: int = 10,
+        columns: Optional[Sequence[str]] = None,
+        include_embeddings: bool = False
+    ) -> List[Dict[str, Any]]:
+        return self.search_many(
+            [query_embedding], document_ids, match_threshold, chunks_per_search, columns, include_embeddings
+        )[0]
+    
+    def search_many(
+        self,
+        query_embeddings: Sequence[Sequence[float]],
+        document_ids: Optional[List[str]],
+        match_threshold: float = 0.3,
+        chunks_per_search: int = 10,
+        columns: Optional[Sequence[str]] = None,
+        include_embeddings: bool = False
+    ) -> List[List[Dict[str, Any]]]:
+        if not len(query_embeddings):
+            return []
+        
+        with self._lock:
+            rows, vectors = self._rows, self._vectors
+        if not rows:
+            return [[] for _ in query_embeddings]
+        
+        candidates = np.arange(len(rows))
+        if document_ids is not None:
+            wanted = set(document_ids)
+            candidates = np.fromiter(
+                (i for i, row in enumerate(rows) if row.get("document_id") in wanted),
+                dtype=np.int64
+            )
+        
+        queries = normalize_rows(to_matrix(query_embeddings))
+        scores = queries @ vectors[candidates].T
+        
+        results = []
+        for query_scores in scores:
+            keep = np.flatnonzero(query_scores > match_threshold)
+            if len(keep) > chunks_per_search:
+                keep = keep[np.argpartition(-query_scores[keep], chunks_per_search - 1)[:chunks_per_search]]
+            keep = keep[np.argsort(-query_scores[keep], kind="stable")]
+            
+            hits = []
+            for i in keep:
+                row = int(candidates[i])
+                hit = {**rows[row], "similarity": float(query_scores[i])}
+                if include_embeddings:
+                    hit["embedding"] = vectors[row].tolist()
+                hits.append(hit)
+            results.append(project_columns(hits, columns, include_embeddings))
+        
+        return results
+
+
+# Default instance
+pg_vector_store = PgVectorStore()
@@ -2,7 +2,16 @@ from pydantic import BaseModel, Field
 from typing import Optional
 from datetime import datetime
 
-from src.models.enums import RAGStrategy, AgentType, EmbeddingModel, RerankingModel, LLMProvider
+from src.models.enums import (
+    RAGStrategy,
+    AgentType,
+    EmbeddingModel,
+    RerankingModel,
+    LLMProvider,
+    VectorBackend,
+    KeywordBackend,
+    VectorSearchMode,
+)
 
 
 class ProjectCreate(BaseModel):
@@ -45,6 +54,13 @@ class ProjectSettingsCreate(BaseModel):
     vector_weight: float = Field(default=0.7, ge=0.0, le=1.0)
     keyword_weight: float = Field(default=0.3, ge=0.0, le=1.0)
     llm_provider: LLMProvider = LLMProvider.OPENAI
+    mmr_enabled: bool = False
+    mmr_lambda: float = Field(default=0.7, ge=0.0, le=1.0)
+    vector_backend: VectorBackend = VectorBackend.PGVECTOR
+    keyword_backend: KeywordBackend = KeywordBackend.POSTGRES
+    vector_search_mode: VectorSearchMode = VectorSearchMode.FULL
+    adaptive_retrieval: bool = False
+    context_compression: bool = False
 
 
 class ProjectSettingsUpdate(BaseModel):
@@ -61,6 +77,13 @@ class ProjectSettingsUpdate(BaseModel):
     vector_weight: Optional[float] = Field(None, ge=0.0, le=1.0)
     keyword_weight: Optional[float] = Field(None, ge=0.0, le=1.0)
     llm_provider: Optional[LLMProvider] = None
+    mmr_enabled: Optional[bool] = None
+    mmr_lambda: Optional[float] = Field(None, ge=0.0, le=1.0)
+    vector_backend: Optional[VectorBackend] = None
+    keyword_backend: Optional[KeywordBackend] = None
+    vector_search_mode: Optional[VectorSearchMode] = None
+    adaptive_retrieval: Optional[bool] = None
+    context_compression: Optional[bool] = None
 
 
 class ProjectSettingsResponse(BaseModel):
@@ -79,6 +102,13 @@ class ProjectSettingsResponse(BaseModel):
     vector_weight: float
     keyword_weight: float
     llm_provider: str
+    mmr_enabled: bool = False
+    mmr_lambda: float = 0.7
+    vector_backend: str = VectorBackend.PGVECTOR.value
+    keyword_backend: str = KeywordBackend.POSTGRES.value
+    vector_search_mode: str = VectorSearchMode.FULL.value
+    adaptive_retrieval: bool = False
+    context_compression: bool = False
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
 
@@ -1,6 +1,26 @@
 from src.services.cache.redis import RedisService, redis_service
+from src.services.cache.embedding_cache import EmbeddingCache, embedding_cache
+from src.services.cache.retrieval_cache import (
+    RetrievalCache,
+    retrieval_cache,
+    bump_document_set_version,
+)
+from src.services.cache.semantic_cache import SemanticAnswerCache, semantic_answer_cache
+from src.services.cache.query_variation_cache import QueryVariationCache, query_variation_cache
+from src.services.cache.document_cache import DocumentMetadataCache, document_cache
 
 __all__ = [
     "RedisService",
-    "redis_service"
+    "redis_service",
+    "EmbeddingCache",
+    "embedding_cache",
+    "RetrievalCache",
+    "retrieval_cache",
+    "bump_document_set_version",
+    "SemanticAnswerCache",
+    "semantic_answer_cache",
+    "QueryVariationCache",
+    "query_variation_cache",
+    "DocumentMetadataCache",
+    "document_cache",
 ]
@@ -0,0 +1,127 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.config import settings
+from src.services.cache.redis import redis_service
+
+
+# project_documents columns kept in the cache
+DOCUMENT_METADATA_COLUMNS: Tuple[str, ...] = (
+    "id",
+    "filename",
+    "project_id",
+    "clerk_id",
+    "processing_status",
+)
+
+
+class DocumentMetadataCache:
+    """
+    Two-tier cache of project_documents metadata (id -> filename, owner, status).
+    
+    A bounded in-process LRU sits in front of Redis. DocumentRepository
+    invalidates both tiers on every write; local entries also expire after
+    DOCUMENT_CACHE_LOCAL_TTL seconds, which bounds how long another process
+    (e.g. a Celery worker changing the status) can leave this one stale.
+    Redis failures are treated as misses.
+    """
+    
+    KEY_PREFIX = "doc:meta:v1"
+    
+    def __init__(
+        self,
+        max_items: Optional[int] = None,
+        ttl: Optional[int] = None,
+        local_ttl: Optional[int] = None,
+        redis=None,
+        enabled: Optional[bool] = None
+    ):
+        self.max_items = max_items or settings.DOCUMENT_CACHE_MAX_ITEMS
+        self.ttl = ttl or settings.DOCUMENT_CACHE_TTL
+        self.local_ttl = local_ttl or settings.DOCUMENT_CACHE_LOCAL_TTL
+        self.redis = redis or redis_service
+        self.enabled = settings.DOCUMENT_CACHE_ENABLED if enabled is None else enabled
+        
+        self._local: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def make_key(self, document_id: str) -> str:
+        return f"{self.KEY_PREFIX}:{document_id}"
+    
+    def get_many(self, document_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Cached metadata for the given documents; misses are simply absent."""
+        if not self.enabled or not document_ids:
+            return {}
+        
+        found: Dict[str, Dict[str, Any]] = {}
+        now = time.monotonic()
+        
+        with self._lock:
+            for document_id in document_ids:
+                entry = self._local.get(document_id)
+                if entry is None:
+                    continue
+                if now - entry[0] > self.local_ttl:
+                    del self._local[document_id]
+                    continue
+                self._local.move_to_end(document_id)
+                found[document_id] = entry[1]
+        
+        missing = [document_id for document_id in document_ids if document_id not in found]
+        if not missing:
+            return found
+        
+        try:
+            values = self.redis.get_many([self.make_key(document_id) for document_id in missing])
+        except Exception as e:
+            print(f"⚠️ Document cache Redis read failed: {e}")
+            return found
+        
+        for document_id, metadata in zip(missing, values):
+            if isinstance(metadata, dict):
+                found[document_id] = metadata
+                self._remember(document_id, metadata)
+        
+        return found
+    
+    def set_many(self, documents: List[Dict[str, Any]]) -> None:
+        """Store metadata rows (extra columns are dropped)."""
+        if not self.enabled:
+            return
+        
+        for document in documents:
+            metadata = {column: document.get(column) for column in DOCUMENT_METADATA_COLUMNS}
+            self._remember(metadata["id"], metadata)
+            try:
+                self.redis.set(self.make_key(metadata["id"]), metadata, expire=self.ttl)
+            except Exception as e:
+                print(f"⚠️ Document cache Redis write failed: {e}")
+    
+    def invalidate(self, document_id: str) -> None:
+        """Drop a document from both tiers. Never raises."""
+        with self._lock:
+            self._local.pop(document_id, None)
+        
+        try:
+            self.redis.delete(self.make_key(document_id))
+        except Exception as e:
+            print(f"⚠️ Document cache Redis delete failed: {e}")
+    
+    def clear_local(self) -> None:
+        """Drop every entry from the in-process tier."""
+        with self._lock:
+            self._local.clear()
+    
+    def _remember(self, document_id: str, metadata: Dict[str, Any]) -> None:
+        """Insert into the local LRU, evicting the oldest entries if full."""
+        with self._lock:
+            self._local[document_id] = (time.monotonic(), metadata)
+            self._local.move_to_end(document_id)
+            while len(self._local) > self.max_items:
+                self._local.popitem(last=False)
+
+
+# Default instance
+document_cache = DocumentMetadataCache()
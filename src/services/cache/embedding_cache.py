@@ -0,0 +1,158 @@
+import asyncio
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from src.config import settings
+from src.services.cache.redis import redis_service
+
+
+class EmbeddingCache:
+    """
+    Two-tier cache for query embeddings.
+    
+    A bounded in-process LRU sits in front of Redis. Vectors are stored as
+    packed float32 bytes in both tiers (4 bytes per dimension instead of a
+    JSON float list). Redis failures are counted and treated as misses so
+    the cache never breaks retrieval.
+    """
+    
+    KEY_PREFIX = "emb:v1"
+    
+    def __init__(
+        self,
+        max_items: Optional[int] = None,
+        ttl: Optional[int] = None,
+        redis=None,
+        enabled: Optional[bool] = None
+    ):
+        self.max_items = max_items or settings.EMBEDDING_CACHE_MAX_ITEMS
+        self.ttl = ttl or settings.EMBEDDING_CACHE_TTL
+        self.redis = redis or redis_service
+        self.enabled = settings.EMBEDDING_CACHE_ENABLED if enabled is None else enabled
+        
+        self._local: "OrderedDict[str, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"local_hits": 0, "redis_hits": 0, "misses": 0, "redis_errors": 0}
+    
+    @staticmethod
+    def normalize(text: str) -> str:
+        """Normalize query text so trivially different inputs share an entry."""
+        return " ".join(text.split()).casefold()
+    
+    def make_key(self, provider: str, model: str, dimensions: int, text: str) -> str:
+        """Build the cache key for a (provider, model, dimensions, text) tuple."""
+        digest = hashlib.sha256(self.normalize(text).encode("utf-8")).hexdigest()
+        return f"{self.KEY_PREFIX}:{provider}:{model}:{dimensions}:{digest}"
+    
+    def get(self, key: str) -> Optional[List[float]]:
+        """Look up a vector, checking the local LRU first and then Redis."""
+        if not self.enabled:
+            return None
+        
+        vector = self._get_local(key)
+        if vector is not None:
+            return vector
+        return self._get_remote(key)
+    
+    async def aget(self, key: str) -> Optional[List[float]]:
+        """Async get; the Redis lookup runs in a worker thread."""
+        if not self.enabled:
+            return None
+        
+        vector = self._get_local(key)
+        if vector is not None:
+            return vector
+        return await asyncio.to_thread(self._get_remote, key)
+    
+    def set(self, key: str, vector: List[float]) -> None:
+        """Store a vector in both tiers."""
+        if not self.enabled:
+            return
+        
+        packed = self._pack(vector)
+        self._remember(key, packed)
+        self._set_remote(key, packed)
+    
+    async def aset(self, key: str, vector: List[float]) -> None:
+        """Async set; the Redis write runs in a worker thread."""
+        if not self.enabled:
+            return
+        
+        packed = self._pack(vector)
+        self._remember(key, packed)
+        await asyncio.to_thread(self._set_remote, key, packed)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters plus the current local size."""
+        with self._lock:
+            stats: Dict[str, Any] = dict(self._stats)
+            stats["local_size"] = len(self._local)
+        
+        lookups = stats["local_hits"] + stats["redis_hits"] + stats["misses"]
+        stats["hit_rate"] = (stats["local_hits"] + stats["redis_hits"]) / lookups if lookups else 0.0
+        return stats
+    
+    def clear_local(self) -> None:
+        """Drop every entry from the in-process tier."""
+        with self._lock:
+            self._local.clear()
+    
+    def _get_local(self, key: str) -> Optional[List[float]]:
+        with self._lock:
+            packed = self._local.get(key)
+            if packed is None:
+                return None
+            self._local.move_to_end(key)
+            self._stats["local_hits"] += 1
+        return self._unpack(packed)
+        
+    def _get_remote(self, key: str) -> Optional[List[float]]:
+        try:
+            packed = self.redis.get_bytes(key)
+        except Exception as e:
+            print(f"⚠️ Embedding cache Redis read failed: {e}")
+            packed = None
+            self._count("redis_errors")
+        
+        if packed is None:
+            self._count("misses")
+            return None
+        
+        self._count("redis_hits")
+        self._remember(key, packed)
+        return self._unpack(packed)
+    
+    def _set_remote(self, key: str, packed: bytes) -> None:
+        try:
+            self.redis.set_bytes(key, packed, expire=self.ttl)
+        except Exception as e:
+            print(f"⚠️ Embedding cache Redis write failed: {e}")
+            self._count("redis_errors")
+    
+    def _remember(self, key: str, packed: bytes) -> None:
+        """Insert into the local LRU, evicting the oldest entries if full."""
+        with self._lock:
+            self._local[key] = packed
+            self._local.move_to_end(key)
+            while len(self._local) > self.max_items:
+                self._local.popitem(last=False)
+    
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._stats[name] += 1
+    
+    @staticmethod
+    def _pack(vector: List[float]) -> bytes:
+        return np.asarray(vector, dtype=np.float32).tobytes()
+    
+    @staticmethod
+    def _unpack(packed: bytes) -> List[float]:
+        return np.frombuffer(packed, dtype=np.float32).tolist()
+
+
+# Default instance
+embedding_cache = EmbeddingCache()
@@ -0,0 +1,60 @@
+import hashlib
+from typing import List, Optional
+
+from src.config import settings as app_settings
+from src.services.cache.redis import redis_service
+from src.services.cache.embedding_cache import EmbeddingCache
+
+
+class QueryVariationCache:
+    """
+    Cache of LLM-generated query variations keyed by (model, query, n).
+    
+    Variations only depend on the question and the model that wrote them,
+    not on the project's documents, so entries are shared across projects.
+    Redis failures are treated as misses.
+    """
+    
+    KEY_PREFIX = "rag:variations:v1"
+    
+    def __init__(
+        self,
+        redis=None,
+        ttl: Optional[int] = None,
+        enabled: Optional[bool] = None
+    ):
+        self.redis = redis or redis_service
+        self.ttl = ttl or app_settings.QUERY_VARIATION_CACHE_TTL
+        self.enabled = app_settings.QUERY_VARIATION_CACHE_ENABLED if enabled is None else enabled
+    
+    def make_key(self, model: str, query: str, num_queries: int) -> str:
+        """Build the cache key for a (model, query, n) tuple."""
+        digest = hashlib.sha256(EmbeddingCache.normalize(query).encode("utf-8")).hexdigest()
+        return f"{self.KEY_PREFIX}:{model}:{num_queries}:{digest}"
+    
+    def get(self, model: str, query: str, num_queries: int) -> Optional[List[str]]:
+        """Cached variations (original query excluded), or None on a miss."""
+        if not self.enabled:
+            return None
+        
+        try:
+            cached = self.redis.get(self.make_key(model, query, num_queries))
+        except Exception as e:
+            print(f"⚠️ Query variation cache read failed: {e}")
+            return None
+        
+        return cached if isinstance(cached, list) else None
+    
+    def set(self, model: str, query: str, num_queries: int, variations: List[str]) -> None:
+        """Store generated variations (original query excluded)."""
+        if not self.enabled:
+            return
+        
+        try:
+            self.redis.set(self.make_key(model, query, num_queries), variations, expire=self.ttl)
+        except Exception as e:
+            print(f"⚠️ Query variation cache write failed: {e}")
+
+
+# Default instance
+query_variation_cache = QueryVariationCache()
@@ -1,5 +1,5 @@
 import json
-from typing import Any, Optional
+from typing import Any, List, Optional
 
 import redis
 
@@ -12,6 +12,7 @@ class RedisService:
     def __init__(self, url: Optional[str] = None):
         self.url = url or settings.REDIS_URL
         self._client: Optional[redis.Redis] = None  # type: ignore
+        self._binary_client: Optional[redis.Redis] = None  # type: ignore
     
     @property
     def client(self) -> redis.Redis:  # type: ignore
@@ -20,15 +21,16 @@ class RedisService:
             self._client = redis.from_url(self.url, decode_responses=True)
         return self._client
     
+    @property
+    def binary_client(self) -> redis.Redis:  # type: ignore
+        """Lazy-loaded Redis client that returns raw bytes (no decoding)."""
+        if self._binary_client is None:
+            self._binary_client = redis.from_url(self.url, decode_responses=False)
+        return self._binary_client
+    
     def get(self, key: str) -> Optional[Any]:
         """Get value from cache."""
-        value = self.client.get(key)
-        if value:
-            try:
-                return json.loads(value)  # type: ignore
-            except json.JSONDecodeError:
-                return value
-        return None
+        return self._decode(self.client.get(key))
     
     def set(
         self,
@@ -42,6 +44,43 @@ class RedisService:
         
         return bool(self.client.set(key, value, ex=expire))
     
+    def get_many(self, keys: List[str]) -> List[Optional[Any]]:
+        """Get several values in one round trip, decoded like get (None for missing keys)."""
+        if not keys:
+            return []
+        return [self._decode(value) for value in self.client.mget(keys)]  # type: ignore
+    
+    @staticmethod
+    def _decode(value: Any) -> Optional[Any]:
+        """JSON-decode a stored value, falling back to the raw string."""
+        if value:
+            try:
+                return json.loads(value)
+            except json.JSONDecodeError:
+                return value
+        return None
+    
+    def get_bytes(self, key: str) -> Optional[bytes]:
+        """Get a raw binary value from cache."""
+        return self.binary_client.get(key)  # type: ignore
+    
+    def set_bytes(
+        self,
+        key: str,
+        value: bytes,
+        expire: Optional[int] = None
+    ) -> bool:
+        """Set a raw binary value in cache with optional expiration."""
+        return bool(self.binary_client.set(key, value, ex=expire))
+    
+    def append_bytes(self, key: str, value: bytes) -> int:
+        """Atomically append raw bytes to a key, returning the new length."""
+        return int(self.binary_client.append(key, value))  # type: ignore
+    
+    def get_range_bytes(self, key: str, start: int, end: int = -1) -> bytes:
+        """Get a byte range of a raw binary value (empty if out of range)."""
+        return self.binary_client.getrange(key, start, end) or b""  # type: ignore
+    
     def delete(self, key: str) -> bool:
         """Delete key from cache."""
         return bool(self.client.delete(key))
@@ -50,10 +89,26 @@ class RedisService:
         """Check if key exists in cache."""
         return bool(self.client.exists(key))
     
+    def incr(self, key: str, amount: int = 1) -> int:
+        """Atomically increment an integer key (created at 0 if missing)."""
+        return int(self.client.incr(key, amount))  # type: ignore
+    
     def set_hash(self, name: str, mapping: dict) -> bool:
         """Set hash values."""
         return bool(self.client.hset(name, mapping=mapping))  # type: ignore
     
+    def get_hash_field(self, name: str, key: str) -> Optional[str]:
+        """Get a single hash field."""
+        return self.client.hget(name, key)  # type: ignore
+    
+    def expire(self, key: str, seconds: int) -> bool:
+        """Set a key's time to live."""
+        return bool(self.client.expire(key, seconds))
+    
+    def lock(self, name: str, timeout: int = 60):
+        """Distributed lock (use as a context manager)."""
+        return self.client.lock(name, timeout=timeout)
+    
     def ping(self) -> bool:
         """Check Redis connection."""
         try:
@@ -0,0 +1,147 @@
+import hashlib
+import json
+from typing import Any, Dict, List, Optional
+
+from src.config import settings as app_settings
+from src.services.cache.redis import redis_service
+from src.services.cache.embedding_cache import EmbeddingCache
+
+
+# Project settings that change what _retrieve returns
+RETRIEVAL_SETTING_KEYS = (
+    "rag_strategy",
+    "similarity_threshold",
+    "chunks_per_search",
+    "number_of_queries",
+    "vector_weight",
+    "keyword_weight",
+    "llm_provider",
+    "vector_backend",
+    "keyword_backend",
+    "vector_search_mode",
+    "adaptive_retrieval",
+    # Bound the fused candidate pool for multi-query strategies
+    "final_context_size",
+    "reranking_enabled",
+    "reranking_model",
+    "mmr_enabled",
+)
+
+
+class RetrievalCache:
+    """
+    Cache of retrieval results keyed on the project's document-set version.
+    
+    Every project has an integer document-set version in Redis. It is bumped
+    whenever a document finishes processing or is deleted, which moves all
+    readers onto fresh keys; stale entries simply age out via their TTL.
+    """
+    
+    KEY_PREFIX = "rag:retrieval:v1"
+    VERSION_PREFIX = "rag:docset"
+    
+    def __init__(
+        self,
+        redis=None,
+        ttl: Optional[int] = None,
+        enabled: Optional[bool] = None
+    ):
+        self.redis = redis or redis_service
+        self.ttl = ttl or app_settings.RETRIEVAL_CACHE_TTL
+        self.enabled = app_settings.RETRIEVAL_CACHE_ENABLED if enabled is None else enabled
+    
+    def get_version(self, project_id: str) -> int:
+        """Current document-set version for a project (0 if never bumped)."""
+        return int(self.redis.get(f"{self.VERSION_PREFIX}:{project_id}:version") or 0)
+    
+    def bump_version(self, project_id: str) -> int:
+        """Invalidate every cached retrieval for a project."""
+        version = self.redis.incr(f"{self.VERSION_PREFIX}:{project_id}:version")
+        print(f"🔄 Document set version for project {project_id} is now {version}")
+        return version
+    
+    def make_key(
+        self,
+        project_id: str,
+        version: int,
+        query: str,
+        settings: Dict[str, Any]
+    ) -> str:
+        """Build the cache key for a query under the given settings."""
+        fingerprint = json.dumps(
+            {
+                "query": EmbeddingCache.normalize(query),
+                "settings": {key: settings.get(key) for key in RETRIEVAL_SETTING_KEYS},
+            },
+            sort_keys=True,
+            default=str
+        )
+        digest = hashlib.sha256(fingerprint.encode("utf-8")).hexdigest()
+        return f"{self.KEY_PREFIX}:{project_id}:{version}:{digest}"
+    
+    def key_for(
+        self,
+        project_id: Optional[str],
+        query: str,
+        settings: Dict[str, Any]
+    ) -> Optional[str]:
+        """
+        Key of this query under the project's current document-set version.
+        
+        Resolve it once before retrieving and use it for both get and set,
+        so a version bump that lands during retrieval cannot file chunks
+        from the old corpus under the new version.
+        
+        Returns:
+            The cache key, or None if caching is off or the version is unavailable
+        """
+        if not self.enabled or not project_id:
+            return None
+        
+        try:
+            return self.make_key(project_id, self.get_version(project_id), query, settings)
+        except Exception as e:
+            print(f"⚠️ Retrieval cache read failed: {e}")
+            return None
+    
+    def get(self, key: Optional[str]) -> Optional[List[Dict[str, Any]]]:
+        """Return cached chunks for a key from key_for, or None on a miss."""
+        if not key:
+            return None
+        
+        try:
+            cached = self.redis.get(key)
+        except Exception as e:
+            print(f"⚠️ Retrieval cache read failed: {e}")
+            return None
+        
+        return cached if isinstance(cached, list) else None
+    
+    def set(self, key: Optional[str], chunks: List[Dict[str, Any]]) -> None:
+        """Store retrieved chunks under a key from key_for."""
+        if not key:
+            return
+        
+        try:
+            self.redis.set(key, chunks, expire=self.ttl)
+        except Exception as e:
+            print(f"⚠️ Retrieval cache write failed: {e}")
+
+
+# Default instance
+retrieval_cache = RetrievalCache()
+
+
+def bump_document_set_version(project_id: Optional[str]) -> None:
+    """
+    Mark a project's document set as changed.
+    
+    Never raises: a Redis outage must not fail ingestion or deletion.
+    """
+    if not project_id:
+        return
+    
+    try:
+        retrieval_cache.bump_version(project_id)
+    except Exception as e:
+        print(f"⚠️ Failed to bump document set version for {project_id}: {e}")
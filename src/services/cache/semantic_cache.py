@@ -0,0 +1,164 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from src.config import settings as app_settings
+from src.services.cache.redis import redis_service
+from src.services.cache.retrieval_cache import retrieval_cache, RETRIEVAL_SETTING_KEYS
+
+
+# Project settings that change the generated answer on top of retrieval
+ANSWER_SETTING_KEYS = RETRIEVAL_SETTING_KEYS + ("agent_type", "mmr_lambda", "context_compression")
+
+
+class SemanticAnswerCache:
+    """
+    Per-project cache of final answers, matched by query embedding similarity.
+    
+    Each namespace (project, document-set version, embedding model and
+    answer-relevant settings) owns two Redis keys:
+    - ``<ns>:vectors``: normalized float32 query vectors appended row by row
+    - ``<ns>:entries``: hash of row index -> answer payload
+    
+    Workers keep a local copy of the vector matrix and only fetch rows
+    appended since their last sync, so a lookup is one small GETRANGE, a
+    matrix-vector product and (on a hit) one HGET. Bumping the document-set
+    version moves readers to a fresh namespace.
+    """
+    
+    KEY_PREFIX = "rag:answers:v1"
+    MAX_LOCAL_NAMESPACES = 64
+    
+    def __init__(
+        self,
+        threshold: Optional[float] = None,
+        max_entries: Optional[int] = None,
+        ttl: Optional[int] = None,
+        redis=None,
+        enabled: Optional[bool] = None
+    ):
+        self.threshold = app_settings.SEMANTIC_CACHE_THRESHOLD if threshold is None else threshold
+        self.max_entries = max_entries or app_settings.SEMANTIC_CACHE_MAX_ENTRIES
+        self.ttl = ttl or app_settings.SEMANTIC_CACHE_TTL
+        self.redis = redis or redis_service
+        self.enabled = app_settings.SEMANTIC_CACHE_ENABLED if enabled is None else enabled
+        
+        self._local: "OrderedDict[str, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def namespace(self, project_id: str, model: str, settings: Dict[str, Any]) -> str:
+        """Build the namespace for a project's current document set and settings."""
+        fingerprint = json.dumps(
+            {key: settings.get(key) for key in ANSWER_SETTING_KEYS},
+            sort_keys=True,
+            default=str
+        )
+        digest = hashlib.sha256(f"{model}|{fingerprint}".encode("utf-8")).hexdigest()[:16]
+        version = retrieval_cache.get_version(project_id)
+        return f"{self.KEY_PREFIX}:{project_id}:{version}:{digest}"
+    
+    def lookup(self, namespace: str, query_embedding: List[float]) -> Optional[Dict[str, Any]]:
+        """
+        Find the most similar cached answer above the threshold.
+        
+        Returns:
+            Payload dict (query, answer, citations, similarity) or None
+        """
+        if not self.enabled:
+            return None
+        
+        query = self._normalize(query_embedding)
+        matrix = self._sync(namespace, len(query))
+        if matrix is None or not len(matrix):
+            return None
+        
+        scores = matrix @ query
+        best = int(np.argmax(scores))
+        similarity = float(scores[best])
+        if similarity < self.threshold:
+            return None
+        
+        raw = self.redis.get_hash_field(f"{namespace}:entries", str(best))
+        if not raw:
+            return None
+        
+        payload = json.loads(raw)
+        if payload.get("row_digest") != self._digest(matrix[best].tobytes()):
+            # Redis key was rebuilt under us; rows no longer line up
+            with self._lock:
+                self._local.pop(namespace, None)
+            return None
+        
+        payload["similarity"] = similarity
+        return payload
+    
+    def store(
+        self,
+        namespace: str,
+        query: str,
+        query_embedding: List[float],
+        answer: str,
+        citations: List[Dict[str, Any]]
+    ) -> None:
+        """Append an answer to the namespace (skipped once it is full)."""
+        if not self.enabled or not answer:
+            return
+        
+        row_bytes = self._normalize(query_embedding).tobytes()
+        matrix = self._sync(namespace, len(query_embedding))
+        if matrix is not None and len(matrix) >= self.max_entries:
+            return
+        
+        vectors_key = f"{namespace}:vectors"
+        entries_key = f"{namespace}:entries"
+        
+        # APPEND is atomic, so its returned length gives this entry's row
+        row = self.redis.append_bytes(vectors_key, row_bytes) // len(row_bytes) - 1
+        self.redis.set_hash(entries_key, {
+            str(row): json.dumps({
+                "query": query,
+                "answer": answer,
+                "citations": citations,
+                "row_digest": self._digest(row_bytes),
+            })
+        })
+        self.redis.expire(vectors_key, self.ttl)
+        self.redis.expire(entries_key, self.ttl)
+    
+    def _sync(self, namespace: str, dimensions: int) -> Optional[np.ndarray]:
+        """Fetch rows appended since the last sync and return the full matrix."""
+        row_size = dimensions * 4
+        
+        with self._lock:
+            local = self._local.get(namespace, b"")
+        
+        fresh = self.redis.get_range_bytes(f"{namespace}:vectors", len(local), -1)
+        buffer = local + fresh
+        if len(buffer) % row_size:
+            return None
+        
+        with self._lock:
+            self._local[namespace] = buffer
+            self._local.move_to_end(namespace)
+            while len(self._local) > self.MAX_LOCAL_NAMESPACES:
+                self._local.popitem(last=False)
+        
+        return np.frombuffer(buffer, dtype=np.float32).reshape(-1, dimensions)
+    
+    @staticmethod
+    def _normalize(vector: List[float]) -> np.ndarray:
+        array = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(array)
+        return array / norm if norm else array
+    
+    @staticmethod
+    def _digest(row_bytes: bytes) -> str:
+        return hashlib.sha1(row_bytes).hexdigest()[:12]
+
+
+# Default instance
+semantic_answer_cache = SemanticAnswerCache()
@@ -1,5 +1,10 @@
 from typing import Optional, Dict, Any
 from src.services.database.repositories.base import BaseRepository
+from src.services.database.repositories.document_repo import DocumentRepository
+
+
+# Chunk columns returned to the API
+CHUNK_COLUMNS = "id, document_id, content, chunk_index, page_number, char_count, type, original_content"
 
 
 class ChunkRepository(BaseRepository):
@@ -7,6 +12,7 @@ class ChunkRepository(BaseRepository):
     
     def __init__(self):
         super().__init__("document_chunks")
+        self.documents = DocumentRepository()
     
     def get_chunk_with_document(
         self,
@@ -16,7 +22,8 @@ class ChunkRepository(BaseRepository):
         """
         Get chunk details with associated document info.
         
-        Joins with documents table to get filename and verify ownership.
+        The filename and owner come from the document metadata cache
+        instead of a join on project_documents.
         
         Args:
             chunk_id: The chunk ID to fetch
@@ -26,30 +33,24 @@ class ChunkRepository(BaseRepository):
             Chunk data with document info, or None if not found/unauthorized
         """
         result = self.db.table(self.table_name) \
-            .select("""
-                id,
-                document_id,
-                content,
-                chunk_index,
-                page_number,
-                char_count,
-                type,
-                original_content,
-                project_documents!inner(filename, clerk_id)
-            """) \
+            .select(CHUNK_COLUMNS) \
             .eq("id", chunk_id) \
-            .single() \
             .execute()
         
         if not result.data:
             return None
         
-        chunk = result.data
+        chunk = result.data[0]
+        document = self.documents.get_metadata([chunk["document_id"]]).get(chunk["document_id"])
         
         # Verify user owns this document
-        if chunk["project_documents"]["clerk_id"] != clerk_id:
+        if not document or document["clerk_id"] != clerk_id:
             return None
         
+        chunk["project_documents"] = {
+            "filename": document["filename"],
+            "clerk_id": document["clerk_id"]
+        }
         return chunk
     
     def get_chunks_by_document(
@@ -67,32 +68,18 @@ class ChunkRepository(BaseRepository):
         Returns:
             List of chunks ordered by chunk_index
         """
+        # Verify document ownership before fetching any chunk
+        document = self.documents.get_metadata([document_id]).get(document_id)
+        if not document or document["clerk_id"] != clerk_id:
+            return []
+        
         result = self.db.table(self.table_name) \
-            .select("""
-                id,
-                document_id,
-                content,
-                chunk_index,
-                page_number,
-                char_count,
-                type,
-                original_content,
-                project_documents!inner(clerk_id)
-            """) \
+            .select(CHUNK_COLUMNS) \
             .eq("document_id", document_id) \
             .order("chunk_index", desc=False) \
             .execute()
         
-        if not result.data:
-            return []
-        
-        # Filter by clerk_id (document ownership)
-        chunks = [
-            chunk for chunk in result.data
-            if chunk["project_documents"]["clerk_id"] == clerk_id
-        ]
-        
-        return chunks
+        return result.data or []
 
 
 # Singleton instance
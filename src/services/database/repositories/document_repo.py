@@ -2,13 +2,69 @@ from typing import Optional, Dict, Any, List
 
 from src.services.database.repositories.base import BaseRepository
 from src.models.enums import ProcessingStatus
+from src.core.vector_math import parse_vector
+from src.services.cache.document_cache import document_cache, DOCUMENT_METADATA_COLUMNS
+from src.services.storage.asset_store import asset_store
 
 
 class DocumentRepository(BaseRepository):
-    """Repository for document operations."""
+    """
+    Repository for document operations.
+    
+    Writes go through create/update/delete, which keep the document
+    metadata cache in step.
+    """
     
     def __init__(self):
         super().__init__("project_documents")
+        self.cache = document_cache
+    
+    def create(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Create a document and cache its metadata."""
+        document = super().create(data)
+        self.cache.invalidate(document["id"])
+        self.cache.set_many([document])
+        return document
+    
+    def update(
+        self,
+        id: str,
+        data: Dict[str, Any],
+        clerk_id: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Update a document, invalidating its cached metadata."""
+        document = super().update(id, data, clerk_id)
+        self.cache.invalidate(id)
+        return document
+    
+    def delete(self, id: str, clerk_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Delete a document, invalidating its cached metadata."""
+        document = super().delete(id, clerk_id)
+        self.cache.invalidate(id)
+        return document
+    
+    def get_metadata(self, document_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Get id, filename, project_id, clerk_id and processing_status of documents.
+        
+        Served from the document metadata cache; misses are fetched with a
+        single query and cached. Unknown ids are absent from the result.
+        """
+        document_ids = list(dict.fromkeys(document_ids))
+        metadata = self.cache.get_many(document_ids)
+        
+        missing = [document_id for document_id in document_ids if document_id not in metadata]
+        if missing:
+            result = self.db.table(self.table_name)\
+                .select(", ".join(DOCUMENT_METADATA_COLUMNS))\
+                .in_("id", missing)\
+                .execute()
+            
+            rows = result.data or []
+            self.cache.set_many(rows)
+            metadata.update({row["id"]: row for row in rows})
+        
+        return metadata
     
     def get_by_project(
         self,
@@ -32,6 +88,16 @@ class DocumentRepository(BaseRepository):
         
         return [doc["id"] for doc in result.data] if result.data else [] 
     
+    def get_completed_documents(self, project_id: str) -> List[Dict[str, Any]]:
+        """Get id and filename of every fully processed document in a project."""
+        result = self.db.table(self.table_name)\
+            .select("id, filename")\
+            .eq("project_id", project_id)\
+            .eq("processing_status", ProcessingStatus.COMPLETED.value)\
+            .execute()
+        
+        return result.data or []
+    
     def update_status(
         self,
         document_id: str,
@@ -81,19 +147,52 @@ class DocumentChunkRepository(BaseRepository):
         
         return result.data or []
     
+    def get_index_rows(self, document_id: str, with_embedding: bool = True) -> List[Dict[str, Any]]:
+        """Get a document's chunks (optionally with embeddings), without the generated fts column."""
+        columns = "id, document_id, content, chunk_index, page_number, char_count, type, original_content"
+        result = self.db.table(self.table_name)\
+            .select(f"{columns}, embedding" if with_embedding else columns)\
+            .eq("document_id", document_id)\
+            .order("chunk_index")\
+            .execute()
+        
+        return result.data or []
+    
+    def get_embeddings(self, chunk_ids: List[str]) -> Dict[str, List[float]]:
+        """Get embeddings for a set of chunks, keyed by chunk ID."""
+        result = self.db.table(self.table_name)\
+            .select("id, embedding")\
+            .in_("id", chunk_ids)\
+            .execute()
+        
+        return {
+            row["id"]: parse_vector(row["embedding"])
+            for row in result.data or []
+            if row.get("embedding") is not None
+        }
+    
     def insert_chunk(self, chunk_data: Dict[str, Any]) -> Dict[str, Any]:
         """Insert a single chunk."""
         return self.create(chunk_data)
     
     def insert_chunks_batch(self, chunks: List[Dict[str, Any]]) -> List[str]:
         """Insert multiple chunks in batch."""
-        stored_ids = []
+        return [row["id"] for row in self.upsert_chunks(chunks)]
+        
+    def upsert_chunks(self, chunks: List[Dict[str, Any]], batch_size: int = 100) -> List[Dict[str, Any]]:
+        """Insert or update chunks with one request per batch; returns the stored rows."""
+        stored = []
         
-        for chunk in chunks:
-            result = self.create(chunk)
-            stored_ids.append(result["id"])
+        for start in range(0, len(chunks), batch_size):
+            result = self.db.table(self.table_name)\
+                .upsert(chunks[start:start + batch_size])\
+                .execute()
+            
+            if not result.data:
+                raise Exception(f"Failed to upsert chunks into {self.table_name}")
+            stored.extend(result.data)
         
-        return stored_ids
+        return stored
     
     def delete_by_document(self, document_id: str) -> int:
         """Delete all chunks for a document."""
@@ -103,3 +202,47 @@ class DocumentChunkRepository(BaseRepository):
             .execute()
         
         return len(result.data) if result.data else 0
+
+    def get_image_refs(self, document_id: str) -> List[str]:
+        """Get the asset references of every image in a document's chunks."""
+        result = self.db.table(self.table_name)\
+            .select("image_refs:original_content->image_refs")\
+            .eq("document_id", document_id)\
+            .execute()
+        
+        refs = [ref for row in result.data or [] for ref in row.get("image_refs") or []]
+        return list(dict.fromkeys(refs))
+    
+    def get_referenced_image_refs(self, refs: List[str]) -> set:
+        """Subset of refs still referenced by at least one chunk."""
+        if not refs:
+            return set()
+        
+        result = self.db.rpc("referenced_image_refs", {"refs": refs}).execute()
+        return {row["ref"] for row in result.data or []}
+    
+    def release_image_assets(self, refs: List[str]) -> int:
+        """
+        Delete the image assets that no chunk references any more.
+        
+        Call after the chunks that used refs were deleted or replaced. An
+        ingest of another document running concurrently can upload the same
+        image after the reference check; that asset is then lost and its
+        image is dropped from answers until the document is re-ingested.
+        
+        Returns:
+            Number of assets deleted
+        """
+        if not refs or not asset_store.enabled:
+            return 0
+        
+        try:
+            referenced = self.get_referenced_image_refs(refs)
+        except Exception as e:
+            print(f"⚠️ Image asset reference check failed, keeping assets: {e}")
+            return 0
+        
+        deleted = asset_store.delete([ref for ref in refs if ref not in referenced])
+        if deleted:
+            print(f"🗑️ Deleted {deleted} unreferenced image assets")
+        return deleted
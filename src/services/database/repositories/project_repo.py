@@ -1,7 +1,7 @@
 from typing import Optional, Dict, Any, List
 
 from src.services.database.repositories.base import BaseRepository
-from src.models.enums import RAGStrategy, AgentType, EmbeddingModel, RerankingModel
+from src.models.enums import RAGStrategy, AgentType, EmbeddingModel, RerankingModel, VectorBackend, KeywordBackend, VectorSearchMode
 
 
 class ProjectRepository(BaseRepository):
@@ -56,6 +56,13 @@ class ProjectSettingsRepository(BaseRepository):
             "reranking_model": RerankingModel.RERANKER_ENGLISH_V3.value,
             "vector_weight": 0.7,
             "keyword_weight": 0.3,
+            "mmr_enabled": False,
+            "mmr_lambda": 0.7,
+            "vector_backend": VectorBackend.PGVECTOR.value,
+            "keyword_backend": KeywordBackend.POSTGRES.value,
+            "vector_search_mode": VectorSearchMode.FULL.value,
+            "adaptive_retrieval": False,
+            "context_compression": False,
         }
         
         return self.create(default_settings)
@@ -3,11 +3,14 @@ from typing import List, Dict, Any, Optional
 
 from langchain_core.messages import HumanMessage
 
+from src.config import settings
+from src.core.vector_math import to_matrix, truncate_rows
 from src.models.enums import SourceType, ProcessingStatus
 from src.services.document.parser import DocumentParser
 from src.services.document.chunker import DocumentChunker
 from src.services.llm.embeddings import embedding_service
 from src.services.llm.chat import chat_service
+from src.services.storage.asset_store import asset_store
 
 
 class DocumentProcessor:
@@ -97,7 +100,12 @@ class DocumentProcessor:
             if content_data["tables"]:
                 original_content["tables"] = content_data["tables"]
             if content_data["images"]:
-                original_content["images"] = content_data["images"]
+                # Rows keep references; the images go to the asset store
+                image_refs = asset_store.put_images(content_data["images"])
+                if image_refs is None:
+                    original_content["images"] = content_data["images"]
+                else:
+                    original_content["image_refs"] = image_refs
             
             # Create processed chunk
             processed_chunk = {
@@ -120,14 +128,24 @@ class DocumentProcessor:
         """
         Generate embeddings for processed chunks.
         
+        Also stores the normalized EMBEDDING_SHORT_DIMENSIONS prefix of each
+        embedding as "embedding_short" (first-pass index for matryoshka search).
+        
         Returns:
             Processed chunks with embeddings added
         """
         texts = [chunk["content"] for chunk in processed_chunks]
         embeddings = embedding_service.embed_batch(texts, batch_size)
         
-        for chunk, embedding in zip(processed_chunks, embeddings):
+        short_dimensions = settings.EMBEDDING_SHORT_DIMENSIONS
+        short_embeddings = None
+        if embeddings and 0 < short_dimensions < len(embeddings[0]):
+            short_embeddings = truncate_rows(to_matrix(embeddings), short_dimensions).tolist()
+        
+        for i, (chunk, embedding) in enumerate(zip(processed_chunks, embeddings)):
             chunk["embedding"] = embedding
+            if short_embeddings is not None:
+                chunk["embedding_short"] = short_embeddings[i]
         
         return processed_chunks
     
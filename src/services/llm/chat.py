@@ -25,6 +25,15 @@ class ChatService:
         """Generate a chat completion."""
         return self.provider.chat(messages, temperature, **kwargs)
     
+    async def achat(
+        self,
+        messages: List[dict],
+        temperature: float = 0,
+        **kwargs
+    ) -> str:
+        """Generate a chat completion without blocking the event loop."""
+        return await self.provider.achat(messages, temperature, **kwargs)
+    
     def chat_with_structured_output(
         self,
         messages: List[dict],
@@ -59,7 +68,28 @@ class ChatService:
             - OpenAI: Works with gpt-4o, gpt-4o-mini
             - Ollama: Requires vision model (e.g., llava, qwen2-vl)
         """
+        return self.provider.invoke_with_images(
+            self._multimodal_messages(system_prompt, user_query, images)
+        )
         
+    async def ainvoke_multimodal(
+        self,
+        system_prompt: str,
+        user_query: str,
+        images: Optional[List[str]] = None
+    ) -> str:
+        """Async invoke_multimodal."""
+        return await self.provider.ainvoke_with_images(
+            self._multimodal_messages(system_prompt, user_query, images)
+        )
+    
+    @staticmethod
+    def _multimodal_messages(
+        system_prompt: str,
+        user_query: str,
+        images: Optional[List[str]] = None
+    ) -> List[BaseMessage]:
+        """System message plus a user message carrying the images, if any."""
         if images:
             # Multi-modal message with images
             content_parts = [{"type": "text", "text": user_query}]
@@ -79,12 +109,10 @@ class ChatService:
             # Text-only message
             user_message = HumanMessage(content=user_query)
         
-        messages: List[BaseMessage] = [
+        return [
             SystemMessage(content=system_prompt),
             user_message
         ]
-        
-        return self.provider.invoke_with_images(messages)
 
 
 @lru_cache
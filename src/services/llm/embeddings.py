@@ -2,6 +2,7 @@ from typing import List
 from functools import lru_cache
 
 from src.services.llm.factory import get_embeddings
+from src.services.cache.embedding_cache import embedding_cache
 from src.config import settings
 
 
@@ -10,16 +11,61 @@ class EmbeddingService:
     
     def __init__(self, model: str = None, dimensions: int = None):
         self.provider = get_embeddings(model=model)
+        self.provider_name = settings.LLM_PROVIDER
         self.dimensions = dimensions or settings.active_embedding_dimensions
+        self.cache = embedding_cache
     
     def embed_query(self, text: str) -> List[float]:
-        """Generate embedding for a single query."""
-        return self.provider.embed_query(text)
+        """Generate embedding for a single query (served from cache when possible)."""
+        key = self._cache_key(text)
+        
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        
+        embedding = self.provider.embed_query(text)
+        self.cache.set(key, embedding)
+        return embedding
+    
+    async def aembed_query(self, text: str) -> List[float]:
+        """Async embed_query; neither Redis nor the provider blocks the event loop."""
+        key = self._cache_key(text)
+        
+        cached = await self.cache.aget(key)
+        if cached is not None:
+            return cached
+        
+        embedding = await self.provider.aembed_query(text)
+        await self.cache.aset(key, embedding)
+        return embedding
+    
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        """
+        Generate embeddings for several queries with one provider call.
+        
+        Cached queries are served from the query cache; only the misses are
+        sent to the provider, batched into a single embed_documents call.
+        """
+        keys = [self._cache_key(text) for text in texts]
+        embeddings = [self.cache.get(key) for key in keys]
+        
+        missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
+        if missing:
+            fresh = self.provider.embed_documents([texts[i] for i in missing])
+            for i, embedding in zip(missing, fresh):
+                self.cache.set(keys[i], embedding)
+                embeddings[i] = embedding
+        
+        return embeddings
     
     def embed_documents(self, texts: List[str]) -> List[List[float]]:
         """Generate embeddings for multiple documents."""
         return self.provider.embed_documents(texts)
     
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Async embed_documents."""
+        return await self.provider.aembed_documents(texts)
+    
     def embed_batch(
         self,
         texts: List[str],
@@ -28,6 +74,14 @@ class EmbeddingService:
         """Generate embeddings in batches."""
         return self.provider.embed_batch(texts, batch_size)
 
+    def _cache_key(self, text: str) -> str:
+        return self.cache.make_key(
+            self.provider_name,
+            self.provider.model,
+            self.dimensions,
+            text
+        )
+
 
 @lru_cache
 def get_embedding_service() -> EmbeddingService:
@@ -36,4 +90,4 @@ def get_embedding_service() -> EmbeddingService:
 
 
 # Default instance
-embedding_service = get_embedding_service()
\ No newline at end of file
+embedding_service = get_embedding_service()
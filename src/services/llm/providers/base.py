@@ -1,3 +1,4 @@
+import asyncio
 from abc import ABC, abstractmethod
 from typing import List, Optional, Any
 
@@ -27,6 +28,20 @@ class BaseLLMProvider(ABC):
         """Generate a chat completion with structured output."""
         pass
 
+    async def achat(
+        self,
+        messages: List[dict],
+        temperature: float = 0,
+        max_tokens: Optional[int] = None,
+        **kwargs
+    ) -> str:
+        """Async chat completion (runs chat in a worker thread unless overridden)."""
+        return await asyncio.to_thread(self.chat, messages, temperature, max_tokens, **kwargs)
+    
+    async def ainvoke_with_images(self, messages: List[Any]) -> str:
+        """Async multi-modal invocation (worker thread unless overridden)."""
+        return await asyncio.to_thread(self.invoke_with_images, messages)
+
 
 class BaseEmbeddingProvider(ABC):
     """Abstract base class for embedding providers."""
@@ -40,3 +55,11 @@ class BaseEmbeddingProvider(ABC):
     def embed_documents(self, texts: List[str]) -> List[List[float]]:
         """Generate embeddings for multiple documents."""
         pass
+
+    async def aembed_query(self, text: str) -> List[float]:
+        """Async query embedding (worker thread unless overridden)."""
+        return await asyncio.to_thread(self.embed_query, text)
+    
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Async document embeddings (worker thread unless overridden)."""
+        return await asyncio.to_thread(self.embed_documents, texts)
@@ -39,6 +39,18 @@ class OpenAIProvider(BaseLLMProvider):
         response = self.llm.invoke(langchain_messages, **invoke_kwargs)
         return response.content
     
+    async def achat(
+        self,
+        messages: List[dict],
+        temperature: float = 0,
+        max_tokens: Optional[int] = None,
+        **kwargs
+    ) -> str:
+        """Generate a chat completion without blocking the event loop."""
+        invoke_kwargs = {"max_tokens": max_tokens} if max_tokens else {}
+        response = await self.llm.ainvoke(self._convert_messages(messages), **invoke_kwargs)
+        return response.content
+    
     def chat_with_structured_output(
         self,
         messages: List[dict],
@@ -59,6 +71,14 @@ class OpenAIProvider(BaseLLMProvider):
         response = self.llm.invoke(messages)
         return response.content
     
+    async def ainvoke_with_images(
+        self,
+        messages: List[Any]
+    ) -> str:
+        """Async multi-modal invocation."""
+        response = await self.llm.ainvoke(messages)
+        return response.content
+    
     def _convert_messages(self, messages: List[dict]) -> List:
         """Convert dict messages to LangChain message objects."""
         langchain_messages = []
@@ -100,6 +120,14 @@ class OpenAIEmbeddingProvider(BaseEmbeddingProvider):
         """Generate embeddings for multiple documents."""
         return self.embeddings.embed_documents(texts)
     
+    async def aembed_query(self, text: str) -> List[float]:
+        """Generate embedding for a single query without blocking the event loop."""
+        return await self.embeddings.aembed_query(text)
+    
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Generate embeddings for multiple documents without blocking the event loop."""
+        return await self.embeddings.aembed_documents(texts)
+    
     def embed_batch(
         self,
         texts: List[str],
@@ -1,3 +1,4 @@
 from src.services.storage.s3 import S3Service
+from src.services.storage.asset_store import AssetStore, asset_store
 
-__all__ = ["S3Service"]
+__all__ = ["S3Service", "AssetStore", "asset_store"]
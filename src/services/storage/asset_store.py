@@ -0,0 +1,204 @@
+import base64
+import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from src.config import settings
+
+
+class AssetStore:
+    """
+    Content-addressed store for images extracted from documents.
+    
+    Chunk rows keep only the sha256 of each image (original_content.image_refs)
+    and the bytes live in S3 or on disk under that hash, so identical images
+    are stored once and search results stay small. With the "inline" backend
+    nothing is uploaded and images stay in the row as before.
+    """
+    
+    def __init__(
+        self,
+        backend: Optional[str] = None,
+        root: Optional[str] = None,
+        prefix: Optional[str] = None,
+        max_workers: Optional[int] = None
+    ):
+        self.backend = backend or settings.ASSET_STORE_BACKEND
+        self.root = Path(root or settings.ASSET_STORE_DIR)
+        self.prefix = prefix or settings.ASSET_STORE_PREFIX
+        self.max_workers = max_workers or settings.ASSET_STORE_MAX_WORKERS
+        self._s3 = None
+    
+    @property
+    def enabled(self) -> bool:
+        return self.backend != "inline"
+    
+    @property
+    def s3(self):
+        """S3 client, created on first use."""
+        if self._s3 is None:
+            from src.services.storage.s3 import S3Service
+            
+            self._s3 = S3Service()
+        return self._s3
+    
+    @staticmethod
+    def make_ref(data: bytes) -> str:
+        """Reference (sha256 hex digest) of an asset's bytes."""
+        return hashlib.sha256(data).hexdigest()
+    
+    def put_images(self, images: List[str]) -> Optional[List[str]]:
+        """
+        Store base64 images and return their references.
+        
+        Returns:
+            One reference per image, or None if the images should stay
+            inline (inline backend, or the upload failed)
+        """
+        if not self.enabled:
+            return None
+        
+        try:
+            refs = []
+            for image_base64 in images:
+                if image_base64.startswith("data:image"):
+                    image_base64 = image_base64.split(",", 1)[1]
+                data = base64.b64decode(image_base64)
+                ref = self.make_ref(data)
+                self._write(ref, data)
+                refs.append(ref)
+            return refs
+        except Exception as e:
+            print(f"⚠️ Asset upload failed, keeping images inline: {e}")
+            return None
+    
+    def get_images(self, refs: List[str]) -> Dict[str, str]:
+        """
+        Fetch images as base64, reading the assets concurrently.
+        
+        Missing or unreadable assets are left out of the result.
+        """
+        refs = list(dict.fromkeys(refs))
+        if not refs:
+            return {}
+        
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(refs))) as executor:
+            results = list(executor.map(self._read_or_none, refs))
+        
+        images = {
+            ref: base64.b64encode(data).decode("ascii")
+            for ref, data in zip(refs, results)
+            if data is not None
+        }
+        if len(images) < len(refs):
+            print(f"⚠️ {len(refs) - len(images)}/{len(refs)} image assets could not be read")
+        return images
+    
+    def resolve(self, original_content: Dict[str, Any]) -> Dict[str, Any]:
+        """Copy of a chunk's original_content with referenced images inlined."""
+        refs = original_content.get("image_refs")
+        if not refs:
+            return original_content
+        
+        fetched = self.get_images(refs)
+        resolved = {key: value for key, value in original_content.items() if key != "image_refs"}
+        resolved["images"] = original_content.get("images", []) + [fetched[ref] for ref in refs if ref in fetched]
+        return resolved
+    
+    def resolve_many(self, chunks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Copies of chunk rows with referenced images inlined.
+        
+        The refs of all chunks are fetched in a single concurrent batch.
+        """
+        refs = [ref for chunk in chunks for ref in (chunk.get("original_content") or {}).get("image_refs", [])]
+        if not refs:
+            return chunks
+        
+        fetched = self.get_images(refs)
+        resolved = []
+        for chunk in chunks:
+            original_content = chunk.get("original_content") or {}
+            chunk_refs = original_content.get("image_refs")
+            if chunk_refs:
+                original_content = {key: value for key, value in original_content.items() if key != "image_refs"}
+                original_content["images"] = original_content.get("images", []) + [
+                    fetched[ref] for ref in chunk_refs if ref in fetched
+                ]
+                chunk = {**chunk, "original_content": original_content}
+            resolved.append(chunk)
+        return resolved
+    
+    def delete(self, refs: List[str]) -> int:
+        """
+        Delete assets by reference.
+        
+        Callers must only pass refs that no chunk row references any more
+        (see DocumentChunkRepository.release_image_assets). Failures are
+        logged and skipped; a leftover asset is only wasted storage.
+        
+        Returns:
+            Number of assets deleted
+        """
+        refs = list(dict.fromkeys(refs))
+        if not self.enabled or not refs:
+            return 0
+        
+        deleted = 0
+        for ref in refs:
+            try:
+                self._delete(ref)
+                deleted += 1
+            except Exception as e:
+                print(f"⚠️ Asset delete failed ({ref}): {e}")
+        return deleted
+    
+    def _read_or_none(self, ref: str) -> Optional[bytes]:
+        try:
+            return self._read(ref)
+        except Exception as e:
+            print(f"⚠️ Asset read failed ({ref}): {e}")
+            return None
+    
+    # ==================== STORAGE ====================
+    
+    def _key(self, ref: str) -> str:
+        return f"{self.prefix}/{ref}"
+    
+    def _path(self, ref: str) -> Path:
+        return self.root / ref[:2] / ref
+    
+    def _read(self, ref: str) -> Optional[bytes]:
+        if self.backend == "s3":
+            response = self.s3.s3_client.get_object(Bucket=self.s3.bucket_name, Key=self._key(ref))
+            return response["Body"].read()
+        try:
+            return self._path(ref).read_bytes()
+        except FileNotFoundError:
+            return None
+    
+    def _delete(self, ref: str) -> None:
+        if self.backend == "s3":
+            self.s3.s3_client.delete_object(Bucket=self.s3.bucket_name, Key=self._key(ref))
+            return
+        self._path(ref).unlink(missing_ok=True)
+    
+    def _write(self, ref: str, data: bytes) -> None:
+        if self.backend == "s3":
+            # Keys are content hashes, so rewriting an existing asset is harmless
+            self.s3.s3_client.put_object(Bucket=self.s3.bucket_name, Key=self._key(ref), Body=data)
+            return
+        
+        path = self._path(ref)
+        if path.exists():
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+
+
+# Default instance
+asset_store = AssetStore()
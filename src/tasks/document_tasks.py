@@ -13,6 +13,9 @@ from src.services.database.repositories.document_repo import (
 )
 from src.services.storage.s3 import S3Service
 from src.services.document.processor import DocumentProcessor
+from src.services.cache.retrieval_cache import bump_document_set_version
+from src.rag.index_sync import on_document_completed
+from src.rag.vector_store import pg_vector_store
 
 
 # Initialize ScrapingBee client
@@ -116,11 +119,26 @@ def processing_document(self, document_id: str) -> Dict[str, Any]:
         
         for i, chunk_data in enumerate(processed_chunks):
             chunk_data["document_id"] = document_id
+            chunk_data["project_id"] = document.get("project_id")
             chunk_data["chunk_index"] = i
-            chunk_repo.insert_chunk(chunk_data)
+        # A retried task replaces whatever an earlier attempt stored
+        previous_refs = chunk_repo.get_image_refs(document_id)
+        pg_vector_store.delete_by_document(document_id)
+        stored_chunks = pg_vector_store.upsert(processed_chunks)
+        # Only after the new rows exist, so images they reuse are kept
+        chunk_repo.release_image_assets(previous_refs)
         
         # Mark as completed
         doc_repo.update_status(document_id, ProcessingStatus.COMPLETED.value)
+        on_document_completed(
+            document.get("project_id"),
+            document_id,
+            rows=stored_chunks,
+            filename=document.get("filename")
+        )
+        # After the local indexes are updated, so nothing cached against the
+        # new version can have been retrieved from a stale index
+        bump_document_set_version(document.get("project_id"))
         print(f"Step -5 : {ProcessingStatus.COMPLETED.value}")
         print(f"✅ Celery task completed for document: {document_id}")
         
@@ -0,0 +1,105 @@
+-- Migration: Server-side hybrid search
+-- Description: Runs the vector and keyword searches as CTEs and fuses them with
+-- weighted Reciprocal Rank Fusion in SQL, so hybrid retrieval is a single RPC
+-- and only the fused rows (without embeddings) cross the wire.
+--
+-- RRF score: vector_weight / (rrf_k + vector_rank) + keyword_weight / (rrf_k + keyword_rank)
+-- with 1-based ranks, matching reciprocal_rank_fusion() in src/rag/rrf.py.
+
+CREATE OR REPLACE FUNCTION hybrid_search_document_chunks(
+    query_text text,
+    query_embedding vector,
+    filter_document_ids uuid[],
+    match_threshold double precision DEFAULT 0.3,
+    chunks_per_search integer DEFAULT 20,
+    vector_weight double precision DEFAULT 0.7,
+    keyword_weight double precision DEFAULT 0.3,
+    rrf_k integer DEFAULT 60,
+    match_count integer DEFAULT NULL
+)
+RETURNS TABLE(
+    id uuid,
+    document_id uuid,
+    content text,
+    chunk_index integer,
+    created_at timestamp with time zone,
+    page_number integer,
+    char_count integer,
+    type jsonb,
+    original_content jsonb,
+    vector_rank bigint,
+    keyword_rank bigint,
+    rrf_score double precision
+)
+LANGUAGE sql
+STABLE
+AS $function$
+WITH vector_results AS (
+    SELECT
+        dc.id,
+        row_number() OVER (ORDER BY dc.embedding <=> query_embedding ASC) AS rank
+    FROM
+        document_chunks dc
+    WHERE
+        dc.document_id = ANY(filter_document_ids)
+        AND dc.embedding IS NOT NULL
+        AND (1 - (dc.embedding <=> query_embedding)) > match_threshold
+    ORDER BY
+        dc.embedding <=> query_embedding ASC
+    LIMIT
+        chunks_per_search
+),
+keyword_query AS (
+    SELECT websearch_to_tsquery('english', query_text) AS tsq
+),
+keyword_results AS (
+    SELECT
+        dc.id,
+        row_number() OVER (ORDER BY ts_rank_cd(dc.fts, kq.tsq) DESC) AS rank
+    FROM
+        document_chunks dc,
+        keyword_query kq
+    WHERE
+        dc.fts @@ kq.tsq
+        AND dc.document_id = ANY(filter_document_ids)
+    ORDER BY
+        ts_rank_cd(dc.fts, kq.tsq) DESC
+    LIMIT
+        chunks_per_search
+),
+fused AS (
+    SELECT
+        COALESCE(v.id, k.id) AS id,
+        v.rank AS vector_rank,
+        k.rank AS keyword_rank,
+        COALESCE(vector_weight / (rrf_k + v.rank), 0.0)
+            + COALESCE(keyword_weight / (rrf_k + k.rank), 0.0) AS rrf_score
+    FROM
+        vector_results v
+        FULL OUTER JOIN keyword_results k ON v.id = k.id
+)
+SELECT
+    dc.id,
+    dc.document_id,
+    dc.content,
+    dc.chunk_index,
+    dc.created_at,
+    dc.page_number,
+    dc.char_count,
+    dc.type::jsonb,
+    dc.original_content::jsonb,
+    f.vector_rank,
+    f.keyword_rank,
+    f.rrf_score
+FROM
+    fused f
+    JOIN document_chunks dc ON dc.id = f.id
+ORDER BY
+    f.rrf_score DESC,
+    f.vector_rank ASC NULLS LAST
+LIMIT
+    match_count;
+$function$;
+
+COMMENT ON FUNCTION hybrid_search_document_chunks IS
+    'Vector + keyword search fused with weighted RRF in a single round trip';
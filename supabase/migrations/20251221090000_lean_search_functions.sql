@@ -0,0 +1,115 @@
+-- Migration: Lean search result projection
+-- Description: Search functions that do not ship the 1536-float embedding column
+-- unless the caller explicitly asks for it. Both return a score column and the
+-- document filename so callers no longer need a second lookup.
+--
+-- Callers narrow the payload further with PostgREST column selection on the RPC
+-- result (e.g. supabase.rpc(...).select("id", "content", "similarity")).
+
+CREATE OR REPLACE FUNCTION vector_search_chunks(
+    query_embedding vector,
+    filter_document_ids uuid[],
+    match_threshold double precision DEFAULT 0.3,
+    chunks_per_search integer DEFAULT 20,
+    include_embedding boolean DEFAULT false
+)
+RETURNS TABLE(
+    id uuid,
+    document_id uuid,
+    content text,
+    chunk_index integer,
+    created_at timestamp with time zone,
+    page_number integer,
+    char_count integer,
+    type jsonb,
+    original_content jsonb,
+    similarity double precision,
+    filename text,
+    embedding vector
+)
+LANGUAGE sql
+STABLE
+AS $function$
+SELECT
+    dc.id,
+    dc.document_id,
+    dc.content,
+    dc.chunk_index,
+    dc.created_at,
+    dc.page_number,
+    dc.char_count,
+    dc.type::jsonb,
+    dc.original_content::jsonb,
+    1 - (dc.embedding <=> query_embedding) AS similarity,
+    pd.filename,
+    CASE WHEN include_embedding THEN dc.embedding END AS embedding
+FROM
+    document_chunks dc
+    JOIN project_documents pd ON pd.id = dc.document_id
+WHERE
+    dc.document_id = ANY(filter_document_ids)
+    AND dc.embedding IS NOT NULL
+    AND (1 - (dc.embedding <=> query_embedding)) > match_threshold
+ORDER BY
+    dc.embedding <=> query_embedding ASC
+LIMIT
+    chunks_per_search;
+$function$;
+
+
+CREATE OR REPLACE FUNCTION keyword_search_chunks(
+    query_text text,
+    filter_document_ids uuid[],
+    chunks_per_search integer DEFAULT 20,
+    include_embedding boolean DEFAULT false
+)
+RETURNS TABLE(
+    id uuid,
+    document_id uuid,
+    content text,
+    chunk_index integer,
+    created_at timestamp with time zone,
+    page_number integer,
+    char_count integer,
+    type jsonb,
+    original_content jsonb,
+    rank double precision,
+    filename text,
+    embedding vector
+)
+LANGUAGE sql
+STABLE
+AS $function$
+WITH keyword_query AS (
+    SELECT websearch_to_tsquery('english', query_text) AS tsq
+)
+SELECT
+    dc.id,
+    dc.document_id,
+    dc.content,
+    dc.chunk_index,
+    dc.created_at,
+    dc.page_number,
+    dc.char_count,
+    dc.type::jsonb,
+    dc.original_content::jsonb,
+    ts_rank_cd(dc.fts, kq.tsq)::double precision AS rank,
+    pd.filename,
+    CASE WHEN include_embedding THEN dc.embedding END AS embedding
+FROM
+    document_chunks dc
+    CROSS JOIN keyword_query kq
+    JOIN project_documents pd ON pd.id = dc.document_id
+WHERE
+    dc.fts @@ kq.tsq
+    AND dc.document_id = ANY(filter_document_ids)
+ORDER BY
+    rank DESC
+LIMIT
+    chunks_per_search;
+$function$;
+
+COMMENT ON FUNCTION vector_search_chunks IS
+    'Vector search returning similarity and filename; embedding only when include_embedding';
+COMMENT ON FUNCTION keyword_search_chunks IS
+    'Full-text search returning ts_rank_cd and filename; embedding only when include_embedding';
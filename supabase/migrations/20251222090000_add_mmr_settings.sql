@@ -0,0 +1,18 @@
+-- Migration: Add MMR Context Diversification Settings
+-- Description: Adds mmr_enabled and mmr_lambda columns to project_settings
+
+-- MMR is opt-in; existing projects keep plain top-k context selection
+ALTER TABLE project_settings
+ADD COLUMN IF NOT EXISTS mmr_enabled BOOLEAN NOT NULL DEFAULT FALSE;
+
+ALTER TABLE project_settings
+ADD COLUMN IF NOT EXISTS mmr_lambda DECIMAL NOT NULL DEFAULT 0.7;
+
+-- Add check constraint for valid values
+ALTER TABLE project_settings
+ADD CONSTRAINT mmr_lambda_check
+CHECK (mmr_lambda >= 0 AND mmr_lambda <= 1);
+
+-- Add comments for documentation
+COMMENT ON COLUMN project_settings.mmr_enabled IS 'Pick final context chunks with maximal marginal relevance';
+COMMENT ON COLUMN project_settings.mmr_lambda IS 'MMR trade-off: 1.0 = pure relevance, 0.0 = pure diversity';
@@ -0,0 +1,14 @@
+-- Migration: Add Vector Backend Selection
+-- Description: Adds vector_backend column to project_settings table
+
+-- Add vector_backend column with default value
+ALTER TABLE project_settings
+ADD COLUMN IF NOT EXISTS vector_backend TEXT NOT NULL DEFAULT 'pgvector';
+
+-- Add check constraint for valid values
+ALTER TABLE project_settings
+ADD CONSTRAINT vector_backend_check
+CHECK (vector_backend IN ('pgvector', 'local'));
+
+-- Add comment for documentation
+COMMENT ON COLUMN project_settings.vector_backend IS 'Vector search backend: pgvector (Supabase) or local (memory-mapped index in the API process)';
@@ -0,0 +1,14 @@
+-- Migration: Add Keyword Backend Selection
+-- Description: Adds keyword_backend column to project_settings table
+
+-- Add keyword_backend column with default value
+ALTER TABLE project_settings
+ADD COLUMN IF NOT EXISTS keyword_backend TEXT NOT NULL DEFAULT 'postgres';
+
+-- Add check constraint for valid values
+ALTER TABLE project_settings
+ADD CONSTRAINT keyword_backend_check
+CHECK (keyword_backend IN ('postgres', 'bm25'));
+
+-- Add comment for documentation
+COMMENT ON COLUMN project_settings.keyword_backend IS 'Keyword search backend: postgres (full-text search RPC) or bm25 (in-process inverted index)';
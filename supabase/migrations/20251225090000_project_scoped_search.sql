@@ -0,0 +1,265 @@
+-- Migration: Project-scoped chunk search
+-- Description: Denormalizes project_id onto document_chunks so searches can filter
+-- by project instead of receiving every document id of the project in each RPC,
+-- and adds search functions that only see fully processed documents.
+
+-- Add project_id column
+ALTER TABLE document_chunks
+ADD COLUMN IF NOT EXISTS project_id UUID REFERENCES projects(id) ON DELETE CASCADE;
+
+-- Backfill from the owning document
+UPDATE document_chunks dc
+SET project_id = pd.project_id
+FROM project_documents pd
+WHERE pd.id = dc.document_id
+  AND dc.project_id IS NULL;
+
+-- Fill project_id for chunks inserted without it
+CREATE OR REPLACE FUNCTION set_document_chunk_project_id()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $function$
+BEGIN
+    IF NEW.project_id IS NULL THEN
+        SELECT pd.project_id INTO NEW.project_id
+        FROM project_documents pd
+        WHERE pd.id = NEW.document_id;
+    END IF;
+    RETURN NEW;
+END;
+$function$;
+
+DROP TRIGGER IF EXISTS document_chunks_set_project_id ON document_chunks;
+CREATE TRIGGER document_chunks_set_project_id
+BEFORE INSERT ON document_chunks
+FOR EACH ROW EXECUTE FUNCTION set_document_chunk_project_id();
+
+ALTER TABLE document_chunks
+ALTER COLUMN project_id SET NOT NULL;
+
+-- Project filter first, document second (also serves per-document lookups within a project)
+CREATE INDEX IF NOT EXISTS document_chunks_project_document_idx
+ON document_chunks (project_id, document_id);
+
+-- Completed documents of a project
+CREATE INDEX IF NOT EXISTS project_documents_project_status_idx
+ON project_documents (project_id, processing_status);
+
+
+CREATE OR REPLACE FUNCTION vector_search_project_chunks(
+    query_embedding vector,
+    filter_project_id uuid,
+    match_threshold double precision DEFAULT 0.3,
+    chunks_per_search integer DEFAULT 20,
+    include_embedding boolean DEFAULT false
+)
+RETURNS TABLE(
+    id uuid,
+    document_id uuid,
+    content text,
+    chunk_index integer,
+    created_at timestamp with time zone,
+    page_number integer,
+    char_count integer,
+    type jsonb,
+    original_content jsonb,
+    similarity double precision,
+    filename text,
+    embedding vector
+)
+LANGUAGE sql
+STABLE
+AS $function$
+SELECT
+    dc.id,
+    dc.document_id,
+    dc.content,
+    dc.chunk_index,
+    dc.created_at,
+    dc.page_number,
+    dc.char_count,
+    dc.type::jsonb,
+    dc.original_content::jsonb,
+    1 - (dc.embedding <=> query_embedding) AS similarity,
+    pd.filename,
+    CASE WHEN include_embedding THEN dc.embedding END AS embedding
+FROM
+    document_chunks dc
+    JOIN project_documents pd ON pd.id = dc.document_id
+WHERE
+    dc.project_id = filter_project_id
+    AND pd.processing_status = 'completed'
+    AND dc.embedding IS NOT NULL
+    AND (1 - (dc.embedding <=> query_embedding)) > match_threshold
+ORDER BY
+    dc.embedding <=> query_embedding ASC
+LIMIT
+    chunks_per_search;
+$function$;
+
+
+CREATE OR REPLACE FUNCTION keyword_search_project_chunks(
+    query_text text,
+    filter_project_id uuid,
+    chunks_per_search integer DEFAULT 20,
+    include_embedding boolean DEFAULT false
+)
+RETURNS TABLE(
+    id uuid,
+    document_id uuid,
+    content text,
+    chunk_index integer,
+    created_at timestamp with time zone,
+    page_number integer,
+    char_count integer,
+    type jsonb,
+    original_content jsonb,
+    rank double precision,
+    filename text,
+    embedding vector
+)
+LANGUAGE sql
+STABLE
+AS $function$
+WITH keyword_query AS (
+    SELECT websearch_to_tsquery('english', query_text) AS tsq
+)
+SELECT
+    dc.id,
+    dc.document_id,
+    dc.content,
+    dc.chunk_index,
+    dc.created_at,
+    dc.page_number,
+    dc.char_count,
+    dc.type::jsonb,
+    dc.original_content::jsonb,
+    ts_rank_cd(dc.fts, kq.tsq)::double precision AS rank,
+    pd.filename,
+    CASE WHEN include_embedding THEN dc.embedding END AS embedding
+FROM
+    document_chunks dc
+    CROSS JOIN keyword_query kq
+    JOIN project_documents pd ON pd.id = dc.document_id
+WHERE
+    dc.fts @@ kq.tsq
+    AND dc.project_id = filter_project_id
+    AND pd.processing_status = 'completed'
+ORDER BY
+    rank DESC
+LIMIT
+    chunks_per_search;
+$function$;
+
+
+CREATE OR REPLACE FUNCTION hybrid_search_project_chunks(
+    query_text text,
+    query_embedding vector,
+    filter_project_id uuid,
+    match_threshold double precision DEFAULT 0.3,
+    chunks_per_search integer DEFAULT 20,
+    vector_weight double precision DEFAULT 0.7,
+    keyword_weight double precision DEFAULT 0.3,
+    rrf_k integer DEFAULT 60,
+    match_count integer DEFAULT NULL
+)
+RETURNS TABLE(
+    id uuid,
+    document_id uuid,
+    content text,
+    chunk_index integer,
+    created_at timestamp with time zone,
+    page_number integer,
+    char_count integer,
+    type jsonb,
+    original_content jsonb,
+    vector_rank bigint,
+    keyword_rank bigint,
+    rrf_score double precision
+)
+LANGUAGE sql
+STABLE
+AS $function$
+WITH completed_documents AS (
+    SELECT pd.id
+    FROM project_documents pd
+    WHERE pd.project_id = filter_project_id
+      AND pd.processing_status = 'completed'
+),
+vector_results AS (
+    SELECT
+        dc.id,
+        row_number() OVER (ORDER BY dc.embedding <=> query_embedding ASC) AS rank
+    FROM
+        document_chunks dc
+    WHERE
+        dc.project_id = filter_project_id
+        AND dc.document_id IN (SELECT cd.id FROM completed_documents cd)
+        AND dc.embedding IS NOT NULL
+        AND (1 - (dc.embedding <=> query_embedding)) > match_threshold
+    ORDER BY
+        dc.embedding <=> query_embedding ASC
+    LIMIT
+        chunks_per_search
+),
+keyword_query AS (
+    SELECT websearch_to_tsquery('english', query_text) AS tsq
+),
+keyword_results AS (
+    SELECT
+        dc.id,
+        row_number() OVER (ORDER BY ts_rank_cd(dc.fts, kq.tsq) DESC) AS rank
+    FROM
+        document_chunks dc,
+        keyword_query kq
+    WHERE
+        dc.fts @@ kq.tsq
+        AND dc.project_id = filter_project_id
+        AND dc.document_id IN (SELECT cd.id FROM completed_documents cd)
+    ORDER BY
+        ts_rank_cd(dc.fts, kq.tsq) DESC
+    LIMIT
+        chunks_per_search
+),
+fused AS (
+    SELECT
+        COALESCE(v.id, k.id) AS id,
+        v.rank AS vector_rank,
+        k.rank AS keyword_rank,
+        COALESCE(vector_weight / (rrf_k + v.rank), 0.0)
+            + COALESCE(keyword_weight / (rrf_k + k.rank), 0.0) AS rrf_score
+    FROM
+        vector_results v
+        FULL OUTER JOIN keyword_results k ON v.id = k.id
+)
+SELECT
+    dc.id,
+    dc.document_id,
+    dc.content,
+    dc.chunk_index,
+    dc.created_at,
+    dc.page_number,
+    dc.char_count,
+    dc.type::jsonb,
+    dc.original_content::jsonb,
+    f.vector_rank,
+    f.keyword_rank,
+    f.rrf_score
+FROM
+    fused f
+    JOIN document_chunks dc ON dc.id = f.id
+ORDER BY
+    f.rrf_score DESC,
+    f.vector_rank ASC NULLS LAST
+LIMIT
+    match_count;
+$function$;
+
+COMMENT ON COLUMN document_chunks.project_id IS
+    'Denormalized from project_documents.project_id (set by trigger when omitted)';
+COMMENT ON FUNCTION vector_search_project_chunks IS
+    'Vector search over the completed documents of one project';
+COMMENT ON FUNCTION keyword_search_project_chunks IS
+    'Full-text search over the completed documents of one project';
+COMMENT ON FUNCTION hybrid_search_project_chunks IS
+    'Vector + keyword search with weighted RRF over the completed documents of one project';
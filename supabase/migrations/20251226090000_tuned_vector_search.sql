@@ -0,0 +1,161 @@
+-- Migration: Tuned project vector search
+-- Description: Filtered HNSW search that keeps its recall. The per-call function
+-- sets hnsw.ef_search (never below the requested row count) and, on pgvector
+-- 0.8+, enables iterative index scans so rows removed by the project/status
+-- filters are replaced by further index candidates instead of silently shrinking
+-- the result. The similarity threshold is applied outside the index-ordered
+-- subquery, so it no longer turns the ORDER BY ... LIMIT into a filtered scan.
+--
+-- explain_vector_search returns the EXPLAIN ANALYZE plan of the tuned or the
+-- original query shape for evaluation/scripts/benchmark_vector_plans.py.
+
+CREATE OR REPLACE FUNCTION vector_search_project_chunks_tuned(
+    query_embedding vector,
+    filter_project_id uuid,
+    match_threshold double precision DEFAULT 0.3,
+    chunks_per_search integer DEFAULT 20,
+    include_embedding boolean DEFAULT false,
+    ef_search integer DEFAULT 100
+)
+RETURNS TABLE(
+    id uuid,
+    document_id uuid,
+    content text,
+    chunk_index integer,
+    created_at timestamp with time zone,
+    page_number integer,
+    char_count integer,
+    type jsonb,
+    original_content jsonb,
+    similarity double precision,
+    filename text,
+    embedding vector
+)
+LANGUAGE plpgsql
+VOLATILE
+AS $function$
+#variable_conflict use_column
+BEGIN
+    -- Transaction-local: each RPC call runs in its own transaction
+    PERFORM set_config('hnsw.ef_search', greatest(ef_search, chunks_per_search)::text, true);
+    IF current_setting('hnsw.iterative_scan', true) IS NOT NULL THEN
+        PERFORM set_config('hnsw.iterative_scan', 'relaxed_order', true);
+    END IF;
+
+    RETURN QUERY
+    SELECT
+        nearest.id,
+        nearest.document_id,
+        nearest.content,
+        nearest.chunk_index,
+        nearest.created_at,
+        nearest.page_number,
+        nearest.char_count,
+        nearest.type::jsonb,
+        nearest.original_content::jsonb,
+        1 - nearest.distance AS similarity,
+        nearest.filename,
+        CASE WHEN include_embedding THEN nearest.embedding END AS embedding
+    FROM (
+        SELECT
+            dc.id,
+            dc.document_id,
+            dc.content,
+            dc.chunk_index,
+            dc.created_at,
+            dc.page_number,
+            dc.char_count,
+            dc.type,
+            dc.original_content,
+            dc.embedding,
+            pd.filename,
+            dc.embedding <=> query_embedding AS distance
+        FROM
+            document_chunks dc
+            JOIN project_documents pd ON pd.id = dc.document_id
+        WHERE
+            dc.project_id = filter_project_id
+            AND pd.processing_status = 'completed'
+            AND dc.embedding IS NOT NULL
+        ORDER BY
+            dc.embedding <=> query_embedding ASC
+        LIMIT
+            chunks_per_search
+    ) nearest
+    WHERE
+        (1 - nearest.distance) > match_threshold
+    -- Relaxed iterative scans may return rows slightly out of order
+    ORDER BY
+        nearest.distance ASC;
+END;
+$function$;
+
+
+CREATE OR REPLACE FUNCTION explain_vector_search(
+    query_embedding vector,
+    filter_project_id uuid,
+    match_threshold double precision DEFAULT 0.3,
+    chunks_per_search integer DEFAULT 20,
+    ef_search integer DEFAULT 100,
+    tuned boolean DEFAULT true
+)
+RETURNS jsonb
+LANGUAGE plpgsql
+VOLATILE
+AS $function$
+DECLARE
+    plan jsonb;
+BEGIN
+    PERFORM set_config('hnsw.ef_search', greatest(ef_search, chunks_per_search)::text, true);
+    IF current_setting('hnsw.iterative_scan', true) IS NOT NULL THEN
+        PERFORM set_config('hnsw.iterative_scan', CASE WHEN tuned THEN 'relaxed_order' ELSE 'off' END, true);
+    END IF;
+
+    IF tuned THEN
+        EXECUTE $query$
+            EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON)
+            SELECT nearest.id
+            FROM (
+                SELECT dc.id, dc.embedding <=> $1 AS distance
+                FROM document_chunks dc
+                JOIN project_documents pd ON pd.id = dc.document_id
+                WHERE dc.project_id = $2
+                  AND pd.processing_status = 'completed'
+                  AND dc.embedding IS NOT NULL
+                ORDER BY dc.embedding <=> $1
+                LIMIT $4
+            ) nearest
+            WHERE (1 - nearest.distance) > $3
+            ORDER BY nearest.distance
+        $query$
+        INTO plan
+        USING query_embedding, filter_project_id, match_threshold, chunks_per_search;
+    ELSE
+        EXECUTE $query$
+            EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON)
+            SELECT dc.id
+            FROM document_chunks dc
+            JOIN project_documents pd ON pd.id = dc.document_id
+            WHERE dc.project_id = $2
+              AND pd.processing_status = 'completed'
+              AND dc.embedding IS NOT NULL
+              AND (1 - (dc.embedding <=> $1)) > $3
+            ORDER BY dc.embedding <=> $1
+            LIMIT $4
+        $query$
+        INTO plan
+        USING query_embedding, filter_project_id, match_threshold, chunks_per_search;
+    END IF;
+
+    RETURN plan -> 0;
+END;
+$function$;
+
+-- EXPLAIN ANALYZE executes the query: keep it to the service role
+REVOKE EXECUTE ON FUNCTION explain_vector_search(vector, uuid, double precision, integer, integer, boolean)
+FROM PUBLIC, anon, authenticated;
+
+COMMENT ON FUNCTION vector_search_project_chunks_tuned IS
+    'Project vector search with per-call hnsw.ef_search, iterative scans and the threshold applied after the index scan';
+COMMENT ON FUNCTION explain_vector_search IS
+    'EXPLAIN ANALYZE (JSON) of the tuned or original project vector search query';
@@ -0,0 +1,129 @@
+-- Migration: Quantized embeddings with full-precision rescoring
+-- Description: Adds compact representations of document_chunks.embedding and
+-- HNSW indexes over them (requires pgvector 0.7+ for halfvec and binary_quantize):
+--   - embedding_half: float16 copy (half the index memory of vector(1536))
+--   - binary_quantize(embedding): 1 bit per dimension, expression index only
+-- vector_search_project_chunks_quantized takes candidates from one of those
+-- indexes and rescores them with the full-precision embedding. Projects opt in
+-- with project_settings.vector_search_mode.
+--
+-- Once no project uses vector_search_mode = 'full', the float32 index
+-- (document_chunks_embedding_hnsw_idx) can be dropped to reclaim its memory.
+
+-- Float16 copy, kept in step with embedding automatically
+ALTER TABLE document_chunks
+ADD COLUMN IF NOT EXISTS embedding_half halfvec(1536)
+GENERATED ALWAYS AS (embedding::halfvec(1536)) STORED;
+
+CREATE INDEX IF NOT EXISTS document_chunks_embedding_half_hnsw_idx
+ON document_chunks USING hnsw (embedding_half halfvec_cosine_ops);
+
+CREATE INDEX IF NOT EXISTS document_chunks_embedding_binary_hnsw_idx
+ON document_chunks USING hnsw ((binary_quantize(embedding)::bit(1536)) bit_hamming_ops);
+
+-- Add vector_search_mode column with default value
+ALTER TABLE project_settings
+ADD COLUMN IF NOT EXISTS vector_search_mode TEXT NOT NULL DEFAULT 'full';
+
+-- Add check constraint for valid values
+ALTER TABLE project_settings
+ADD CONSTRAINT vector_search_mode_check
+CHECK (vector_search_mode IN ('full', 'halfvec', 'binary'));
+
+COMMENT ON COLUMN project_settings.vector_search_mode IS 'First-pass ANN representation: full (float32), halfvec (float16) or binary (1-bit), the latter two rescored with full vectors';
+
+
+CREATE OR REPLACE FUNCTION vector_search_project_chunks_quantized(
+    query_embedding vector,
+    filter_project_id uuid,
+    match_threshold double precision DEFAULT 0.3,
+    chunks_per_search integer DEFAULT 20,
+    include_embedding boolean DEFAULT false,
+    quantization text DEFAULT 'halfvec',
+    rescore_candidates integer DEFAULT 100,
+    ef_search integer DEFAULT 100
+)
+RETURNS TABLE(
+    id uuid,
+    document_id uuid,
+    content text,
+    chunk_index integer,
+    created_at timestamp with time zone,
+    page_number integer,
+    char_count integer,
+    type jsonb,
+    original_content jsonb,
+    similarity double precision,
+    filename text,
+    embedding vector
+)
+LANGUAGE plpgsql
+VOLATILE
+AS $function$
+#variable_conflict use_column
+DECLARE
+    candidate_count integer := greatest(rescore_candidates, chunks_per_search);
+    candidate_ids uuid[];
+BEGIN
+    PERFORM set_config('hnsw.ef_search', greatest(ef_search, candidate_count)::text, true);
+    IF current_setting('hnsw.iterative_scan', true) IS NOT NULL THEN
+        PERFORM set_config('hnsw.iterative_scan', 'relaxed_order', true);
+    END IF;
+
+    -- Pass 1: approximate candidates from the compact index
+    IF quantization = 'halfvec' THEN
+        SELECT array_agg(candidate.id) INTO candidate_ids
+        FROM (
+            SELECT dc.id
+            FROM document_chunks dc
+            JOIN project_documents pd ON pd.id = dc.document_id
+            WHERE dc.project_id = filter_project_id
+              AND pd.processing_status = 'completed'
+            ORDER BY dc.embedding_half <=> query_embedding::halfvec(1536)
+            LIMIT candidate_count
+        ) candidate;
+    ELSIF quantization = 'binary' THEN
+        SELECT array_agg(candidate.id) INTO candidate_ids
+        FROM (
+            SELECT dc.id
+            FROM document_chunks dc
+            JOIN project_documents pd ON pd.id = dc.document_id
+            WHERE dc.project_id = filter_project_id
+              AND pd.processing_status = 'completed'
+            ORDER BY binary_quantize(dc.embedding)::bit(1536) <~> binary_quantize(query_embedding)
+            LIMIT candidate_count
+        ) candidate;
+    ELSE
+        RAISE EXCEPTION 'Unknown quantization: %', quantization;
+    END IF;
+
+    -- Pass 2: exact cosine similarity on the candidates only
+    RETURN QUERY
+    SELECT
+        dc.id,
+        dc.document_id,
+        dc.content,
+        dc.chunk_index,
+        dc.created_at,
+        dc.page_number,
+        dc.char_count,
+        dc.type::jsonb,
+        dc.original_content::jsonb,
+        1 - (dc.embedding <=> query_embedding) AS similarity,
+        pd.filename,
+        CASE WHEN include_embedding THEN dc.embedding END AS embedding
+    FROM
+        document_chunks dc
+        JOIN project_documents pd ON pd.id = dc.document_id
+    WHERE
+        dc.id = ANY(candidate_ids)
+        AND (1 - (dc.embedding <=> query_embedding)) > match_threshold
+    ORDER BY
+        dc.embedding <=> query_embedding ASC
+    LIMIT
+        chunks_per_search;
+END;
+$function$;
+
+COMMENT ON FUNCTION vector_search_project_chunks_quantized IS
+    'Project vector search: halfvec or binary HNSW candidates rescored with full-precision cosine similarity';
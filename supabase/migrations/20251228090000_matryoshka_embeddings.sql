@@ -0,0 +1,161 @@
+-- Migration: Matryoshka (truncated-dimension) embeddings
+-- Description: text-embedding-3-* embeddings keep most of their quality when cut
+-- to a prefix and re-normalized. embedding_short stores the first 256 dimensions
+-- with its own HNSW index (about 6x smaller than the vector(1536) index), and the
+-- 'matryoshka' quantization of vector_search_project_chunks_quantized takes its
+-- candidates from it before rescoring them with the full embedding.
+-- Requires pgvector 0.7+ (subvector, l2_normalize).
+--
+-- Ingestion writes embedding_short (DocumentProcessor.generate_embeddings);
+-- the trigger fills it for rows inserted without it.
+
+-- Add embedding_short column
+ALTER TABLE document_chunks
+ADD COLUMN IF NOT EXISTS embedding_short vector(256);
+
+-- Backfill from the full embedding
+UPDATE document_chunks
+SET embedding_short = l2_normalize(subvector(embedding, 1, 256))::vector(256)
+WHERE embedding IS NOT NULL
+  AND embedding_short IS NULL;
+
+-- Fill embedding_short for chunks written without it
+CREATE OR REPLACE FUNCTION set_document_chunk_embedding_short()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $function$
+BEGIN
+    IF NEW.embedding_short IS NULL AND NEW.embedding IS NOT NULL THEN
+        NEW.embedding_short := l2_normalize(subvector(NEW.embedding, 1, 256))::vector(256);
+    END IF;
+    RETURN NEW;
+END;
+$function$;
+
+DROP TRIGGER IF EXISTS document_chunks_set_embedding_short ON document_chunks;
+CREATE TRIGGER document_chunks_set_embedding_short
+BEFORE INSERT OR UPDATE OF embedding ON document_chunks
+FOR EACH ROW EXECUTE FUNCTION set_document_chunk_embedding_short();
+
+CREATE INDEX IF NOT EXISTS document_chunks_embedding_short_hnsw_idx
+ON document_chunks USING hnsw (embedding_short vector_cosine_ops);
+
+-- Allow the new search mode
+ALTER TABLE project_settings
+DROP CONSTRAINT IF EXISTS vector_search_mode_check;
+
+ALTER TABLE project_settings
+ADD CONSTRAINT vector_search_mode_check
+CHECK (vector_search_mode IN ('full', 'halfvec', 'binary', 'matryoshka'));
+
+COMMENT ON COLUMN project_settings.vector_search_mode IS 'First-pass ANN representation: full (float32), halfvec (float16), binary (1-bit) or matryoshka (256-dim prefix), all but full rescored with full vectors';
+COMMENT ON COLUMN document_chunks.embedding_short IS
+    'Normalized first 256 dimensions of embedding (set by ingestion, or by trigger when omitted)';
+
+
+CREATE OR REPLACE FUNCTION vector_search_project_chunks_quantized(
+    query_embedding vector,
+    filter_project_id uuid,
+    match_threshold double precision DEFAULT 0.3,
+    chunks_per_search integer DEFAULT 20,
+    include_embedding boolean DEFAULT false,
+    quantization text DEFAULT 'halfvec',
+    rescore_candidates integer DEFAULT 100,
+    ef_search integer DEFAULT 100
+)
+RETURNS TABLE(
+    id uuid,
+    document_id uuid,
+    content text,
+    chunk_index integer,
+    created_at timestamp with time zone,
+    page_number integer,
+    char_count integer,
+    type jsonb,
+    original_content jsonb,
+    similarity double precision,
+    filename text,
+    embedding vector
+)
+LANGUAGE plpgsql
+VOLATILE
+AS $function$
+#variable_conflict use_column
+DECLARE
+    candidate_count integer := greatest(rescore_candidates, chunks_per_search);
+    candidate_ids uuid[];
+BEGIN
+    PERFORM set_config('hnsw.ef_search', greatest(ef_search, candidate_count)::text, true);
+    IF current_setting('hnsw.iterative_scan', true) IS NOT NULL THEN
+        PERFORM set_config('hnsw.iterative_scan', 'relaxed_order', true);
+    END IF;
+
+    -- Pass 1: approximate candidates from the compact index
+    IF quantization = 'halfvec' THEN
+        SELECT array_agg(candidate.id) INTO candidate_ids
+        FROM (
+            SELECT dc.id
+            FROM document_chunks dc
+            JOIN project_documents pd ON pd.id = dc.document_id
+            WHERE dc.project_id = filter_project_id
+              AND pd.processing_status = 'completed'
+            ORDER BY dc.embedding_half <=> query_embedding::halfvec(1536)
+            LIMIT candidate_count
+        ) candidate;
+    ELSIF quantization = 'binary' THEN
+        SELECT array_agg(candidate.id) INTO candidate_ids
+        FROM (
+            SELECT dc.id
+            FROM document_chunks dc
+            JOIN project_documents pd ON pd.id = dc.document_id
+            WHERE dc.project_id = filter_project_id
+              AND pd.processing_status = 'completed'
+            ORDER BY binary_quantize(dc.embedding)::bit(1536) <~> binary_quantize(query_embedding)
+            LIMIT candidate_count
+        ) candidate;
+    ELSIF quantization = 'matryoshka' THEN
+        -- Cosine distance ignores scale: the query prefix needs no re-normalizing
+        SELECT array_agg(candidate.id) INTO candidate_ids
+        FROM (
+            SELECT dc.id
+            FROM document_chunks dc
+            JOIN project_documents pd ON pd.id = dc.document_id
+            WHERE dc.project_id = filter_project_id
+              AND pd.processing_status = 'completed'
+            ORDER BY dc.embedding_short <=> subvector(query_embedding, 1, 256)::vector(256)
+            LIMIT candidate_count
+        ) candidate;
+    ELSE
+        RAISE EXCEPTION 'Unknown quantization: %', quantization;
+    END IF;
+
+    -- Pass 2: exact cosine similarity on the candidates only
+    RETURN QUERY
+    SELECT
+        dc.id,
+        dc.document_id,
+        dc.content,
+        dc.chunk_index,
+        dc.created_at,
+        dc.page_number,
+        dc.char_count,
+        dc.type::jsonb,
+        dc.original_content::jsonb,
+        1 - (dc.embedding <=> query_embedding) AS similarity,
+        pd.filename,
+        CASE WHEN include_embedding THEN dc.embedding END AS embedding
+    FROM
+        document_chunks dc
+        JOIN project_documents pd ON pd.id = dc.document_id
+    WHERE
+        dc.id = ANY(candidate_ids)
+        AND (1 - (dc.embedding <=> query_embedding)) > match_threshold
+    ORDER BY
+        dc.embedding <=> query_embedding ASC
+    LIMIT
+        chunks_per_search;
+END;
+$function$;
+
+COMMENT ON FUNCTION vector_search_project_chunks_quantized IS
+    'Project vector search: halfvec, binary or matryoshka-prefix HNSW candidates rescored with full-precision cosine similarity';
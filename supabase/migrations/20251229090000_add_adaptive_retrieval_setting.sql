@@ -0,0 +1,9 @@
+-- Migration: Add Adaptive Retrieval Setting
+-- Description: Adds adaptive_retrieval column to project_settings
+
+-- Adaptive retrieval is opt-in; existing projects always run their full strategy
+ALTER TABLE project_settings
+ADD COLUMN IF NOT EXISTS adaptive_retrieval BOOLEAN NOT NULL DEFAULT FALSE;
+
+-- Add comment for documentation
+COMMENT ON COLUMN project_settings.adaptive_retrieval IS 'Run a vector search first and only escalate to the configured strategy (keyword leg, query expansion) when it is not confident';
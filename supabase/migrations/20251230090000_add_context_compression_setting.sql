@@ -0,0 +1,9 @@
+-- Migration: Add Context Compression Setting
+-- Description: Adds context_compression column to project_settings
+
+-- Compression is opt-in; existing projects keep sending whole chunks
+ALTER TABLE project_settings
+ADD COLUMN IF NOT EXISTS context_compression BOOLEAN NOT NULL DEFAULT FALSE;
+
+-- Add comment for documentation
+COMMENT ON COLUMN project_settings.context_compression IS 'Send only the sentences of each context chunk most relevant to the question (plus neighbours)';
@@ -0,0 +1,21 @@
+-- Migration: Image asset reference lookup
+-- Description: Lets the app find which content-addressed image assets are still
+-- referenced by some chunk, so assets of deleted or re-ingested documents can
+-- be removed from the asset store once nothing points at them any more.
+
+CREATE INDEX IF NOT EXISTS idx_document_chunks_image_refs
+ON document_chunks USING gin ((original_content::jsonb -> 'image_refs'));
+
+CREATE OR REPLACE FUNCTION referenced_image_refs(refs text[])
+RETURNS TABLE(ref text)
+LANGUAGE sql
+STABLE
+AS $function$
+SELECT DISTINCT r.ref
+FROM
+    document_chunks dc,
+    jsonb_array_elements_text(dc.original_content::jsonb -> 'image_refs') AS r(ref)
+WHERE
+    (dc.original_content::jsonb -> 'image_refs') ?| refs
+    AND r.ref = ANY(refs);
+$function$;
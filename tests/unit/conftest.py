@@ -0,0 +1,109 @@
+"""Shared fakes for the unit tests."""
+
+import pytest
+
+
+class _FakeRPC:
+    """Records a Supabase RPC call, its column selection, and returns canned rows."""
+    
+    def __init__(self, rows=None):
+        self.rows = rows or []
+        self.calls = []
+    
+    def rpc(self, name, params):
+        self.calls.append({"name": name, "params": params, "select": None})
+        return self
+    
+    def select(self, *columns):
+        self.calls[-1]["select"] = list(columns)
+        return self
+    
+    def execute(self):
+        from types import SimpleNamespace
+        return SimpleNamespace(data=self.rows)
+
+
+class _FakeJSONRedis:
+    """Dict-backed stand-in for the JSON Redis methods."""
+    
+    def __init__(self):
+        self.store = {}
+    
+    def get(self, key):
+        return self.store.get(key)
+    
+    def get_many(self, keys):
+        return [self.store.get(key) for key in keys]
+    
+    def set(self, key, value, expire=None):
+        self.store[key] = value
+        return True
+    
+    def incr(self, key, amount=1):
+        self.store[key] = int(self.store.get(key) or 0) + amount
+        return self.store[key]
+    
+    def delete(self, key):
+        return self.store.pop(key, None) is not None
+
+
+class _FakeBinaryRedis:
+    """Dict-backed stand-in for the binary Redis methods."""
+    
+    def __init__(self):
+        self.store = {}
+    
+    def get_bytes(self, key):
+        return self.store.get(key)
+    
+    def set_bytes(self, key, value, expire=None):
+        self.store[key] = value
+        return True
+
+
+class _FakeAppendRedis:
+    """Dict-backed stand-in for the append/hash Redis methods."""
+    
+    def __init__(self):
+        self.store = {}
+    
+    def append_bytes(self, key, value):
+        self.store[key] = self.store.get(key, b"") + value
+        return len(self.store[key])
+    
+    def get_range_bytes(self, key, start, end=-1):
+        return self.store.get(key, b"")[start:]
+    
+    def set_hash(self, name, mapping):
+        self.store.setdefault(name, {}).update(mapping)
+        return True
+    
+    def get_hash_field(self, name, key):
+        return self.store.get(name, {}).get(key)
+    
+    def expire(self, key, seconds):
+        return True
+
+
+@pytest.fixture
+def fake_rpc():
+    """Supabase client stand-in that records RPC calls."""
+    return _FakeRPC()
+
+
+@pytest.fixture
+def json_redis():
+    """In-memory stand-in for the JSON RedisService methods."""
+    return _FakeJSONRedis()
+
+
+@pytest.fixture
+def binary_redis():
+    """In-memory stand-in for the binary RedisService methods."""
+    return _FakeBinaryRedis()
+
+
+@pytest.fixture
+def append_redis():
+    """In-memory stand-in for the append/hash RedisService methods."""
+    return _FakeAppendRedis()
@@ -0,0 +1,87 @@
+"""Unit tests for adaptive retrieval."""
+
+
+class TestAdaptiveRetrieval:
+    """Tests for the adaptive retrieval controller."""
+    
+    SETTINGS = {
+        "project_id": "p1",
+        "adaptive_retrieval": True,
+        "similarity_threshold": 0.3,
+        "final_context_size": 2,
+    }
+    
+    def _pipeline(self, first_pass, redis):
+        from src.rag.pipeline import RAGPipeline
+        from src.rag.adaptive import AdaptiveRetrievalController, AdaptiveStats
+        
+        pipeline = RAGPipeline()
+        pipeline.adaptive = AdaptiveRetrievalController(margin=0.25, stats=AdaptiveStats(redis=redis))
+        calls = []
+        pipeline._basic_retrieval = lambda *args: calls.append("basic") or first_pass
+        pipeline._hybrid_retrieval = lambda *args: calls.append("hybrid") or [{"id": "k"}, {"id": "a"}]
+        pipeline._multi_query_hybrid = lambda *args: calls.append("multi-query-hybrid") or [{"id": "a"}]
+        return pipeline, calls
+    
+    def test_confident_first_pass_skips_escalation(self, json_redis):
+        """A strong, full vector pass is returned without expansion or keyword search."""
+        first_pass = [{"id": "a", "similarity": 0.8}, {"id": "b", "similarity": 0.6}]
+        pipeline, calls = self._pipeline(first_pass, json_redis)
+        
+        chunks = pipeline._retrieve_uncached("q", ["d"], self.SETTINGS, "multi-query-hybrid")
+        
+        assert chunks == first_pass and calls == ["basic"]
+        assert pipeline.adaptive.stats.get("p1")["confident"] == 1
+    
+    def test_escalation_follows_the_weakness(self, json_redis):
+        """Too few results add the keyword leg; a weak top hit runs full expansion."""
+        pipeline, calls = self._pipeline([{"id": "a", "similarity": 0.8}], json_redis)
+        chunks = pipeline._retrieve_uncached("q", ["d"], self.SETTINGS, "multi-query-hybrid")
+        
+        assert calls == ["basic", "hybrid"] and chunks[0]["id"] == "k"
+        
+        pipeline._basic_retrieval = lambda *args: calls.append("basic") or [{"id": "a", "similarity": 0.4}]
+        pipeline._retrieve_uncached("q", ["d"], self.SETTINGS, "multi-query-hybrid")
+        
+        assert calls[-1] == "multi-query-hybrid"
+        stats = pipeline.adaptive.stats.get("p1")
+        assert stats["hybrid"] == stats["hybrid:helped"] == 1
+        assert stats["multi-query-hybrid"] == 1 and stats["multi-query-hybrid:helped"] == 0
+    
+    def test_hybrid_escalation_adds_only_the_keyword_leg(self, json_redis):
+        """Escalating to hybrid fuses the first pass with a keyword search, no second vector RPC."""
+        from src.rag.pipeline import RAGPipeline
+        from src.rag.adaptive import AdaptiveRetrievalController, AdaptiveStats
+        
+        class FakeKeyword:
+            def search(self, query, document_ids, chunks_per_search=10):
+                return [{"id": "k"}, {"id": "a"}]
+        
+        class FailingVector:
+            def search(self, **kwargs):
+                raise AssertionError("vector leg searched twice")
+        
+        pipeline = RAGPipeline()
+        pipeline.adaptive = AdaptiveRetrievalController(margin=0.25, stats=AdaptiveStats(redis=json_redis))
+        pipeline.hybrid_search.keyword_search = FakeKeyword()
+        pipeline.hybrid_search.vector_search = FailingVector()
+        pipeline._basic_retrieval = lambda *args: [{"id": "a", "similarity": 0.8}]
+        
+        chunks = pipeline._retrieve_uncached("q", ["d"], {**self.SETTINGS, "project_id": None}, "hybrid")
+        
+        assert [c["id"] for c in chunks] == ["a", "k"]
+    
+    def test_stats_read_in_one_call_and_never_raises(self, json_redis):
+        """Counters come from a single MGET; Redis errors read as zeros."""
+        from src.rag.adaptive import AdaptiveStats
+        
+        class BrokenRedis:
+            def get_many(self, keys):
+                raise ConnectionError("down")
+        
+        json_redis.get = None
+        stats = AdaptiveStats(redis=json_redis)
+        stats.record("p1", "hybrid", helped=True)
+        
+        assert stats.get("p1")["hybrid:helped"] == 1
+        assert set(AdaptiveStats(redis=BrokenRedis()).get("p1").values()) == {0}
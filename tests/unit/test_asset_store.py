@@ -0,0 +1,101 @@
+"""Unit tests for the asset store."""
+
+
+class _FakeAssets:
+    """Asset store stand-in recording which references were fetched."""
+    
+    def __init__(self, images):
+        self.images = images
+        self.fetched = []
+    
+    def get_images(self, refs):
+        self.fetched.extend(refs)
+        return {ref: self.images[ref] for ref in refs if ref in self.images}
+
+
+class TestAssetStore:
+    """Tests for externalized chunk images."""
+    
+    def test_disk_round_trip_is_content_addressed(self, tmp_path):
+        """Identical images share one reference and read back unchanged."""
+        import base64
+        from src.services.storage.asset_store import AssetStore
+        
+        store = AssetStore(backend="disk", root=str(tmp_path))
+        image = base64.b64encode(b"fake image bytes").decode("ascii")
+        
+        refs = store.put_images([image, "data:image/png;base64," + image])
+        
+        assert refs[0] == refs[1] == AssetStore.make_ref(b"fake image bytes")
+        assert store.get_images(refs + ["missing"]) == {refs[0]: image}
+        assert store.resolve({"text": "t", "image_refs": refs[:1]}) == {"text": "t", "images": [image]}
+    
+    def test_resolve_many_and_delete(self, tmp_path):
+        """Refs of many chunks resolve in one batch; deleted assets are gone."""
+        import base64
+        from src.services.storage.asset_store import AssetStore
+        
+        store = AssetStore(backend="disk", root=str(tmp_path))
+        image = base64.b64encode(b"slide").decode("ascii")
+        ref = store.put_images([image])[0]
+        chunks = [
+            {"id": "c1", "original_content": {"text": "a", "image_refs": [ref]}},
+            {"id": "c2", "original_content": {"text": "b"}},
+        ]
+        
+        resolved = store.resolve_many(chunks)
+        
+        assert [c["original_content"] for c in resolved] == [
+            {"text": "a", "images": [image]},
+            {"text": "b"},
+        ]
+        assert store.delete([ref, ref]) == 1
+        assert store.get_images([ref]) == {}
+    
+    def test_inline_and_referenced_copies_share_digest(self, binary_redis):
+        """An inline image and its asset ref are deduplicated as one image."""
+        import base64
+        from src.rag.image_selector import ImageSelector
+        from src.services.storage.asset_store import AssetStore
+        
+        image = base64.b64encode(b"same slide").decode("ascii")
+        ref = AssetStore.make_ref(b"same slide")
+        assets = _FakeAssets({ref: image})
+        selector = ImageSelector(budgets={"openai": 5}, redis=binary_redis, assets=assets)
+        selector._resize = lambda image, digest: image
+        chunks = [
+            {"id": "c1", "original_content": {"text": "a", "images": [image]}},
+            {"id": "c2", "original_content": {"text": "b", "image_refs": [ref]}},
+        ]
+        
+        selected = selector.select(chunks)
+        
+        assert ImageSelector._digest(image) == ref
+        assert assets.fetched == []
+        assert [c["original_content"]["images"] for c in selected] == [[image], []]
+    
+    def test_inline_backend_keeps_images_in_row(self):
+        """The inline backend uploads nothing."""
+        from src.services.storage.asset_store import AssetStore
+        
+        assert AssetStore(backend="inline").put_images(["aW1n"]) is None
+    
+    def test_selector_fetches_only_selected_references(self, binary_redis):
+        """Referenced images outside the budget are never downloaded."""
+        from src.rag.image_selector import ImageSelector
+        
+        assets = _FakeAssets({"r1": "aW1nMQ==", "r2": "aW1nMg==", "r3": "aW1nMw=="})
+        selector = ImageSelector(budgets={"openai": 2}, redis=binary_redis, assets=assets)
+        selector._resize = lambda image, digest: image
+        chunks = [
+            {"id": "c1", "original_content": {"text": "a", "image_refs": ["r1", "r2"]}},
+            {"id": "c2", "original_content": {"text": "b", "image_refs": ["r3"]}},
+        ]
+        
+        selected = selector.select(chunks)
+        
+        assert assets.fetched == ["r1", "r3"]
+        assert [c["original_content"] for c in selected] == [
+            {"text": "a", "images": ["aW1nMQ=="]},
+            {"text": "b", "images": ["aW1nMw=="]},
+        ]
@@ -0,0 +1,65 @@
+"""Unit tests for the async API."""
+
+
+class TestAsyncAPI:
+    """Tests for the async pipeline API."""
+    
+    def test_asearch_uses_async_embedding(self):
+        """asearch embeds with aembed_query and returns the store's matches."""
+        import asyncio
+        from src.rag.vector_store import InMemoryVectorStore
+        from src.rag.vector_search import VectorSearch
+        
+        store = InMemoryVectorStore()
+        store.upsert([
+            {"id": f"doc-1-{i}", "document_id": "doc-1", "content": f"chunk {i}", "embedding": vector}
+            for i, vector in enumerate([[1, 0], [0, 1]])
+        ])
+        search = VectorSearch(store=store)
+        
+        class FakeEmbeddings:
+            async def aembed_query(self, text):
+                return [0.0, 1.0]
+        
+        search.embeddings = FakeEmbeddings()
+        chunks = asyncio.run(search.asearch("q", ["doc-1"], match_threshold=0.5))
+        
+        assert [c["id"] for c in chunks] == ["doc-1-1"]
+    
+    def test_provider_default_runs_sync_chat_off_the_loop(self):
+        """Providers without native async methods fall back to a worker thread."""
+        import asyncio
+        import threading
+        from src.services.llm.providers.base import BaseLLMProvider
+        
+        class SyncProvider(BaseLLMProvider):
+            def chat(self, messages, temperature=0, max_tokens=None, **kwargs):
+                return threading.current_thread().name
+            
+            def chat_with_structured_output(self, messages, output_schema, temperature=0, **kwargs):
+                return None
+        
+        assert asyncio.run(SyncProvider().achat([])) != threading.current_thread().name
+    
+    def test_aprocess_matches_process(self, monkeypatch):
+        """aprocess builds the same context and result as process."""
+        import asyncio
+        import src.rag.pipeline as pipeline_module
+        from src.rag.pipeline import RAGPipeline
+        
+        pipeline = RAGPipeline()
+        pipeline._prepare_context = lambda query, document_ids, settings: (
+            "basic", "openai", [{"id": "c1"}], ["text"], [], [], []
+        )
+        
+        async def fake_ainvoke(**kwargs):
+            return f"answer from {kwargs['texts']}"
+        
+        monkeypatch.setattr(pipeline_module, "aprepare_prompt_and_invoke_llm", fake_ainvoke)
+        monkeypatch.setattr(pipeline_module, "prepare_prompt_and_invoke_llm", lambda **kwargs: f"answer from {kwargs['texts']}")
+        
+        async_result = asyncio.run(pipeline.aprocess("q", ["d"], {}))
+        
+        assert async_result == pipeline.process("q", ["d"], {})
+        assert async_result["answer"] == "answer from ['text']"
+        assert async_result["chunks_used"] == 1
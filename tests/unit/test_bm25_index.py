@@ -0,0 +1,76 @@
+"""Unit tests for the BM25 index."""
+
+import pytest
+
+
+class TestBM25Index:
+    """Tests for the in-process BM25 keyword index."""
+    
+    def _rows(self, texts, document_id="doc-1"):
+        return [
+            {"id": f"{document_id}-{i}", "document_id": document_id, "content": text, "filename": "a.pdf"}
+            for i, text in enumerate(texts)
+        ]
+    
+    def test_ranks_rare_terms_and_filters_documents(self):
+        """Rare query terms weigh more; results respect the document filter."""
+        from src.rag.bm25_index import BM25Index
+        
+        index = BM25Index()
+        index.add(self._rows(["the revenue grew", "revenue and margin", "margin margin"]))
+        index.add(self._rows(["quarterly revenue"], "doc-2"))
+        
+        results = index.search("margin revenue", ["doc-1"], chunks_per_search=5)
+        
+        assert [r["id"] for r in results][:2] == ["doc-1-1", "doc-1-2"]
+        assert {r["document_id"] for r in results} == {"doc-1"}
+        assert results[0]["rank"] > results[-1]["rank"] > 0
+        assert index.search("the and", None) == []
+    
+    def test_delete_and_readd_document(self):
+        """Deleted documents stop matching; re-adding replaces old rows."""
+        from src.rag.bm25_index import BM25Index
+        
+        index = BM25Index()
+        index.add(self._rows(["alpha beta"]) + self._rows(["gamma"], "doc-2"))
+        
+        assert index.delete_document("doc-1") == 1
+        assert index.search("alpha", None) == []
+        assert index.deleted_ratio == pytest.approx(0.5)
+        
+        index.add(self._rows(["alpha again"]))
+        assert [r["content"] for r in index.search("alpha", None)] == ["alpha again"]
+        assert index.compacted().count == 2
+    
+    def test_snapshot_round_trip_through_manager(self, tmp_path):
+        """Snapshots persist postings and are reloaded when another writer saves."""
+        from src.rag.bm25_index import BM25Index, BM25IndexManager
+        
+        writer = BM25IndexManager(backend="disk", root=str(tmp_path))
+        reader = BM25IndexManager(backend="disk", root=str(tmp_path))
+        index = BM25Index()
+        index.add(self._rows(["alpha beta", "beta gamma"]))
+        writer.save("p1", index)
+        
+        assert reader.get("p1").search("gamma", None)[0]["id"] == "doc-1-1"
+        
+        writer.update("p1", lambda idx: idx.add(self._rows(["delta"], "doc-2")))
+        reloaded = reader.get("p1")
+        
+        assert reloaded.search("delta", None)[0]["id"] == "doc-2-0"
+        assert reloaded.search("beta", None) == index.search("beta", None)
+    
+    def test_keyword_search_shape_matches_postgres_path(self, tmp_path):
+        """BM25KeywordSearch returns the same columns as the FTS RPC."""
+        from src.rag.bm25_index import BM25Index, BM25IndexManager, BM25KeywordSearch
+        from src.rag.keyword_search import LEAN_COLUMNS
+        
+        manager = BM25IndexManager(backend="disk", root=str(tmp_path))
+        index = BM25Index()
+        index.add(self._rows(["alpha beta"]))
+        manager.save("p1", index)
+        
+        results = BM25KeywordSearch("p1", manager).search("alpha", ["doc-1"])
+        
+        assert list(results[0]) == list(LEAN_COLUMNS)
+        assert results[0]["filename"] == "a.pdf"
@@ -0,0 +1,23 @@
+"""Unit tests for the shared search pool."""
+
+
+class TestSearchPool:
+    """Tests for the shared search pool."""
+    
+    def test_search_many_runs_inline_on_a_pool_worker(self):
+        """Fan-out from inside the pool runs sequentially instead of deadlocking."""
+        from src.rag.concurrency import get_search_executor, in_search_pool
+        from src.rag.vector_store import PgVectorStore
+        
+        store = PgVectorStore()
+        threads = []
+        store.search = lambda embedding, *args: threads.append(in_search_pool()) or [{"id": str(embedding)}]
+        
+        def nested():
+            return store.search_many([[1.0], [2.0], [3.0]], ["doc"])
+        
+        results = get_search_executor().submit(nested).result(timeout=5)
+        
+        assert not in_search_pool()
+        assert [r[0]["id"] for r in results] == ["[1.0]", "[2.0]", "[3.0]"]
+        assert threads == [True, True, True]
@@ -0,0 +1,73 @@
+"""Unit tests for context compression."""
+
+
+class _KeywordEmbeddings:
+    """Embeds text as [mentions keyword, does not]; counts document calls."""
+    
+    def __init__(self, keyword: str):
+        self.keyword = keyword
+        self.document_calls = 0
+    
+    def _vector(self, text):
+        return [1.0, 0.0] if self.keyword in text.lower() else [0.0, 1.0]
+    
+    def embed_query(self, text):
+        return self._vector(text)
+    
+    def embed_documents(self, texts):
+        self.document_calls += 1
+        return [self._vector(text) for text in texts]
+
+
+class TestContextCompressor:
+    """Tests for query-focused extractive compression."""
+    
+    def _compressor(self, **kwargs):
+        from src.rag.context_compressor import ContextCompressor
+        
+        compressor = ContextCompressor(cache_size=16, **kwargs)
+        compressor.embeddings = _KeywordEmbeddings("revenue")
+        return compressor
+    
+    def test_keeps_relevant_sentences_with_neighbours(self):
+        """The best sentences survive with their neighbours; gaps are marked."""
+        from src.rag.context_compressor import GAP_MARKER
+        
+        sentences = [f"Filler sentence {i}." for i in range(10)]
+        sentences[3] = "Revenue grew twelve percent."
+        sentences[8] = "Revenue guidance was raised."
+        compressor = self._compressor(max_sentences=2, neighbours=1)
+        
+        [compressed] = compressor.compress_texts("What happened to revenue?", [" ".join(sentences)])
+        
+        assert compressed == " ".join(sentences[2:5] + [GAP_MARKER] + sentences[7:10])
+    
+    def test_explicit_zero_arguments_are_kept(self):
+        """0 is a value, not a request for the configured default."""
+        from src.rag.context_compressor import ContextCompressor
+        
+        compressor = ContextCompressor(max_sentences=0, neighbours=0, cache_size=0)
+        
+        assert (compressor.max_sentences, compressor.neighbours, compressor.cache_size) == (0, 0, 0)
+    
+    def test_short_texts_are_untouched(self):
+        """Texts that would be kept whole are not embedded at all."""
+        compressor = self._compressor(max_sentences=4, neighbours=1)
+        texts = ["One. Two. Three.", ""]
+        
+        assert compressor.compress_texts("revenue", texts) == texts
+        assert compressor.embeddings.document_calls == 0
+    
+    def test_sentence_embeddings_are_cached(self):
+        """Repeated chunks reuse cached sentence embeddings."""
+        text = " ".join(f"Sentence {i} about revenue." if i == 5 else f"Sentence {i}." for i in range(12))
+        chunks = [{"id": "c1", "original_content": {"text": text, "tables": []}}]
+        compressor = self._compressor(max_sentences=1, neighbours=0)
+        
+        first = compressor.compress_chunks("revenue", chunks)
+        second = compressor.compress_chunks("revenue", chunks)
+        
+        assert first[0]["original_content"]["text"] == "Sentence 5 about revenue."
+        assert second == first
+        assert chunks[0]["original_content"]["text"] == text
+        assert compressor.embeddings.document_calls == 1
@@ -0,0 +1,56 @@
+"""Unit tests for context packing."""
+
+
+class TestContextPacker:
+    """Tests for token-budgeted context packing."""
+    
+    def _chunk(self, chunk_id, index, text, tables=None):
+        return {
+            "id": chunk_id,
+            "document_id": "doc",
+            "chunk_index": index,
+            "original_content": {"text": text, "tables": tables or []},
+        }
+    
+    def test_tables_are_compacted(self):
+        """Markup is dropped; rows and cells survive."""
+        from src.rag.context_packer import compact_table
+        
+        html = '<table class="x"><tr><th>Year</th><th>Revenue</th></tr><tr><td>2024</td><td> 1.2M </td></tr></table>'
+        
+        assert compact_table(html) == "Year | Revenue\n2024 | 1.2M"
+    
+    def test_overlap_with_packed_neighbour_is_dropped(self):
+        """Text repeated at the start of the next chunk is only sent once."""
+        from src.rag.context_packer import ContextPacker
+        
+        shared = "The quarterly revenue grew by twelve percent year over year. "
+        first = self._chunk("a", 0, "Intro paragraph. " + shared)
+        second = self._chunk("b", 1, shared + "Margins were flat.")
+        
+        packed = ContextPacker(budgets={"openai": 10_000}).pack([second, first])
+        
+        assert packed[0]["original_content"]["text"] == shared + "Margins were flat."
+        assert packed[1]["original_content"]["text"] == "Intro paragraph. "
+    
+    def test_budget_skips_chunks_that_do_not_fit(self):
+        """Relevance order is kept and a smaller later chunk can fill the gap."""
+        from src.rag.context_packer import ContextPacker, count_tokens, CHUNK_OVERHEAD_TOKENS
+        
+        big, small = "word " * 400, "short answer"
+        budget = CHUNK_OVERHEAD_TOKENS * 2 + count_tokens(small) + count_tokens(big) // 2
+        chunks = [self._chunk("s1", 0, small), self._chunk("big", 5, big), self._chunk("s2", 9, small)]
+        
+        packed = ContextPacker(budgets={"openai": budget}).pack(chunks)
+        
+        assert [c["id"] for c in packed] == ["s1", "s2"]
+    
+    def test_explicit_zero_budget_is_kept(self):
+        """budget=0 is honoured instead of falling back to the provider budget."""
+        from src.rag.context_packer import ContextPacker
+        
+        packer = ContextPacker(budgets={"openai": 10_000})
+        chunks = [self._chunk("a", 0, "some text"), self._chunk("b", 5, "more text")]
+        
+        assert [c["original_content"]["text"] for c in packer.pack(chunks)] == ["some text", "more text"]
+        assert [c["original_content"]["text"] for c in packer.pack(chunks, budget=0)] == [""]
@@ -0,0 +1,76 @@
+"""Unit tests for the document metadata cache."""
+
+
+class _FakeTable:
+    """Records project_documents lookups and returns rows for the requested ids."""
+    
+    def __init__(self, rows):
+        self.rows = {row["id"]: row for row in rows}
+        self.requested = []
+    
+    def table(self, name):
+        return self
+    
+    def select(self, *columns):
+        return self
+    
+    def in_(self, column, values):
+        self.requested.append(list(values))
+        self._ids = values
+        return self
+    
+    def execute(self):
+        from types import SimpleNamespace
+        return SimpleNamespace(data=[self.rows[i] for i in self._ids if i in self.rows])
+
+
+class TestDocumentMetadataCache:
+    """Tests for the document metadata cache and its repository wiring."""
+    
+    ROW = {"id": "d1", "filename": "a.pdf", "project_id": "p1", "clerk_id": "u1", "processing_status": "completed"}
+    
+    def _repo(self, redis):
+        from src.services.cache.document_cache import DocumentMetadataCache
+        from src.services.database.repositories.document_repo import DocumentRepository
+        
+        repo = DocumentRepository()
+        repo.cache = DocumentMetadataCache(max_items=10, ttl=60, local_ttl=60, redis=redis, enabled=True)
+        repo.db = _FakeTable([self.ROW])
+        return repo
+    
+    def test_misses_fetched_once_then_served_from_cache(self, json_redis):
+        """Only uncached ids hit the database, in a single query."""
+        repo = self._repo(json_redis)
+        
+        assert repo.get_metadata(["d1", "missing"])["d1"]["filename"] == "a.pdf"
+        assert repo.get_metadata(["d1"]) == {"d1": self.ROW}
+        
+        repo.cache.clear_local()
+        assert repo.get_metadata(["d1"])["d1"]["clerk_id"] == "u1"
+        assert repo.db.requested == [["d1", "missing"]]
+    
+    def test_writes_invalidate_both_tiers(self, json_redis):
+        """An update drops the entry locally and in Redis."""
+        repo = self._repo(json_redis)
+        repo.get_metadata(["d1"])
+        
+        repo.cache.invalidate("d1")
+        repo.get_metadata(["d1"])
+        
+        assert repo.db.requested == [["d1"], ["d1"]]
+    
+    def test_redis_misses_read_in_one_round_trip(self, json_redis):
+        """Local-tier misses are fetched from Redis with a single MGET."""
+        from src.services.cache.document_cache import DocumentMetadataCache
+        
+        cache = DocumentMetadataCache(max_items=10, ttl=60, local_ttl=60, redis=json_redis, enabled=True)
+        cache.set_many([self.ROW, {**self.ROW, "id": "d2"}])
+        cache.clear_local()
+        
+        calls = []
+        json_redis.get = lambda key: calls.append(("get", key))
+        get_many = json_redis.get_many
+        json_redis.get_many = lambda keys: calls.append(("get_many", keys)) or get_many(keys)
+        
+        assert set(cache.get_many(["d1", "d2", "missing"])) == {"d1", "d2"}
+        assert calls == [("get_many", [cache.make_key(i) for i in ("d1", "d2", "missing")])]
@@ -0,0 +1,63 @@
+"""Unit tests for the query embedding cache."""
+
+
+class TestEmbeddingCache:
+    """Tests for the two-tier query embedding cache."""
+    
+    def _cache(self, redis, **kwargs):
+        from src.services.cache.embedding_cache import EmbeddingCache
+        return EmbeddingCache(redis=redis, enabled=True, **kwargs)
+    
+    def test_key_normalizes_text(self, binary_redis):
+        """Whitespace and case differences map to the same key."""
+        cache = self._cache(binary_redis)
+        
+        assert cache.make_key("openai", "m", 3, "  What IS   this? ") == cache.make_key("openai", "m", 3, "what is this?")
+        assert cache.make_key("openai", "m", 3, "q") != cache.make_key("openai", "m", 4, "q")
+    
+    def test_local_then_redis_hits(self, binary_redis):
+        """Vectors are stored as float32 bytes and served from both tiers."""
+        cache = self._cache(binary_redis)
+        key = cache.make_key("openai", "m", 3, "q")
+        
+        assert cache.get(key) is None
+        cache.set(key, [0.5, 0.25, -1.0])
+        assert len(cache.redis.store[key]) == 3 * 4
+        
+        assert cache.get(key) == [0.5, 0.25, -1.0]
+        cache.clear_local()
+        assert cache.get(key) == [0.5, 0.25, -1.0]
+        
+        stats = cache.stats()
+        assert (stats["misses"], stats["local_hits"], stats["redis_hits"]) == (1, 1, 1)
+    
+    def test_lru_is_bounded(self, binary_redis):
+        """The in-process tier evicts the least recently used entry."""
+        cache = self._cache(binary_redis, max_items=2)
+        
+        for name in ["a", "b", "c"]:
+            cache.set(name, [1.0])
+        
+        assert list(cache._local.keys()) == ["b", "c"]
+    
+    def test_async_redis_tier_runs_off_the_loop(self, binary_redis):
+        """aget/aset reach Redis from a worker thread, never the event loop thread."""
+        import asyncio
+        import threading
+        
+        cache = self._cache(binary_redis)
+        loop_thread = threading.get_ident()
+        redis_threads = []
+        get_bytes, set_bytes = cache.redis.get_bytes, cache.redis.set_bytes
+        cache.redis.get_bytes = lambda *a, **k: redis_threads.append(threading.get_ident()) or get_bytes(*a, **k)
+        cache.redis.set_bytes = lambda *a, **k: redis_threads.append(threading.get_ident()) or set_bytes(*a, **k)
+        
+        async def run():
+            assert await cache.aget("k") is None
+            await cache.aset("k", [1.0, 2.0])
+            cache.clear_local()
+            return await cache.aget("k")
+        
+        assert asyncio.run(run()) == [1.0, 2.0]
+        assert len(redis_threads) == 3
+        assert loop_thread not in redis_threads
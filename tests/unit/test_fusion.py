@@ -0,0 +1,39 @@
+"""Unit tests for result fusion."""
+
+import pytest
+
+from src.rag.rrf import reciprocal_rank_fusion
+
+
+class TestFusion:
+    """Tests for the top-k fusion engine."""
+    
+    LISTS = [
+        [{"id": "a", "similarity": 0.9}, {"id": "b", "similarity": 0.8}, {"id": "c", "similarity": 0.1}],
+        [{"id": "b", "rank": 12.0}, {"id": "d", "rank": 6.0}, {"id": "a", "rank": 3.0}],
+    ]
+    
+    def test_top_k_is_prefix_of_full_ranking(self):
+        """Heap selection returns the same head as the full sort."""
+        full = reciprocal_rank_fusion(self.LISTS, weights=[0.7, 0.3])
+        top = reciprocal_rank_fusion(self.LISTS, weights=[0.7, 0.3], top_k=2)
+        
+        assert top == full[:2]
+    
+    def test_inputs_are_not_mutated(self):
+        """Only returned chunks are copied; inputs never gain score keys."""
+        reciprocal_rank_fusion(self.LISTS, top_k=1)
+        
+        assert all("rrf_score" not in chunk for results in self.LISTS for chunk in results)
+    
+    def test_combsum_and_combmnz(self):
+        """Score fusion uses normalized scores; CombMNZ rewards agreement."""
+        from src.rag.fusion import fuse
+        
+        combsum = fuse(self.LISTS, method="combsum")
+        combmnz = fuse(self.LISTS, method="combmnz")
+        
+        assert combsum[0]["id"] == "b"
+        assert combsum[0]["fusion_score"] == pytest.approx(0.5 * (0.875 + 1.0))
+        assert combmnz[0]["fusion_score"] == pytest.approx(2 * combsum[0]["fusion_score"])
+        assert [c["id"] for c in combmnz][-1] in {"c", "d"}
@@ -0,0 +1,67 @@
+"""Unit tests for hybrid search."""
+
+
+class _SlowLeg:
+    """Fake search leg that sleeps before returning canned results."""
+    
+    def __init__(self, results, delay=0.1):
+        self.results = results
+        self.delay = delay
+    
+    def search(self, **kwargs):
+        import time
+        time.sleep(self.delay)
+        return self.results
+
+
+class TestHybridSearch:
+    """Tests for hybrid search execution modes."""
+    
+    def _build(self, mode):
+        from src.rag.hybrid_search import HybridSearch
+        
+        search = HybridSearch(mode=mode)
+        search.vector_search = _SlowLeg([{"id": "a"}, {"id": "b"}])
+        search.keyword_search = _SlowLeg([{"id": "b"}, {"id": "c"}])
+        return search
+    
+    def test_concurrent_legs_overlap(self):
+        """Concurrent mode should cost roughly the slower leg, not the sum."""
+        search = self._build("concurrent")
+        
+        results, timings = search.search_with_timings(query="q", document_ids=["d"])
+        
+        assert results[0]["id"] == "b"
+        assert timings["vector_ms"] >= 100
+        assert timings["keyword_ms"] >= 100
+        assert timings["total_ms"] < timings["vector_ms"] + timings["keyword_ms"]
+    
+    def test_sequential_matches_concurrent(self):
+        """Both modes should produce identical fused results."""
+        sequential = self._build("sequential").search(query="q", document_ids=["d"])
+        concurrent = self._build("concurrent").search(query="q", document_ids=["d"])
+        
+        assert [c["id"] for c in sequential] == [c["id"] for c in concurrent]
+    
+    def test_server_mode_uses_single_rpc(self):
+        """Server mode embeds once and issues one hybrid RPC."""
+        from types import SimpleNamespace
+        from src.rag.hybrid_search import HybridSearch
+        
+        calls = []
+        
+        class FakeDB:
+            def rpc(self, name, params):
+                calls.append((name, params))
+                return SimpleNamespace(execute=lambda: SimpleNamespace(data=[{"id": "b", "rrf_score": 0.02}]))
+        
+        search = HybridSearch(mode="server")
+        search.db = FakeDB()
+        search.vector_search.embeddings = SimpleNamespace(embed_query=lambda text: [0.1, 0.2])
+        
+        results, timings = search.search_with_timings(query="q", document_ids=["d"])
+        
+        assert [name for name, _ in calls] == ["hybrid_search_document_chunks"]
+        assert calls[0][1]["query_embedding"] == [0.1, 0.2]
+        assert results == [{"id": "b", "rrf_score": 0.02}]
+        assert "rpc_ms" in timings
@@ -0,0 +1,58 @@
+"""Unit tests for image selection."""
+
+import pytest
+
+
+class TestImageSelector:
+    """Tests for multimodal image selection and downscaling."""
+    
+    @staticmethod
+    def _chunk(chunk_id, images):
+        return {"id": chunk_id, "original_content": {"text": chunk_id, "images": images}}
+    
+    @staticmethod
+    def _selector(redis, **kwargs):
+        from src.rag.image_selector import ImageSelector
+        
+        return ImageSelector(redis=redis, **kwargs)
+    
+    def test_round_robin_within_budget_and_deduplicated(self, binary_redis):
+        """Each chunk's first image comes before any second; repeats are sent once."""
+        selector = self._selector(binary_redis, budgets={"openai": 3})
+        selector._resize = lambda image, digest: image
+        chunks = [
+            self._chunk("c1", ["a1", "a2", "a3"]),
+            self._chunk("c2", ["data:image/png;base64,a1", "b2"]),
+            self._chunk("c3", []),
+        ]
+        
+        selected = selector.select(chunks)
+        
+        assert [c["original_content"]["images"] for c in selected] == [["a1", "a2"], ["b2"], []]
+        assert chunks[0]["original_content"]["images"] == ["a1", "a2", "a3"]
+    
+    def test_provider_budget(self, binary_redis):
+        """Unknown providers fall back to the OpenAI budget."""
+        selector = self._selector(binary_redis, budgets={"openai": 6, "ollama": 2})
+        
+        assert selector.budget_for("ollama") == 2
+        assert selector.budget_for("other") == 6
+    
+    def test_downscales_and_caches_resized_variant(self, binary_redis):
+        """Large images are shrunk to JPEG once and then served from the cache."""
+        Image = pytest.importorskip("PIL.Image")
+        import base64
+        import io
+        
+        buffer = io.BytesIO()
+        Image.new("RGBA", (2000, 1000), (200, 10, 10, 255)).save(buffer, format="PNG")
+        original = base64.b64encode(buffer.getvalue()).decode("ascii")
+        selector = self._selector(binary_redis, max_dimension=500)
+        
+        resized = selector.shrink(original)
+        
+        with Image.open(io.BytesIO(base64.b64decode(resized))) as image:
+            assert image.format == "JPEG"
+            assert image.size == (500, 250)
+        assert len(selector.redis.store) == 1
+        assert selector.shrink(original) == resized
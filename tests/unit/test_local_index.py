@@ -0,0 +1,85 @@
+"""Unit tests for the local vector index."""
+
+import numpy as np
+import pytest
+
+
+class TestLocalVectorIndex:
+    """Tests for the memory-mapped local vector index."""
+    
+    def _rows(self, vectors, document_id="doc-1", start=0):
+        return [
+            {
+                "id": f"{document_id}-{start + i}",
+                "document_id": document_id,
+                "content": f"chunk {start + i}",
+                "chunk_index": start + i,
+                "filename": "a.pdf",
+                "embedding": str([float(x) for x in vector]),
+            }
+            for i, vector in enumerate(vectors)
+        ]
+    
+    def test_exact_search_filters_and_thresholds(self, tmp_path):
+        """Results are ranked by cosine, filtered by document and threshold."""
+        from src.rag.local_index import LocalVectorIndex
+        
+        rows = self._rows([[1, 0, 0], [0.9, 0.1, 0], [0, 1, 0]]) + self._rows([[1, 0, 0]], "doc-2")
+        index = LocalVectorIndex.create(tmp_path / "p1", rows, dimensions=3)
+        
+        results = index.search([1, 0, 0], ["doc-1"], match_threshold=0.5, chunks_per_search=5)
+        
+        assert [r["id"] for r in results] == ["doc-1-0", "doc-1-1"]
+        assert results[0]["similarity"] == pytest.approx(1.0, abs=1e-3)
+        assert results[0]["filename"] == "a.pdf"
+        assert "embedding" not in results[0]
+    
+    def test_append_and_tombstone_visible_after_reopen(self, tmp_path):
+        """The manager reopens an index when ingestion or deletion changes it."""
+        from src.rag.local_index import LocalVectorIndex, LocalIndexManager
+        
+        manager = LocalIndexManager(root=str(tmp_path))
+        LocalVectorIndex.create(manager.path_for("p1"), self._rows([[1, 0]]), dimensions=2)
+        assert len(manager.get("p1").search([0, 1], None, 0.5)) == 0
+        
+        LocalVectorIndex.append(manager.path_for("p1"), self._rows([[0, 1]], "doc-2"))
+        assert [r["id"] for r in manager.get("p1").search([0, 1], None, 0.5)] == ["doc-2-0"]
+        
+        LocalVectorIndex.remove_document(manager.path_for("p1"), "doc-2")
+        index = manager.get("p1")
+        assert index.search([0, 1], None, 0.5) == []
+        assert index.deleted_ratio == pytest.approx(0.5)
+    
+    def test_append_writes_payloads_in_place(self, tmp_path):
+        """Appends extend rows.jsonl without rewriting it and drop a torn tail."""
+        from src.rag.local_index import LocalVectorIndex
+        
+        path = tmp_path / "p1"
+        LocalVectorIndex.create(path, self._rows([[1, 0]]), dimensions=2)
+        inode = (path / "rows.jsonl").stat().st_ino
+        with open(path / "rows.jsonl", "a") as f:
+            f.write('{"id": "torn')
+        
+        LocalVectorIndex.append(path, self._rows([[0, 1]], "doc-2"))
+        index = LocalVectorIndex(path)
+        
+        assert (path / "rows.jsonl").stat().st_ino == inode
+        assert [p["id"] for p in index.payloads] == ["doc-1-0", "doc-2-0"]
+        assert (path / "rows.jsonl").stat().st_size == index.meta["payload_bytes"]
+    
+    def test_ivf_matches_exact_top_result(self, tmp_path, monkeypatch):
+        """Above the exact-search limit the IVF index finds the true neighbour."""
+        from src.config import settings
+        from src.rag.local_index import LocalVectorIndex
+        
+        monkeypatch.setattr(settings, "LOCAL_INDEX_EXACT_MAX_ROWS", 100)
+        rng = np.random.default_rng(1)
+        vectors = rng.normal(size=(400, 16))
+        index = LocalVectorIndex.create(tmp_path / "p1", self._rows(vectors), dimensions=16, dtype="float32")
+        
+        assert index.centroids is not None
+        hits = sum(
+            index.search(vectors[i], None, -1.0, 1)[0]["id"] == f"doc-1-{i}"
+            for i in range(0, 400, 40)
+        )
+        assert hits == 10
@@ -0,0 +1,80 @@
+"""Unit tests for MMR diversification."""
+
+
+class TestMMR:
+    """Tests for MMR context diversification."""
+    
+    def test_mmr_skips_near_duplicates(self):
+        """A near-duplicate of the top chunk loses to a distinct relevant one."""
+        from src.rag.mmr import mmr_select
+        
+        query = [1.0, 0.0, 0.0]
+        candidates = [
+            [0.95, 0.31, 0.0],    # most relevant
+            [0.94, 0.33, 0.0],    # near-duplicate of the first
+            [0.80, 0.0, 0.60],    # relevant, different direction
+        ]
+        
+        assert mmr_select(query, candidates, k=2, lambda_mult=1.0) == [0, 1]
+        assert mmr_select(query, candidates, k=2, lambda_mult=0.5) == [0, 2]
+    
+    def test_selector_parses_and_fetches_embeddings(self):
+        """Embeddings come from the chunk (text form) or one repository fetch."""
+        from src.rag.mmr import MMRSelector
+        
+        class _Repo:
+            def __init__(self):
+                self.requested = []
+            
+            def get_embeddings(self, ids):
+                self.requested.append(ids)
+                return {"c": [0.0, 1.0]}
+        
+        class _Embeddings:
+            def embed_query(self, text):
+                return [1.0, 0.1]
+        
+        selector = MMRSelector(max_candidates=10)
+        selector.chunk_repo = _Repo()
+        selector.embeddings = _Embeddings()
+        chunks = [
+            {"id": "a", "embedding": "[1.0, 0.1]"},
+            {"id": "b", "embedding": [0.99, 0.01]},
+            {"id": "c"},
+        ]
+        
+        selected = selector.select("q", chunks, k=2, lambda_mult=0.3)
+        
+        assert selector.chunk_repo.requested == [["c"]]
+        assert [c["id"] for c in selected] == ["a", "c"]
+    
+    def test_reranked_candidates_skip_query_embedding(self):
+        """Rerank scores replace query similarity, so the query is not embedded."""
+        from src.rag.mmr import MMRSelector
+        
+        class _Embeddings:
+            def embed_query(self, text):
+                raise AssertionError("query embedded although rerank scores exist")
+        
+        selector = MMRSelector(max_candidates=10)
+        selector.embeddings = _Embeddings()
+        chunks = [
+            {"id": "a", "embedding": [1.0, 0.0], "rerank_score": 3.0},
+            {"id": "b", "embedding": [0.99, 0.01], "rerank_score": 2.0},
+            {"id": "c", "embedding": [0.0, 1.0], "rerank_score": 1.0},
+        ]
+        
+        assert [c["id"] for c in selector.select("q", chunks, k=2, lambda_mult=0.5)] == ["a", "c"]
+    
+    def test_searchers_return_embeddings_when_mmr_enabled(self):
+        """With MMR on, retrieval asks the RPCs for embeddings up front."""
+        from src.rag.pipeline import RAGPipeline
+        
+        pipeline = RAGPipeline()
+        settings = {"project_id": "p1", "mmr_enabled": True}
+        
+        vector, hybrid, _ = pipeline._searchers(settings)
+        
+        assert vector.include_embeddings and hybrid.keyword_search.include_embeddings
+        assert not pipeline._searchers({"project_id": "p1"})[0].include_embeddings
+        assert pipeline._searchers({"mmr_enabled": True})[0].include_embeddings
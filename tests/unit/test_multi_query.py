@@ -0,0 +1,131 @@
+"""Unit tests for multi-query retrieval."""
+
+
+class TestMultiQuery:
+    """Tests for batched multi-query retrieval."""
+    
+    def test_dedupe_keeps_first_of_near_duplicates(self):
+        """Near-identical vectors collapse onto the earliest one."""
+        from src.core.vector_math import dedupe_by_similarity
+        
+        vectors = [[1.0, 0.0], [0.999, 0.01], [0.0, 1.0]]
+        
+        assert dedupe_by_similarity(vectors, threshold=0.95) == [0, 2]
+    
+    def test_explicit_zero_dedup_threshold_is_kept(self):
+        """A threshold of 0.0 is a value, not a request for the default."""
+        from src.rag.multi_query import MultiQueryRetriever
+        
+        assert MultiQueryRetriever(dedup_threshold=0.0).dedup_threshold == 0.0
+    
+    def test_retrieve_embeds_once_and_fuses(self):
+        """All variations are embedded in one call and searched per unique variation."""
+        from src.rag.multi_query import MultiQueryRetriever
+        
+        class FakeEmbeddings:
+            calls = 0
+            
+            def embed_queries(self, texts):
+                FakeEmbeddings.calls += 1
+                table = {"q1": [1.0, 0.0], "q1 again": [1.0, 0.001], "q2": [0.0, 1.0]}
+                return [table[t] for t in texts]
+        
+        class FakeVector:
+            def __init__(self):
+                self.seen = []
+            
+            def search_with_embedding(self, query_embedding, **kwargs):
+                self.seen.append(query_embedding)
+                if query_embedding[0] > 0.5:
+                    return [{"id": "a"}, {"id": "b"}]
+                return [{"id": "b"}, {"id": "c"}]
+            
+            def search_with_embeddings(self, query_embeddings, **kwargs):
+                return [self.search_with_embedding(e, **kwargs) for e in query_embeddings]
+        
+        retriever = MultiQueryRetriever(dedup_threshold=0.95)
+        retriever.embeddings = FakeEmbeddings()
+        retriever.vector_search = FakeVector()
+        
+        chunks = retriever.retrieve(["q1", "q1 again", "q2"], ["doc"], {})
+        
+        assert FakeEmbeddings.calls == 1
+        assert len(retriever.vector_search.seen) == 2
+        assert chunks[0]["id"] == "b"
+        assert {c["id"] for c in chunks} == {"a", "b", "c"}
+    
+    def test_original_query_searched_while_variations_generate(self):
+        """The first search overlaps the LLM call; duplicate variations are skipped."""
+        import threading
+        from src.rag.multi_query import MultiQueryRetriever
+        
+        llm_started = threading.Event()
+        searched = threading.Event()
+        
+        def slow_expand(query, num_queries):
+            llm_started.set()
+            assert searched.wait(timeout=2), "original query search waited for the LLM"
+            return [query, "q1 again", "q2"]
+        
+        class FakeEmbeddings:
+            def embed_queries(self, texts):
+                table = {"q1": [1.0, 0.0], "q1 again": [1.0, 0.001], "q2": [0.0, 1.0]}
+                return [table[t] for t in texts]
+        
+        class FakeVector:
+            def __init__(self):
+                self.seen = []
+            
+            def search_with_embeddings(self, query_embeddings, **kwargs):
+                self.seen.extend(query_embeddings)
+                searched.set()
+                return [[{"id": "a"}] if e[0] > 0.5 else [{"id": "c"}] for e in query_embeddings]
+        
+        retriever = MultiQueryRetriever(dedup_threshold=0.95)
+        retriever.embeddings = FakeEmbeddings()
+        retriever.vector_search = FakeVector()
+        retriever.expand = slow_expand
+        
+        chunks = retriever.retrieve_expanded("q1", 3, ["doc"], {})
+        
+        assert llm_started.is_set()
+        assert retriever.vector_search.seen == [[1.0, 0.0], [0.0, 1.0]]
+        assert [c["id"] for c in chunks] == ["a", "c"]
+    
+    def test_first_pass_reused_for_original_query(self):
+        """With a first pass only the variations hit the vector store."""
+        from src.rag.multi_query import MultiQueryRetriever
+        
+        class FakeEmbeddings:
+            def embed_queries(self, texts):
+                table = {"q1": [1.0, 0.0], "q2": [0.0, 1.0]}
+                return [table[t] for t in texts]
+        
+        class FakeVector:
+            def __init__(self):
+                self.seen = []
+            
+            def search_with_embeddings(self, query_embeddings, **kwargs):
+                self.seen.extend(query_embeddings)
+                return [[{"id": "c"}] for _ in query_embeddings]
+        
+        retriever = MultiQueryRetriever(dedup_threshold=0.95)
+        retriever.embeddings = FakeEmbeddings()
+        retriever.vector_search = FakeVector()
+        retriever.expand = lambda query, num_queries: [query, "q2"]
+        
+        chunks = retriever.retrieve_expanded("q1", 2, ["doc"], {}, first_pass=[{"id": "a"}])
+        
+        assert retriever.vector_search.seen == [[0.0, 1.0]]
+        assert [c["id"] for c in chunks] == ["a", "c"]
+    
+    def test_variation_cache_keys_on_model_query_and_count(self, json_redis):
+        """Cached variations are shared by normalized query, per model and count."""
+        from src.services.cache.query_variation_cache import QueryVariationCache
+        
+        cache = QueryVariationCache(redis=json_redis, ttl=60, enabled=True)
+        cache.set("openai:gpt-4o-mini", "What is X?", 3, ["Define X", "Explain X"])
+        
+        assert cache.get("openai:gpt-4o-mini", " what is  x? ", 3) == ["Define X", "Explain X"]
+        assert cache.get("openai:gpt-4o-mini", "What is X?", 4) is None
+        assert cache.get("ollama:qwen2.5:7b", "What is X?", 3) is None
@@ -0,0 +1,120 @@
+"""Unit tests for reranking."""
+
+
+class _CountingScorer:
+    """Lexical scorer that records every batch it scores."""
+    
+    def __init__(self):
+        from src.rag.reranker import LexicalScorer
+        self.inner = LexicalScorer()
+        self.name = "counting"
+        self.batches = []
+    
+    def score(self, query, passages):
+        self.batches.append(len(passages))
+        return self.inner.score(query, passages)
+
+
+class TestReranker:
+    """Tests for the reranking stage."""
+    
+    CHUNKS = [
+        {"id": "a", "content": "Quarterly revenue and marketing spend."},
+        {"id": "b", "content": "Sleep improves memory consolidation in adults."},
+        {"id": "c", "content": "Office holiday schedule."},
+        {"id": "d", "content": "Memory and sleep: how sleep deprivation hurts memory."},
+    ]
+    
+    def test_reorders_by_relevance_and_trims(self):
+        """The most relevant chunks move to the front before trimming."""
+        from src.rag.reranker import Reranker
+        
+        reranker = Reranker(scorer=_CountingScorer(), max_candidates=10, batch_size=16)
+        ranked, timings = reranker.rerank("sleep and memory", self.CHUNKS, top_k=2)
+        
+        assert [c["id"] for c in ranked] == ["d", "b"]
+        assert ranked[0]["rerank_score"] >= ranked[1]["rerank_score"]
+        assert timings["candidates"] == 4
+    
+    def test_batches_cap_and_score_cache(self):
+        """Candidates are capped, scored in batches, and cached per (query, chunk)."""
+        from src.rag.reranker import Reranker
+        
+        scorer = _CountingScorer()
+        reranker = Reranker(scorer=scorer, max_candidates=3, batch_size=2)
+        
+        _, first = reranker.rerank("sleep", self.CHUNKS)
+        _, second = reranker.rerank("  SLEEP ", self.CHUNKS)
+        
+        assert scorer.batches == [2, 1]
+        assert (first["scored"], second["scored"], second["cache_hits"]) == (3, 0, 3)
+    
+    def test_unavailable_model_keeps_retrieval_order(self, monkeypatch):
+        """Without a loadable model the chunks keep retrieval order; the failure backs off."""
+        import sys
+        from src.config import settings
+        from src.rag.reranker import Reranker
+        
+        reranker_module = sys.modules["src.rag.reranker"]
+        attempts = []
+        clock = [1000.0]
+        
+        def failing_scorer(model_name):
+            attempts.append(model_name)
+            raise ImportError("sentence-transformers")
+        
+        monkeypatch.setattr(reranker_module, "CrossEncoderScorer", failing_scorer)
+        monkeypatch.setattr(reranker_module, "_failed_at", {})
+        monkeypatch.setattr(reranker_module.time, "monotonic", lambda: clock[0])
+        monkeypatch.setattr(settings, "RERANKER_RETRY_SECONDS", 60)
+        reranker = Reranker()
+        
+        first, _ = reranker.rerank("sleep memory", self.CHUNKS, "reranker-english-v3.0", top_k=2)
+        reranker.rerank("sleep memory", self.CHUNKS, "reranker-english-v3.0")
+        assert [c["id"] for c in first] == ["a", "b"]
+        assert len(attempts) == 1
+        
+        clock[0] += 61
+        reranker.rerank("sleep memory", self.CHUNKS, "reranker-english-v3.0")
+        assert len(attempts) == 2
+    
+    def test_requests_do_not_wait_for_a_loading_model(self, monkeypatch):
+        """While another thread loads the model, callers keep retrieval order immediately."""
+        import sys
+        import threading
+        
+        reranker_module = sys.modules["src.rag.reranker"]
+        loading, release = threading.Event(), threading.Event()
+        
+        class SlowScorer(_CountingScorer):
+            def __init__(self, model_name):
+                loading.set()
+                release.wait(timeout=5)
+                super().__init__()
+        
+        monkeypatch.setattr(reranker_module, "CrossEncoderScorer", SlowScorer)
+        monkeypatch.setattr(reranker_module, "_scorers", {})
+        monkeypatch.setattr(reranker_module, "_failed_at", {})
+        warm = threading.Thread(target=reranker_module.warm_up_scorer)
+        warm.start()
+        assert loading.wait(timeout=5)
+        
+        assert reranker_module.get_scorer("reranker-english-v3.0") is None
+        release.set()
+        warm.join(timeout=5)
+        assert isinstance(reranker_module.get_scorer("reranker-english-v3.0"), SlowScorer)
+    
+    def test_select_context_respects_setting(self):
+        """Reranking only happens when enabled in project settings."""
+        from src.rag.pipeline import RAGPipeline
+        from src.rag.reranker import Reranker
+        
+        pipeline = RAGPipeline()
+        pipeline.reranker = Reranker(scorer=_CountingScorer())
+        base = {"final_context_size": 2, "reranking_model": "reranker-english-v3.0"}
+        
+        off = pipeline.select_context("sleep memory", self.CHUNKS, {**base, "reranking_enabled": False})
+        on = pipeline.select_context("sleep memory", self.CHUNKS, {**base, "reranking_enabled": True})
+        
+        assert [c["id"] for c in off] == ["a", "b"]
+        assert [c["id"] for c in on] == ["d", "b"]
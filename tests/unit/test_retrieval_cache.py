@@ -0,0 +1,63 @@
+"""Unit tests for the retrieval cache."""
+
+
+class TestRetrievalCache:
+    """Tests for the document-set versioned retrieval cache."""
+    
+    SETTINGS = {"project_id": "p1", "rag_strategy": "hybrid", "chunks_per_search": 10}
+    
+    def _cache(self, redis):
+        from src.services.cache.retrieval_cache import RetrievalCache
+        return RetrievalCache(redis=redis, ttl=60, enabled=True)
+    
+    def test_hit_after_set_with_normalized_query(self, json_redis):
+        """Whitespace and case variants of a query share an entry."""
+        cache = self._cache(json_redis)
+        chunks = [{"id": "a", "content": "alpha"}]
+        
+        key = cache.key_for("p1", "What is X?", self.SETTINGS)
+        assert cache.get(key) is None
+        cache.set(key, chunks)
+        
+        assert cache.get(cache.key_for("p1", "  what is   x? ", self.SETTINGS)) == chunks
+    
+    def test_settings_and_version_partition_keys(self, json_redis):
+        """Changed settings miss, and bumping the version invalidates."""
+        cache = self._cache(json_redis)
+        cache.set(cache.key_for("p1", "q", self.SETTINGS), [{"id": "a"}])
+        
+        assert cache.get(cache.key_for("p1", "q", {**self.SETTINGS, "chunks_per_search": 20})) is None
+        
+        cache.bump_version("p1")
+        assert cache.get(cache.key_for("p1", "q", self.SETTINGS)) is None
+    
+    def test_pipeline_skips_retrieval_on_hit(self, json_redis):
+        """A cached retrieval bypasses the strategy entirely."""
+        from src.rag.pipeline import RAGPipeline
+        
+        pipeline = RAGPipeline()
+        pipeline.retrieval_cache = self._cache(json_redis)
+        calls = []
+        pipeline._retrieve_uncached = lambda *args: calls.append(args) or [{"id": "a"}]
+        
+        first = pipeline._retrieve("q", ["d1"], self.SETTINGS, "hybrid")
+        second = pipeline._retrieve("q", ["d1"], self.SETTINGS, "hybrid")
+        
+        assert first == second == [{"id": "a"}]
+        assert len(calls) == 1
+    
+    def test_bump_during_retrieval_does_not_cache_under_new_version(self, json_redis):
+        """Chunks are stored under the version read before retrieval started."""
+        from src.rag.pipeline import RAGPipeline
+        
+        pipeline = RAGPipeline()
+        pipeline.retrieval_cache = cache = self._cache(json_redis)
+        
+        def retrieve_while_a_document_is_deleted(*args):
+            cache.bump_version("p1")
+            return [{"id": "deleted-doc-chunk"}]
+        
+        pipeline._retrieve_uncached = retrieve_while_a_document_is_deleted
+        pipeline._retrieve("q", ["d1"], self.SETTINGS, "hybrid")
+        
+        assert cache.get(cache.key_for("p1", "q", self.SETTINGS)) is None
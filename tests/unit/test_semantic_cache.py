@@ -0,0 +1,74 @@
+"""Unit tests for the semantic answer cache."""
+
+
+class TestSemanticAnswerCache:
+    """Tests for the per-project semantic answer cache."""
+    
+    def _cache(self, redis, **kwargs):
+        from src.services.cache.semantic_cache import SemanticAnswerCache
+        return SemanticAnswerCache(redis=redis, enabled=True, ttl=60, **kwargs)
+    
+    def test_similar_query_hits_and_dissimilar_misses(self, append_redis):
+        """Only queries above the cosine threshold reuse an answer."""
+        cache = self._cache(append_redis, threshold=0.9)
+        citations = [{"chunk_id": "a"}]
+        cache.store("ns", "what is x", [1.0, 0.0, 0.0], "X is a letter.", citations)
+        
+        hit = cache.lookup("ns", [0.98, 0.1, 0.0])
+        assert hit["answer"] == "X is a letter."
+        assert hit["citations"] == citations
+        assert hit["similarity"] > 0.9
+        
+        assert cache.lookup("ns", [0.0, 1.0, 0.0]) is None
+        assert cache.lookup("other", [1.0, 0.0, 0.0]) is None
+    
+    def test_explicit_zero_threshold_is_kept(self, append_redis):
+        """threshold=0.0 is a value, not a request for the configured default."""
+        assert self._cache(append_redis, threshold=0.0).threshold == 0.0
+    
+    def test_second_worker_syncs_new_rows(self, append_redis):
+        """A separate instance picks up rows appended by another worker."""
+        writer = self._cache(append_redis, threshold=0.9)
+        reader = self._cache(append_redis, threshold=0.9)
+        
+        assert reader.lookup("ns", [0.0, 1.0]) is None
+        writer.store("ns", "q1", [1.0, 0.0], "one", [{"chunk_id": "a"}])
+        writer.store("ns", "q2", [0.0, 1.0], "two", [{"chunk_id": "b"}])
+        
+        assert reader.lookup("ns", [0.0, 1.0])["answer"] == "two"
+    
+    def test_answer_stays_under_the_version_it_was_grounded_in(self, append_redis, json_redis, monkeypatch):
+        """A version bump during generation does not leak the answer into the new version."""
+        import importlib
+        from types import SimpleNamespace
+        from src.services.cache.retrieval_cache import RetrievalCache
+        
+        answer_cache = importlib.import_module("src.agents.answer_cache")
+        semantic_cache = importlib.import_module("src.services.cache.semantic_cache")
+        versions = RetrievalCache(redis=json_redis, ttl=60, enabled=True)
+        monkeypatch.setattr(semantic_cache, "retrieval_cache", versions)
+        monkeypatch.setattr(answer_cache, "semantic_answer_cache", self._cache(append_redis, threshold=0.9))
+        monkeypatch.setattr(answer_cache, "embedding_service", SimpleNamespace(
+            provider_name="openai",
+            provider=SimpleNamespace(model="m"),
+            dimensions=2,
+            embed_query=lambda text: [1.0, 0.0]
+        ))
+        settings = {"project_id": "p1"}
+        
+        cached, namespace = answer_cache.find_cached_answer("q", ["d1"], settings)
+        versions.bump_version("p1")
+        answer_cache.remember_answer("q", namespace, "old corpus answer", [{"chunk_id": "a"}])
+        
+        assert cached is None
+        assert answer_cache.find_cached_answer("q", ["d1"], settings)[0] is None
+    
+    def test_cached_answer_streams_back_verbatim(self):
+        """Token pieces of a cached answer join back to the original."""
+        from src.agents.answer_cache import split_answer_tokens
+        
+        answer = "Line one.\n\n- item  two\t end "
+        tokens = split_answer_tokens(answer)
+        
+        assert len(tokens) > 1
+        assert "".join(tokens) == answer
@@ -0,0 +1,104 @@
+"""Unit tests for vector and keyword search RPCs."""
+
+import numpy as np
+
+
+class TestLeanProjection:
+    """Tests for lean search result projection."""
+    
+    def test_vector_search_defaults_to_lean_columns(self, fake_rpc):
+        """Embeddings are neither requested nor selected by default."""
+        from src.rag.vector_search import VectorSearch
+        from src.rag.vector_store import LEAN_COLUMNS
+        
+        search = VectorSearch()
+        search.store.db = fake_rpc
+        search.search_with_embedding([0.1], ["doc"])
+        
+        call = search.store.db.calls[0]
+        assert call["name"] == "vector_search_chunks"
+        assert call["params"]["include_embedding"] is False
+        assert call["select"] == list(LEAN_COLUMNS)
+        assert "embedding" not in call["select"]
+    
+    def test_opt_in_embeddings_and_custom_columns(self, fake_rpc):
+        """Callers can narrow columns and still opt into embeddings."""
+        from src.rag.keyword_search import KeywordSearch
+        
+        search = KeywordSearch(include_embeddings=True)
+        search.db = fake_rpc
+        search.search("query", ["doc"], columns=["id", "rank"])
+        
+        call = search.db.calls[0]
+        assert call["params"]["include_embedding"] is True
+        assert call["select"] == ["id", "rank", "embedding"]
+
+
+class TestProjectScopedSearch:
+    """Tests for project-scoped search RPCs."""
+    
+    def test_scoped_searches_send_project_id_not_document_ids(self, fake_rpc):
+        """Scoped searchers call the project RPCs without the document id array."""
+        from src.rag.vector_store import PgVectorStore
+        from src.rag.keyword_search import KeywordSearch
+        
+        store = PgVectorStore(project_id="p1")
+        keyword = KeywordSearch(project_id="p1")
+        store.db = keyword.db = fake_rpc
+        store.search([0.1], ["doc-1", "doc-2"])
+        keyword.search("query", ["doc-1", "doc-2"])
+        
+        assert [call["name"] for call in fake_rpc.calls] == [
+            "vector_search_project_chunks_tuned",
+            "keyword_search_project_chunks",
+        ]
+        for call in fake_rpc.calls:
+            assert call["params"]["filter_project_id"] == "p1"
+            assert "filter_document_ids" not in call["params"]
+        assert fake_rpc.calls[0]["params"]["ef_search"] >= 1
+    
+    def test_quantized_mode_rescores_on_the_server(self, fake_rpc):
+        """A quantized search mode calls the two-pass RPC with its candidate budget."""
+        from src.rag.pipeline import RAGPipeline
+        
+        vector, _, _ = RAGPipeline()._searchers({"project_id": "p1", "vector_search_mode": "binary"})
+        vector.store.db = fake_rpc
+        vector.search_with_embedding([0.1], ["doc-1"], chunks_per_search=5)
+        
+        call = vector.store.db.calls[0]
+        assert call["name"] == "vector_search_project_chunks_quantized"
+        assert call["params"]["quantization"] == "binary"
+        assert call["params"]["rescore_candidates"] >= 5
+    
+    def test_matryoshka_prefix_keeps_the_neighbours(self, fake_rpc):
+        """Truncated, re-normalized prefixes rank candidates like the full vectors."""
+        from src.core.vector_math import truncate_rows
+        from src.rag.vector_store import PgVectorStore
+        
+        rng = np.random.default_rng(3)
+        base = rng.normal(size=(1, 64))
+        vectors = np.vstack([base + 0.1 * rng.normal(size=(1, 64)), rng.normal(size=(5, 64))])
+        short = truncate_rows(vectors, 16)
+        
+        assert short.shape == (6, 16)
+        assert np.allclose(np.linalg.norm(short, axis=1), 1.0)
+        assert int(np.argmax(short @ truncate_rows(base, 16)[0])) == 0
+        
+        store = PgVectorStore(project_id="p1", search_mode="matryoshka")
+        store.db = fake_rpc
+        store.search([0.1], ["doc-1"])
+        assert store.db.calls[0]["params"]["quantization"] == "matryoshka"
+    
+    def test_pipeline_scopes_searchers_to_the_project(self):
+        """With a project_id the pipeline keeps server-side hybrid and scopes every leg."""
+        from src.rag.pipeline import RAGPipeline
+        
+        pipeline = RAGPipeline()
+        pipeline.hybrid_search.mode = pipeline.hybrid_search.mode.SERVER
+        
+        vector, hybrid, multi_query = pipeline._searchers({"project_id": "p1"})
+        
+        assert vector.store.project_id == "p1"
+        assert hybrid.project_id == "p1" and hybrid.mode.value == "server"
+        assert multi_query.keyword_search.project_id == "p1"
+        assert pipeline._searchers({})[0] is pipeline.vector_search
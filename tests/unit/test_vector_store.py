@@ -0,0 +1,114 @@
+"""Unit tests for vector stores."""
+
+import numpy as np
+import pytest
+
+
+class TestVectorStore:
+    """Tests for the VectorStore abstraction and its in-memory implementation."""
+    
+    def _chunks(self, vectors, document_id="doc-1"):
+        return [
+            {"id": f"{document_id}-{i}", "document_id": document_id, "content": f"chunk {i}", "embedding": vector}
+            for i, vector in enumerate(vectors)
+        ]
+    
+    def test_implementations_satisfy_protocol(self, tmp_path):
+        """Every backend exposes the VectorStore methods."""
+        from src.rag.vector_store import VectorStore, PgVectorStore, InMemoryVectorStore
+        from src.rag.local_index import LocalIndexVectorStore, LocalIndexManager
+        
+        assert isinstance(PgVectorStore(), VectorStore)
+        assert isinstance(InMemoryVectorStore(), VectorStore)
+        assert isinstance(LocalIndexVectorStore("p1", LocalIndexManager(str(tmp_path))), VectorStore)
+    
+    @pytest.mark.parametrize("backend", ["memory", "local"])
+    def test_upsert_twice_replaces_rows(self, backend, tmp_path):
+        """Every store treats a repeated upsert as a replace, never a duplicate."""
+        from src.rag.vector_store import InMemoryVectorStore
+        from src.rag.local_index import LocalIndexVectorStore, LocalIndexManager
+        
+        if backend == "memory":
+            store = InMemoryVectorStore()
+        else:
+            store = LocalIndexVectorStore("p1", LocalIndexManager(str(tmp_path)))
+        rows = self._chunks([[1, 0], [0.9, 0.1]]) + self._chunks([[0, 1]], "doc-2")
+        
+        store.upsert(rows)
+        store.upsert(rows)
+        
+        results = store.search([1, 0], None, match_threshold=-1.0, chunks_per_search=10)
+        assert sorted(r["id"] for r in results) == ["doc-1-0", "doc-1-1", "doc-2-0"]
+    
+    def test_search_ranks_filters_and_projects(self):
+        """Results are cosine-ranked, thresholded, filtered and shaped like the RPC."""
+        from src.rag.vector_store import InMemoryVectorStore, LEAN_COLUMNS
+        
+        store = InMemoryVectorStore()
+        store.upsert(self._chunks([[1, 0], [0.8, 0.2], [0, 1]]) + self._chunks([[1, 0]], "doc-2"))
+        
+        results = store.search([1, 0], ["doc-1"], match_threshold=0.5, chunks_per_search=5)
+        
+        assert [r["id"] for r in results] == ["doc-1-0", "doc-1-1"]
+        assert list(results[0]) == list(LEAN_COLUMNS)
+        assert results[0]["similarity"] == pytest.approx(1.0)
+        assert "embedding" in store.search([1, 0], None, include_embeddings=True)[0]
+    
+    def test_threshold_is_strict_like_the_rpcs(self):
+        """A chunk exactly at match_threshold is excluded, as in the SQL functions."""
+        from src.rag.vector_store import InMemoryVectorStore
+        
+        store = InMemoryVectorStore()
+        store.upsert(self._chunks([[1, 0], [0, 1]]))
+        
+        assert store.search([1, 0], None, match_threshold=1.0) == []
+        assert [r["id"] for r in store.search([1, 0], None, match_threshold=0.0)] == ["doc-1-0"]
+    
+    def test_upsert_replaces_and_delete_removes(self):
+        """Upserting an existing id replaces it; deleting a document drops its rows."""
+        from src.rag.vector_store import InMemoryVectorStore
+        
+        store = InMemoryVectorStore()
+        store.upsert(self._chunks([[1, 0], [0, 1]]) + self._chunks([[1, 0]], "doc-2"))
+        store.upsert([{"id": "doc-1-0", "document_id": "doc-1", "embedding": [0, 1]}])
+        
+        assert len(store) == 3
+        assert store.search([1, 0], None, 0.5)[0]["id"] == "doc-2-0"
+        assert store.delete_by_document("doc-2") == 1
+        assert store.search([1, 0], None, 0.5) == []
+    
+    def test_search_many_matches_single_searches(self):
+        """Batched search returns the same lists as one search per query."""
+        from src.rag.vector_store import InMemoryVectorStore
+        
+        rng = np.random.default_rng(3)
+        store = InMemoryVectorStore()
+        store.upsert(self._chunks(rng.normal(size=(50, 8)).tolist()))
+        queries = rng.normal(size=(4, 8)).tolist()
+        
+        batched = store.search_many(queries, None, -1.0, 5)
+        single = [store.search(q, None, -1.0, 5) for q in queries]
+        
+        assert [[r["id"] for r in results] for results in batched] == [[r["id"] for r in results] for results in single]
+        assert batched[0][0]["similarity"] == pytest.approx(single[0][0]["similarity"], abs=1e-5)
+    
+    def test_vector_search_delegates_to_store(self):
+        """VectorSearch and multi-query retrieval run unchanged on another store."""
+        from src.rag.vector_store import InMemoryVectorStore
+        from src.rag.vector_search import VectorSearch
+        from src.rag.multi_query import MultiQueryRetriever
+        
+        store = InMemoryVectorStore()
+        store.upsert(self._chunks([[1, 0], [0, 1]]))
+        search = VectorSearch(store=store)
+        
+        class FakeEmbeddings:
+            def embed_queries(self, texts):
+                return [[1.0, 0.0] if t == "q1" else [0.0, 1.0] for t in texts]
+        
+        retriever = MultiQueryRetriever(vector_search=search)
+        retriever.embeddings = FakeEmbeddings()
+        chunks = retriever.retrieve(["q1", "q2"], ["doc-1"], {"similarity_threshold": 0.5})
+        
+        assert search.search_with_embedding([0, 1], ["doc-1"])[0]["id"] == "doc-1-1"
+        assert {c["id"] for c in chunks} == {"doc-1-0", "doc-1-1"}